@@ -12,12 +12,14 @@ import os
 app = Flask(__name__)
 
 # Configurar CORS
+# supports_credentials: o frontend envia o cookie do carrinho de visitante
+# (credentials: 'include'), que só é aceito com origem explícita
 CORS(app, origins=[
     'https://luanmercaldi.github.io',
     'https://3dbenchybros.com.br',
     'http://localhost:3000',
     'http://127.0.0.1:3000'
-])
+], supports_credentials=True)
 
 # Configurações básicas
 app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'dev-secret-key-change-in-production')
@@ -0,0 +1,92 @@
+"""
+Benchmark de concorrência das reservas de estoque
+
+Cria um produto com estoque limitado e dispara muitos compradores simultâneos
+reservando uma unidade cada. Verifica que exatamente ``stock`` reservas deram
+certo, que o estoque final é zero (sem venda a mais nem atualização perdida) e
+mede a latência das reservas.
+
+Uso:
+    python -m benchmarks.inventory_concurrency --buyers 500 --stock 50 --threads 64
+    DATABASE_URL=postgresql://... python -m benchmarks.inventory_concurrency
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from backend.utils.database import DatabaseManager
+
+def create_product(db, stock: int) -> int:
+    with db.get_connection() as conn:
+        cursor = db.get_cursor(conn)
+        placeholder = '%s' if db.db_type == 'postgresql' else '?'
+        cursor.execute(
+            f"INSERT INTO products (sku, name, price_cents, stock_quantity) "
+            f"VALUES ({placeholder}, {placeholder}, 1000, {placeholder}) RETURNING id",
+            (f'BENCH-{time.time_ns()}', 'Benchy Edição Limitada', stock)
+        )
+        product_id = cursor.fetchone()['id']
+        conn.commit()
+        return product_id
+
+def current_stock(db, product_id: int) -> int:
+    with db.get_connection() as conn:
+        cursor = db.get_cursor(conn)
+        placeholder = '%s' if db.db_type == 'postgresql' else '?'
+        cursor.execute(f'SELECT stock_quantity FROM products WHERE id = {placeholder}', (product_id,))
+        return cursor.fetchone()['stock_quantity']
+
+def run(db, buyers: int, stock: int, threads: int) -> bool:
+    product_id = create_product(db, stock)
+    latencies = []
+
+    def buy(_):
+        started = time.perf_counter()
+        result = db.inventory.reserve(product_id, 1)
+        latencies.append(time.perf_counter() - started)
+        return result
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        results = list(executor.map(buy, range(buyers)))
+    elapsed = time.perf_counter() - started
+
+    reserved = sum(1 for r in results if r.get('success'))
+    sold_out = sum(1 for r in results if r.get('code') == 'OUT_OF_STOCK')
+    errors = buyers - reserved - sold_out
+    final_stock = current_stock(db, product_id)
+
+    latencies.sort()
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(f"Banco: {db.db_type} | compradores: {buyers} | estoque: {stock} | threads: {threads}")
+    print(f"Reservas: {reserved} | esgotado: {sold_out} | erros: {errors} | estoque final: {final_stock}")
+    print(f"Tempo: {elapsed:.2f}s ({buyers / elapsed:.0f} tentativas/s) | "
+          f"p50: {statistics.median(latencies) * 1000:.1f}ms | p99: {p99 * 1000:.1f}ms")
+
+    ok = reserved == stock and final_stock == 0 and errors == 0
+    print("✅ Sem venda a mais nem atualização perdida" if ok else "❌ Inconsistência de estoque")
+    return ok
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark de reservas de estoque concorrentes')
+    parser.add_argument('--buyers', type=int, default=500)
+    parser.add_argument('--stock', type=int, default=50)
+    parser.add_argument('--threads', type=int, default=64)
+    parser.add_argument('--db-path', help='Arquivo SQLite (padrão: banco temporário)')
+    args = parser.parse_args(argv)
+
+    db_path = args.db_path
+    if not db_path and not os.environ.get('DATABASE_URL'):
+        db_path = os.path.join(tempfile.mkdtemp(), 'inventory_bench.db')
+
+    db = DatabaseManager(db_path)
+    try:
+        return 0 if run(db, args.buyers, args.stock, args.threads) else 1
+    finally:
+        db.close()
+
+if __name__ == '__main__':
+    raise SystemExit(main())
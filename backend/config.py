@@ -13,6 +13,82 @@ class Config:
     if DATABASE_URL and DATABASE_URL.startswith('postgres://'):
         DATABASE_URL = DATABASE_URL.replace('postgres://', 'postgresql://', 1)
     
+    # Pool de conexões PostgreSQL
+    DB_POOL_ENABLED = os.environ.get('DB_POOL_ENABLED', 'true').lower() == 'true'
+    DB_POOL_MIN_SIZE = int(os.environ.get('DB_POOL_MIN_SIZE', 1))
+    DB_POOL_MAX_SIZE = int(os.environ.get('DB_POOL_MAX_SIZE', 10))
+    DB_POOL_MAX_IDLE = float(os.environ.get('DB_POOL_MAX_IDLE', 300))  # segundos até fechar conexão ociosa
+    DB_POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', 10))  # espera máxima por uma conexão livre
+    
+    # Réplicas de leitura PostgreSQL (URLs separadas por vírgula)
+    DATABASE_REPLICA_URLS = os.environ.get('DATABASE_REPLICA_URLS', '')
+    DB_REPLICA_MAX_LAG = float(os.environ.get('DB_REPLICA_MAX_LAG', 5))  # segundos de atraso tolerados
+    DB_REPLICA_LAG_CHECK_INTERVAL = float(os.environ.get('DB_REPLICA_LAG_CHECK_INTERVAL', 10))
+    DB_READ_YOUR_WRITES_WINDOW = float(os.environ.get('DB_READ_YOUR_WRITES_WINDOW', 10))  # leituras no primário após escrita
+    DB_READ_YOUR_WRITES_COOKIE = os.environ.get('DB_READ_YOUR_WRITES_COOKIE', 'read_primary')
+    DB_REPLICA_PROBE_TIMEOUT = int(os.environ.get('DB_REPLICA_PROBE_TIMEOUT', 2))  # segundos (connect_timeout da medição)
+    
+    # Migrações aplicadas no boot (desligado em produção: usar python -m utils.migrations upgrade)
+    DB_AUTO_MIGRATE = os.environ.get('DB_AUTO_MIGRATE', 'true').lower() == 'true'
+    
+    # Conexões SQLite persistentes (uma por thread) e PRAGMAs de desempenho
+    SQLITE_PERSISTENT = os.environ.get('SQLITE_PERSISTENT', 'true').lower() == 'true'
+    SQLITE_JOURNAL_MODE = os.environ.get('SQLITE_JOURNAL_MODE', 'WAL')
+    SQLITE_SYNCHRONOUS = os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL')
+    SQLITE_CACHE_SIZE_KB = int(os.environ.get('SQLITE_CACHE_SIZE_KB', 16384))
+    SQLITE_MMAP_SIZE = int(os.environ.get('SQLITE_MMAP_SIZE', 128 * 1024 * 1024))  # bytes
+    SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000))
+    SQLITE_CACHED_STATEMENTS = int(os.environ.get('SQLITE_CACHED_STATEMENTS', 256))
+    
+    # Cache do catálogo em memória (por worker)
+    CATALOG_CACHE_ENABLED = os.environ.get('CATALOG_CACHE_ENABLED', 'true').lower() == 'true'
+    CATALOG_CACHE_TTL = float(os.environ.get('CATALOG_CACHE_TTL', 60))  # segundos
+    CATALOG_CACHE_MAX_ENTRIES = int(os.environ.get('CATALOG_CACHE_MAX_ENTRIES', 512))
+    # Corpos de resposta prontos (cached_response): região própria, não expulsa o catálogo
+    HTTP_RESPONSE_CACHE_MAX_ENTRIES = int(os.environ.get('HTTP_RESPONSE_CACHE_MAX_ENTRIES', 256))
+    CATALOG_VERSION_CHECK_INTERVAL = float(os.environ.get('CATALOG_VERSION_CHECK_INTERVAL', 1))  # segundos
+    
+    # Cache HTTP dos endpoints do catálogo (navegador/CDN)
+    HTTP_CACHE_MAX_AGE = int(os.environ.get('HTTP_CACHE_MAX_AGE', 60))  # segundos
+    HTTP_CACHE_STALE_WHILE_REVALIDATE = int(os.environ.get('HTTP_CACHE_STALE_WHILE_REVALIDATE', 300))  # segundos
+    HTTP_GZIP_ENABLED = os.environ.get('HTTP_GZIP_ENABLED', 'true').lower() == 'true'
+    HTTP_GZIP_MIN_SIZE = int(os.environ.get('HTTP_GZIP_MIN_SIZE', 1024))  # bytes
+    HTTP_GZIP_LEVEL = int(os.environ.get('HTTP_GZIP_LEVEL', 6))
+    
+    # Reservas de estoque
+    INVENTORY_RESERVATION_TTL = int(os.environ.get('INVENTORY_RESERVATION_TTL', 900))  # segundos
+    INVENTORY_SWEEP_INTERVAL = float(os.environ.get('INVENTORY_SWEEP_INTERVAL', 30))  # segundos
+    INVENTORY_SWEEP_BATCH = int(os.environ.get('INVENTORY_SWEEP_BATCH', 500))
+    INVENTORY_MAX_QUANTITY = int(os.environ.get('INVENTORY_MAX_QUANTITY', 100))  # por reserva
+    
+    # Carrinho: operações por requisição em PATCH /api/cart
+    CART_MAX_BATCH_OPERATIONS = int(os.environ.get('CART_MAX_BATCH_OPERATIONS', 50))
+    
+    # Carrinho de visitantes em cookie assinado (sem estado no servidor)
+    GUEST_CART_COOKIE_NAME = os.environ.get('GUEST_CART_COOKIE_NAME', 'guest_cart')
+    GUEST_CART_MAX_AGE = int(os.environ.get('GUEST_CART_MAX_AGE', 30 * 24 * 3600))  # segundos
+    GUEST_CART_MAX_ITEMS = int(os.environ.get('GUEST_CART_MAX_ITEMS', 30))  # linhas (cookie tem ~4 KB)
+    GUEST_CART_COOKIE_SECURE = os.environ.get('GUEST_CART_COOKIE_SECURE', 'false').lower() == 'true'
+    GUEST_CART_COOKIE_SAMESITE = os.environ.get('GUEST_CART_COOKIE_SAMESITE', 'Lax')
+    
+    # Paginação da listagem de produtos
+    PRODUCTS_PAGE_SIZE = int(os.environ.get('PRODUCTS_PAGE_SIZE', 24))
+    PRODUCTS_MAX_PAGE_SIZE = int(os.environ.get('PRODUCTS_MAX_PAGE_SIZE', 100))
+    SEARCH_MAX_PAGE = int(os.environ.get('SEARCH_MAX_PAGE', 50))  # busca pagina por offset
+    PRODUCTS_MAX_IDS = int(os.environ.get('PRODUCTS_MAX_IDS', 100))  # ?ids= na listagem
+    HOME_FEATURED_LIMIT = int(os.environ.get('HOME_FEATURED_LIMIT', 8))
+    
+    # Importação em massa de produtos (linhas por lote no SQLite)
+    IMPORT_CHUNK_SIZE = int(os.environ.get('IMPORT_CHUNK_SIZE', 1000))
+    
+    # Imagens de produtos (derivados WebP/JPEG endereçados pelo conteúdo)
+    IMAGE_STORAGE_DIR = os.environ.get('IMAGE_STORAGE_DIR', 'media/products')
+    IMAGE_BASE_URL = os.environ.get('IMAGE_BASE_URL', '/api/media/products')
+    IMAGE_MAX_UPLOAD_BYTES = int(os.environ.get('IMAGE_MAX_UPLOAD_BYTES', 10 * 1024 * 1024))
+    IMAGE_MAX_PIXELS = int(os.environ.get('IMAGE_MAX_PIXELS', 40_000_000))
+    IMAGE_WEBP_QUALITY = int(os.environ.get('IMAGE_WEBP_QUALITY', 80))
+    IMAGE_JPEG_QUALITY = int(os.environ.get('IMAGE_JPEG_QUALITY', 82))
+    
     # Configurações CORS - incluir domínio do GitHub Pages
     CORS_ORIGINS = [
         'https://luanmercaldi.github.io',
@@ -35,6 +111,11 @@ class ProductionConfig(Config):
     """Configuração para produção"""
     DEBUG = False
     FLASK_ENV = 'production'
+    DB_AUTO_MIGRATE = os.environ.get('DB_AUTO_MIGRATE', 'false').lower() == 'true'
+    
+    # Frontend (GitHub Pages) e API em domínios diferentes: cookie cross-site
+    GUEST_CART_COOKIE_SECURE = True
+    GUEST_CART_COOKIE_SAMESITE = os.environ.get('GUEST_CART_COOKIE_SAMESITE', 'None')
     
     @staticmethod
     def init_app(app):
@@ -59,3 +140,7 @@ config = {
     'testing': TestingConfig,
     'default': DevelopmentConfig
 }
+
+def get_config():
+    """Obter configuração do ambiente atual (FLASK_ENV)"""
+    return config.get(os.environ.get('FLASK_ENV', 'default'), config['default'])
@@ -0,0 +1,5 @@
+-- Índices para a paginação keyset da listagem de produtos (created_at, id)
+CREATE INDEX IF NOT EXISTS idx_products_listing
+    ON products (created_at DESC, id DESC) WHERE is_active = TRUE;
+CREATE INDEX IF NOT EXISTS idx_products_category_listing
+    ON products (category, created_at DESC, id DESC) WHERE is_active = TRUE;
@@ -0,0 +1,10 @@
+-- Busca textual de produtos: vetor gerado (configuração portuguese) com índice GIN
+-- Pesos: nome (A) > categoria (B) > descrição (C)
+ALTER TABLE products ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('portuguese', coalesce(name, '')), 'A') ||
+        setweight(to_tsvector('portuguese', coalesce(category, '')), 'B') ||
+        setweight(to_tsvector('portuguese', coalesce(description, '')), 'C')
+    ) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_products_search ON products USING GIN (search_vector);
@@ -0,0 +1,3 @@
+-- Índice para as facetas e filtros de categoria/preço da listagem
+CREATE INDEX IF NOT EXISTS idx_products_facets
+    ON products (category, price) WHERE is_active = TRUE;
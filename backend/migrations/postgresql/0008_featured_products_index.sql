@@ -0,0 +1,3 @@
+-- Índice parcial dos produtos em destaque (página inicial e /featured)
+CREATE INDEX IF NOT EXISTS idx_products_featured
+    ON products (created_at DESC, id DESC) WHERE is_active = TRUE AND is_featured = TRUE;
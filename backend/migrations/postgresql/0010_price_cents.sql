@@ -0,0 +1,20 @@
+-- Preço em centavos inteiros (substitui price DECIMAL(10,2))
+ALTER TABLE products ADD COLUMN IF NOT EXISTS price_cents INTEGER;
+UPDATE products SET price_cents = ROUND(price * 100) WHERE price_cents IS NULL;
+ALTER TABLE products ALTER COLUMN price_cents SET NOT NULL;
+ALTER TABLE products DROP CONSTRAINT IF EXISTS chk_products_price_cents_non_negative;
+ALTER TABLE products ADD CONSTRAINT chk_products_price_cents_non_negative CHECK (price_cents >= 0);
+
+-- Objetos que dependem da coluna antiga passam a usar price_cents
+DROP TRIGGER IF EXISTS trg_products_catalog_version ON products;
+CREATE TRIGGER trg_products_catalog_version
+    AFTER INSERT OR DELETE
+       OR UPDATE OF sku, name, description, price_cents, category, image_url, is_featured, is_active
+    ON products
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_catalog_version();
+
+DROP INDEX IF EXISTS idx_products_facets;
+CREATE INDEX IF NOT EXISTS idx_products_facets
+    ON products (category, price_cents) WHERE is_active = TRUE;
+
+ALTER TABLE products DROP COLUMN IF EXISTS price;
@@ -0,0 +1,10 @@
+-- Imagem do produto: hash do original (nomes dos derivados) e largura original
+ALTER TABLE products ADD COLUMN IF NOT EXISTS image_hash VARCHAR(64);
+ALTER TABLE products ADD COLUMN IF NOT EXISTS image_width INTEGER;
+
+DROP TRIGGER IF EXISTS trg_products_catalog_version ON products;
+CREATE TRIGGER trg_products_catalog_version
+    AFTER INSERT OR DELETE
+       OR UPDATE OF sku, name, description, price_cents, category, image_url, image_hash, is_featured, is_active
+    ON products
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_catalog_version();
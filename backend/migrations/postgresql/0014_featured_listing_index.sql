@@ -0,0 +1,6 @@
+-- A 0008 não teve efeito: o nome idx_products_featured já existia desde a 0001
+-- (índice simples em is_featured) e o CREATE INDEX IF NOT EXISTS foi ignorado.
+-- O índice parcial da listagem de destaques ganha nome próprio e substitui o antigo
+DROP INDEX IF EXISTS idx_products_featured;
+CREATE INDEX IF NOT EXISTS idx_products_featured_listing
+    ON products (created_at DESC, id DESC) WHERE is_active = TRUE AND is_featured = TRUE;
@@ -0,0 +1,10 @@
+-- Esgotar ou repor um produto muda a versão do catálogo: o ETag das listagens
+-- e do detalhe (utils/http_cache.py) deixa de validar respostas com a
+-- disponibilidade antiga. Variações de estoque que não cruzam zero não mudam a
+-- versão (reservas frequentes não invalidam o cache do catálogo inteiro)
+DROP TRIGGER IF EXISTS trg_products_stock_availability ON products;
+CREATE TRIGGER trg_products_stock_availability
+    AFTER UPDATE OF stock_quantity ON products
+    FOR EACH ROW
+    WHEN ((COALESCE(OLD.stock_quantity, 0) > 0) IS DISTINCT FROM (COALESCE(NEW.stock_quantity, 0) > 0))
+    EXECUTE FUNCTION bump_catalog_version();
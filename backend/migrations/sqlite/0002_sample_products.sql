@@ -0,0 +1,11 @@
+-- Produtos de exemplo (apenas em bancos sem produtos)
+INSERT INTO products (name, description, price, category, image_url, is_featured, is_active, stock_quantity)
+SELECT * FROM (VALUES
+    ('Apache AH-64 Helicopter', 'Modelo detalhado do helicóptero de combate Apache AH-64. Perfeito para colecionadores e entusiastas de aviação militar.', 89.90, 'aeronaves', NULL, TRUE, TRUE, 10),
+    ('F-22 Raptor Fighter Jet', 'Caça stealth F-22 Raptor em escala detalhada. Inclui detalhes internos e externos precisos.', 129.90, 'aeronaves', NULL, TRUE, TRUE, 8),
+    ('M1A2 Abrams Tank', 'Tanque de guerra americano M1A2 Abrams com detalhes realistas e alta qualidade de impressão.', 149.90, 'terrestres', NULL, TRUE, TRUE, 5),
+    ('USS Enterprise Aircraft Carrier', 'Porta-aviões nuclear USS Enterprise em escala reduzida com detalhes impressionantes.', 299.90, 'navais', NULL, TRUE, TRUE, 3),
+    ('Millennium Falcon', 'Nave espacial icônica de Star Wars com todos os detalhes externos e internos.', 199.90, 'ficção', NULL, FALSE, TRUE, 7),
+    ('Lamborghini Aventador', 'Superesportivo italiano em escala perfeita com detalhes automotivos precisos.', 179.90, 'automotivos', NULL, FALSE, TRUE, 6)
+)
+WHERE NOT EXISTS (SELECT 1 FROM products);
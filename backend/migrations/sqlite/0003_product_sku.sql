@@ -0,0 +1,3 @@
+-- SKU do fornecedor: chave natural usada pela importação em massa
+ALTER TABLE products ADD COLUMN sku TEXT;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_products_sku ON products(sku);
@@ -0,0 +1,17 @@
+-- Preço em centavos inteiros (substitui price DECIMAL(10,2))
+ALTER TABLE products ADD COLUMN price_cents INTEGER NOT NULL DEFAULT 0 CHECK (price_cents >= 0);
+UPDATE products SET price_cents = CAST(ROUND(price * 100) AS INTEGER);
+
+-- Objetos que dependem da coluna antiga passam a usar price_cents
+DROP TRIGGER IF EXISTS trg_products_catalog_version_update;
+CREATE TRIGGER IF NOT EXISTS trg_products_catalog_version_update
+AFTER UPDATE OF sku, name, description, price_cents, category, image_url, is_featured, is_active ON products
+BEGIN
+    UPDATE catalog_meta SET version = version + 1, updated_at = CURRENT_TIMESTAMP WHERE id = 1;
+END;
+
+DROP INDEX IF EXISTS idx_products_facets;
+CREATE INDEX IF NOT EXISTS idx_products_facets
+    ON products (category, price_cents) WHERE is_active = TRUE;
+
+ALTER TABLE products DROP COLUMN price;
@@ -0,0 +1,10 @@
+-- Imagem do produto: hash do original (nomes dos derivados) e largura original
+ALTER TABLE products ADD COLUMN image_hash VARCHAR(64);
+ALTER TABLE products ADD COLUMN image_width INTEGER;
+
+DROP TRIGGER IF EXISTS trg_products_catalog_version_update;
+CREATE TRIGGER IF NOT EXISTS trg_products_catalog_version_update
+AFTER UPDATE OF sku, name, description, price_cents, category, image_url, image_hash, is_featured, is_active ON products
+BEGIN
+    UPDATE catalog_meta SET version = version + 1, updated_at = CURRENT_TIMESTAMP WHERE id = 1;
+END;
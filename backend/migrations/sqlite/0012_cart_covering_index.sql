@@ -0,0 +1,7 @@
+-- Índice de cobertura do carrinho: leitura por usuário (JOIN com products e
+-- contagem de itens) sem visitar a tabela cart_items (o rowid id já faz parte do índice)
+CREATE INDEX IF NOT EXISTS idx_cart_items_user_product
+    ON cart_items (user_id, product_id, quantity, created_at);
+
+-- Redundante com o índice acima (mesmo prefixo)
+DROP INDEX IF EXISTS idx_cart_user;
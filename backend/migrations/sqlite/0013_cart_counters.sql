@@ -0,0 +1,72 @@
+-- Contador do carrinho por usuário (badge do cabeçalho), mantido por gatilhos
+-- na mesma transação das escritas em cart_items
+CREATE TABLE IF NOT EXISTS cart_counters (
+    user_id INTEGER PRIMARY KEY REFERENCES users (id) ON DELETE CASCADE,
+    total_items INTEGER NOT NULL DEFAULT 0,
+    total_cents INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+INSERT INTO cart_counters (user_id, total_items, total_cents)
+SELECT ci.user_id, SUM(ci.quantity), SUM(ci.quantity * p.price_cents)
+FROM cart_items ci
+JOIN products p ON p.id = ci.product_id
+WHERE TRUE
+GROUP BY ci.user_id
+ON CONFLICT (user_id) DO UPDATE
+SET total_items = excluded.total_items, total_cents = excluded.total_cents, updated_at = CURRENT_TIMESTAMP;
+
+CREATE TRIGGER IF NOT EXISTS trg_cart_items_counter_insert
+AFTER INSERT ON cart_items
+BEGIN
+    INSERT INTO cart_counters (user_id, total_items, total_cents)
+    SELECT new.user_id, new.quantity, new.quantity * price_cents FROM products WHERE id = new.product_id
+    ON CONFLICT (user_id) DO UPDATE
+    SET total_items = total_items + excluded.total_items,
+        total_cents = total_cents + excluded.total_cents,
+        updated_at = CURRENT_TIMESTAMP;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_cart_items_counter_delete
+AFTER DELETE ON cart_items
+BEGIN
+    UPDATE cart_counters
+    SET total_items = total_items - old.quantity,
+        total_cents = total_cents - old.quantity * (SELECT price_cents FROM products WHERE id = old.product_id),
+        updated_at = CURRENT_TIMESTAMP
+    WHERE user_id = old.user_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_cart_items_counter_update
+AFTER UPDATE OF user_id, product_id, quantity ON cart_items
+BEGIN
+    UPDATE cart_counters
+    SET total_items = total_items - old.quantity,
+        total_cents = total_cents - old.quantity * (SELECT price_cents FROM products WHERE id = old.product_id),
+        updated_at = CURRENT_TIMESTAMP
+    WHERE user_id = old.user_id;
+
+    INSERT INTO cart_counters (user_id, total_items, total_cents)
+    SELECT new.user_id, new.quantity, new.quantity * price_cents FROM products WHERE id = new.product_id
+    ON CONFLICT (user_id) DO UPDATE
+    SET total_items = total_items + excluded.total_items,
+        total_cents = total_cents + excluded.total_cents,
+        updated_at = CURRENT_TIMESTAMP;
+END;
+
+-- Mudança de preço corrige o total dos carrinhos que têm o produto
+CREATE TRIGGER IF NOT EXISTS trg_products_cart_counters
+AFTER UPDATE OF price_cents ON products
+WHEN new.price_cents <> old.price_cents
+BEGIN
+    UPDATE cart_counters
+    SET total_cents = total_cents + (new.price_cents - old.price_cents) * (
+            SELECT quantity FROM cart_items
+            WHERE cart_items.user_id = cart_counters.user_id AND cart_items.product_id = new.id
+        ),
+        updated_at = CURRENT_TIMESTAMP
+    WHERE user_id IN (SELECT user_id FROM cart_items WHERE product_id = new.id);
+END;
+
+-- Carrinhos que contêm um produto (usado pelo gatilho de preço)
+CREATE INDEX IF NOT EXISTS idx_cart_items_product ON cart_items (product_id);
@@ -1,12 +1,33 @@
-from flask import Blueprint, request, jsonify
-from backend.utils.database import DatabaseManager
+from flask import Blueprint, request, jsonify, make_response
+from werkzeug.local import LocalProxy
+from backend.utils.database import get_db
 from backend.utils.auth_helpers import require_auth, get_current_user, JWTManager, hash_password, verify_password
 from backend.utils.validators import DataValidator, ValidationError, validate_json
 from backend.utils.rate_limiter import rate_limit, strict_rate_limit
+from backend.utils.guest_cart import GuestCart
 
 # DEFINIR O BLUEPRINT PRIMEIRO
 auth_bp = Blueprint('auth', __name__)
-db = DatabaseManager()
+db = LocalProxy(get_db)
+
+def _with_guest_cart(user_id, body, status):
+    """Resposta de cadastro/login incorporando o carrinho de visitante do cookie
+    
+    O cookie só é apagado se o upsert der certo (senão fica para o próximo login).
+    """
+    guest = GuestCart(db.settings)
+    items = guest.load(request.cookies)
+    if not items:
+        return make_response(jsonify(body), status)
+    
+    result = db.merge_guest_cart(user_id, items)
+    if result['success']:
+        body["cart_merged_items"] = result['merged']
+    
+    response = make_response(jsonify(body), status)
+    if result['success']:
+        guest.clear(response)
+    return response
 
 @auth_bp.route('/register', methods=['POST'])
 @strict_rate_limit(max_requests=3, window_seconds=300)
@@ -30,11 +51,11 @@ def register():
         if result['success']:
             tokens = JWTManager.generate_tokens(result['user'])
             
-            return jsonify({
+            return _with_guest_cart(result['user']['id'], {
                 "message": result['message'],
                 "user": result['user'],
                 "tokens": tokens
-            }), 201
+            }, 201)
         else:
             status_code = 409 if result.get('code') == 'EMAIL_EXISTS' else 400
             return jsonify({"error": result['error']}), status_code
@@ -62,11 +83,11 @@ def login():
         if result['success']:
             tokens = JWTManager.generate_tokens(result['user'])
             
-            return jsonify({
+            return _with_guest_cart(result['user']['id'], {
                 "message": result['message'],
                 "user": result['user'],
                 "tokens": tokens
-            }), 200
+            }, 200)
         else:
             return jsonify({"error": result['error']}), 401
             
@@ -0,0 +1,61 @@
+from flask import Blueprint, jsonify
+from werkzeug.local import LocalProxy
+from backend.utils.database import get_db
+from backend.utils.pagination import encode_cursor
+from backend.utils.fields import PRODUCT_LIST_FIELDS, KEYSET_FIELDS, with_fields, project
+from backend.utils.filters import ProductFilters, category_info
+from backend.utils.http_cache import conditional_get, cached_response
+from backend.utils.money import serialize_product
+from backend.utils.images import with_image
+
+home_bp = Blueprint('home', __name__)
+db = LocalProxy(get_db)
+
+# Os cards da vitrine mostram a descrição
+HOME_FIELDS = with_fields(PRODUCT_LIST_FIELDS, ['description'])
+
+def build_home_snapshot():
+    """Destaques, categorias e primeira página do catálogo em um único documento"""
+    limit = db.settings.PRODUCTS_PAGE_SIZE
+    query_fields = with_fields(HOME_FIELDS, KEYSET_FIELDS)
+    
+    # Mesmas chaves de cache das rotas de produtos: o que uma já carregou a outra reaproveita
+    products = db.catalog_cache.get_or_load(
+        ('products.list', ProductFilters(), limit, None, tuple(query_fields)),
+        lambda: db.filter_products(ProductFilters(), limit=limit + 1, fields=query_fields)
+    )
+    has_more = len(products) > limit
+    products = products[:limit]
+    
+    categories = db.catalog_cache.get_or_load(
+        ('products.categories',),
+        lambda: [category_info(row['category'], row['product_count']) for row in db.get_categories()]
+    )
+    
+    featured = db.get_products(featured_only=True, limit=db.settings.HOME_FEATURED_LIMIT,
+                               fields=HOME_FIELDS)
+    
+    return {
+        "featured": [with_image(serialize_product(product), db.settings.IMAGE_BASE_URL) for product in featured],
+        "categories": categories,
+        "products": {
+            "products": [with_image(serialize_product(project(product, HOME_FIELDS)), db.settings.IMAGE_BASE_URL)
+                         for product in products],
+            "total": len(products),
+            "has_more": has_more,
+            "next_cursor": encode_cursor(products[-1]) if has_more else None
+        }
+    }
+
+@home_bp.route('/home', methods=['GET'])
+@conditional_get
+@cached_response
+def get_home():
+    """Dados da página inicial (snapshot refeito quando o catálogo muda)"""
+    try:
+        snapshot = db.catalog_cache.get_or_load(('home',), build_home_snapshot)
+        return jsonify(snapshot), 200
+        
+    except Exception as e:
+        print(f"❌ Erro ao montar página inicial: {e}")
+        return jsonify({"error": "Erro interno do servidor"}), 500
@@ -0,0 +1,25 @@
+import os
+import re
+from flask import Blueprint, jsonify, send_from_directory
+from werkzeug.local import LocalProxy
+from backend.utils.database import get_db
+
+media_bp = Blueprint('media', __name__)
+db = LocalProxy(get_db)
+
+# <hash>-<derivado>.<formato>, como gerado por utils/images.py
+IMAGE_FILENAME = re.compile(r'^[0-9a-f]{32}-(thumb|card|detail)\.(webp|jpg)$')
+
+# Nome endereçado pelo conteúdo: o arquivo nunca muda, pode ficar em cache para sempre
+IMMUTABLE_MAX_AGE = 31536000
+
+@media_bp.route('/products/<filename>', methods=['GET'])
+def product_image(filename):
+    """Servir derivado de imagem de produto"""
+    if not IMAGE_FILENAME.match(filename):
+        return jsonify({"error": "Imagem não encontrada"}), 404
+    
+    root = os.path.abspath(db.settings.IMAGE_STORAGE_DIR)
+    response = send_from_directory(root, filename, max_age=IMMUTABLE_MAX_AGE, conditional=True)
+    response.headers['Cache-Control'] = f'public, max-age={IMMUTABLE_MAX_AGE}, immutable'
+    return response
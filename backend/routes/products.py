@@ -1,45 +1,177 @@
 from flask import Blueprint, request, jsonify
-from backend.utils.database import DatabaseManager
+from werkzeug.local import LocalProxy
+from backend.utils.database import get_db
+from backend.utils.pagination import encode_cursor, decode_cursor, parse_page_size, parse_page_number
+from backend.utils.fields import PRODUCT_FIELDS, PRODUCT_LIST_FIELDS, KEYSET_FIELDS, parse_fields, with_fields, project
+from backend.utils.validators import ValidationError
+from backend.utils.http_cache import conditional_get, cached_response
+from backend.utils.search import parse_search_terms, highlight_html
+from backend.utils.money import serialize_product
+from backend.utils.images import with_image
+from backend.utils.filters import parse_filters, parse_ids, format_facets, category_info, TRUE_VALUES
 
 products_bp = Blueprint('products', __name__)
-db = DatabaseManager()
+db = LocalProxy(get_db)
 
 @products_bp.route('', methods=['GET'])
+@conditional_get
+@cached_response
 def get_products():
-    """Listar todos os produtos"""
+    """Listar produtos com filtros combinados e paginação por cursor
+
+    ?category=a,b&min_price=&max_price=&in_stock=&featured=&limit=&cursor=&fields=
+    ?facets=true inclui contagens por categoria e faixa de preço.
+    ?ids=1,2,3 busca produtos específicos (ver ``get_products_by_ids``).
+    """
+    if 'ids' in request.args:
+        return get_products_by_ids()
+    
     try:
-        products = db.get_products()
+        try:
+            limit = parse_page_size(request.args.get('limit'),
+                                    db.settings.PRODUCTS_PAGE_SIZE,
+                                    db.settings.PRODUCTS_MAX_PAGE_SIZE)
+            after = decode_cursor(request.args.get('cursor'))
+            fields = parse_fields(request.args.get('fields'), PRODUCT_LIST_FIELDS)
+            filters = parse_filters(request.args)
+        except ValidationError as e:
+            return jsonify({"error": str(e)}), 400
+        
+        # Uma linha extra indica se existe próxima página
+        query_fields = with_fields(fields, KEYSET_FIELDS)
+        products = db.catalog_cache.get_or_load(
+            ('products.list', filters, limit, after, tuple(query_fields)),
+            lambda: db.filter_products(filters, limit=limit + 1, after=after, fields=query_fields)
+        )
+        has_more = len(products) > limit
+        products = products[:limit]
+        next_cursor = encode_cursor(products[-1]) if has_more else None
+        
+        result = {
+            "products": [with_image(serialize_product(project(product, fields)), db.settings.IMAGE_BASE_URL)
+                         for product in products],
+            "total": len(products),
+            "has_more": has_more,
+            "next_cursor": next_cursor
+        }
+        
+        if (request.args.get('facets') or '').lower() in TRUE_VALUES:
+            result["facets"] = db.catalog_cache.get_or_load(
+                ('products.facets', filters),
+                lambda: format_facets(db.get_product_facets(filters))
+            )
+        
+        return jsonify(result), 200
+        
+    except Exception as e:
+        print(f"❌ Erro ao buscar produtos: {e}")
+        return jsonify({"error": "Erro interno do servidor"}), 500
+
+def get_products_by_ids():
+    """Buscar vários produtos por ID em uma consulta (?ids=1,2,3&fields=)"""
+    try:
+        try:
+            ids = parse_ids(request.args.get('ids', ''), db.settings.PRODUCTS_MAX_IDS)
+            fields = parse_fields(request.args.get('fields'), PRODUCT_LIST_FIELDS)
+        except ValidationError as e:
+            return jsonify({"error": str(e)}), 400
+        
+        products = db.catalog_cache.get_or_load(
+            ('products.by_ids', tuple(ids), tuple(fields)),
+            lambda: db.get_products_by_ids(ids, fields=fields)
+        )
+        found = {product['id'] for product in products}
         
         return jsonify({
-            "products": products,
-            "total": len(products)
+            "products": [with_image(serialize_product(project(product, fields)), db.settings.IMAGE_BASE_URL)
+                         for product in products],
+            "total": len(products),
+            "missing": [product_id for product_id in ids if product_id not in found]
         }), 200
         
     except Exception as e:
-        print(f"❌ Erro ao buscar produtos: {e}")
+        print(f"❌ Erro ao buscar produtos por IDs: {e}")
         return jsonify({"error": "Erro interno do servidor"}), 500
 
 @products_bp.route('/featured', methods=['GET'])
+@conditional_get
+@cached_response
 def get_featured_products():
-    """Listar produtos em destaque"""
+    """Listar produtos em destaque (?fields=)"""
     try:
-        products = db.get_products()
-        featured = [p for p in products if p.get('is_featured')]
+        try:
+            fields = parse_fields(request.args.get('fields'), PRODUCT_LIST_FIELDS)
+        except ValidationError as e:
+            return jsonify({"error": str(e)}), 400
         
-        return jsonify(featured), 200
+        products = db.catalog_cache.get_or_load(
+            ('products.featured', tuple(fields)),
+            lambda: db.get_products(featured_only=True, fields=fields)
+        )
+        
+        return jsonify([with_image(serialize_product(product), db.settings.IMAGE_BASE_URL) for product in products]), 200
         
     except Exception as e:
         print(f"❌ Erro ao buscar produtos em destaque: {e}")
         return jsonify({"error": "Erro interno do servidor"}), 500
 
+@products_bp.route('/search', methods=['GET'])
+@conditional_get
+def search_products():
+    """Busca textual por relevância (?q=&limit=&page=&fields=)"""
+    try:
+        try:
+            terms = parse_search_terms(request.args.get('q'))
+            limit = parse_page_size(request.args.get('limit'),
+                                    db.settings.PRODUCTS_PAGE_SIZE,
+                                    db.settings.PRODUCTS_MAX_PAGE_SIZE)
+            page = parse_page_number(request.args.get('page'), db.settings.SEARCH_MAX_PAGE)
+            fields = parse_fields(request.args.get('fields'), PRODUCT_LIST_FIELDS)
+        except ValidationError as e:
+            return jsonify({"error": str(e)}), 400
+        
+        # Uma linha extra indica se existe próxima página
+        products = db.search_products(terms, limit=limit + 1, offset=(page - 1) * limit, fields=fields)
+        has_more = len(products) > limit
+        
+        results = []
+        for product in products[:limit]:
+            result = with_image(serialize_product(project(product, fields)), db.settings.IMAGE_BASE_URL)
+            result['highlight'] = {
+                'name': highlight_html(product.get('name_highlight')),
+                'description': highlight_html(product.get('description_highlight'))
+            }
+            results.append(result)
+        
+        return jsonify({
+            "products": results,
+            "total": len(results),
+            "page": page,
+            "has_more": has_more
+        }), 200
+        
+    except Exception as e:
+        print(f"❌ Erro na busca de produtos: {e}")
+        return jsonify({"error": "Erro interno do servidor"}), 500
+
 @products_bp.route('/<int:product_id>', methods=['GET'])
+@conditional_get
+@cached_response
 def get_product(product_id):
-    """Buscar produto específico por ID"""
+    """Buscar produto específico por ID (?fields=)"""
     try:
-        product = db.get_product_by_id(product_id)
+        try:
+            fields = parse_fields(request.args.get('fields'), PRODUCT_FIELDS)
+        except ValidationError as e:
+            return jsonify({"error": str(e)}), 400
+        
+        product = db.catalog_cache.get_or_load(
+            ('products.by_id', product_id, tuple(fields or ())),
+            lambda: db.get_product_by_id(product_id, fields=fields)
+        )
         
         if product:
-            return jsonify(product), 200
+            return jsonify(with_image(serialize_product(product), db.settings.IMAGE_BASE_URL)), 200
         else:
             return jsonify({"error": "Produto não encontrado"}), 404
             
@@ -48,16 +180,15 @@ def get_product(product_id):
         return jsonify({"error": "Erro interno do servidor"}), 500
 
 @products_bp.route('/categories', methods=['GET'])
+@conditional_get
+@cached_response
 def get_categories():
-    """Listar todas as categorias disponíveis"""
+    """Listar categorias com produtos ativos (derivadas do catálogo)"""
     try:
-        categories = [
-            {"id": "aeronaves", "name": "Aeronaves", "description": "Aviões, helicópteros e aeronaves militares"},
-            {"id": "terrestres", "name": "Terrestres", "description": "Tanques, veículos militares e terrestres"},
-            {"id": "navais", "name": "Navais", "description": "Navios, submarinos e embarcações"},
-            {"id": "ficção", "name": "Ficção Científica", "description": "Naves espaciais e veículos de ficção"},
-            {"id": "automotivos", "name": "Automotivos", "description": "Carros esportivos e veículos civis"}
-        ]
+        categories = db.catalog_cache.get_or_load(
+            ('products.categories',),
+            lambda: [category_info(row['category'], row['product_count']) for row in db.get_categories()]
+        )
         
         return jsonify({"categories": categories}), 200
         
@@ -0,0 +1,34 @@
+import asyncio
+import pytest
+from backend.utils.async_database import AsyncSQLiteManager
+
+class TestAsyncDatabase:
+    """Testes para o gerenciador assíncrono (variante SQLite)"""
+    
+    def test_get_products(self, app):
+        """Teste de listagem de produtos via interface assíncrona"""
+        db = AsyncSQLiteManager(app.db)
+        
+        products = asyncio.run(db.get_products())
+        sync_products = app.db.get_products()
+        
+        assert [p['id'] for p in products] == [p['id'] for p in sync_products]
+    
+    def test_cart_roundtrip(self, app):
+        """Teste de fluxo de carrinho via interface assíncrona"""
+        db = AsyncSQLiteManager(app.db)
+        
+        async def scenario():
+            user = await db.create_user('Usuário Async', 'async@exemplo.com', 'MinhaSenh@123')
+            user_id = user['user']['id']
+            product = (await db.get_products())[0]
+            
+            await db.add_to_cart(user_id, product['id'], 2)
+            return await db.get_cart(user_id)
+        
+        cart = asyncio.run(scenario())
+        items = cart['items']
+        
+        assert len(items) == 1
+        assert items[0]['quantity'] == 2
+        assert cart['total_items'] == 2
@@ -0,0 +1,48 @@
+import gc
+import sqlite3
+import threading
+import pytest
+
+class TestSQLiteConnections:
+    """Testes para as conexões SQLite persistentes por thread"""
+    
+    def test_pragmas_applied(self, app):
+        """Teste de WAL e synchronous aplicados na conexão"""
+        conn = app.db.get_connection()
+        
+        assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+        # NORMAL = 1
+        assert conn.execute('PRAGMA synchronous').fetchone()[0] == 1
+    
+    def test_connection_reused_by_thread(self, app):
+        """Teste de mesma conexão para a mesma thread e outra para outra thread"""
+        conn = app.db.get_connection()
+        assert app.db.get_connection() is conn
+        
+        other = []
+        thread = threading.Thread(target=lambda: other.append(app.db.get_connection()))
+        thread.start()
+        thread.join()
+        
+        assert other[0] is not conn
+    
+    def test_connection_closed_when_thread_ends(self, app):
+        """Teste de conexão fechada quando a thread dona termina"""
+        app.db.get_connection()
+        opened = []
+        
+        def worker():
+            conn = app.db.get_connection()
+            conn.execute('SELECT 1')
+            opened.append(conn)
+        
+        threads = [threading.Thread(target=worker) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+            thread.join()
+        gc.collect()
+        
+        assert len(app.db._sqlite_connections) == 1
+        for conn in opened:
+            with pytest.raises(sqlite3.ProgrammingError):
+                conn.execute('SELECT 1')
@@ -0,0 +1,73 @@
+import pytest
+
+class TestFilters:
+    """Testes para filtros combinados e facetas da listagem"""
+    
+    def test_filter_multiple_categories(self, client):
+        """Teste de filtro por mais de uma categoria"""
+        response = client.get('/api/products?category=navais,aeronaves&fields=id,category')
+        
+        assert response.status_code == 200
+        data = response.get_json()
+        
+        assert data['total'] > 0
+        assert {p['category'] for p in data['products']} <= {'navais', 'aeronaves'}
+    
+    def test_filter_price_range_and_stock(self, client):
+        """Teste de faixa de preço combinada com estoque"""
+        response = client.get('/api/products?min_price=30&max_price=60&in_stock=true&fields=id,price,stock_quantity')
+        
+        assert response.status_code == 200
+        for product in response.get_json()['products']:
+            assert 30 <= float(product['price']) <= 60
+            assert product['stock_quantity'] > 0
+    
+    def test_filter_invalid_price(self, client):
+        """Teste de faixa de preço inválida"""
+        for query in ('min_price=abc', 'min_price=100&max_price=10', 'max_price=-1', 'min_price=1e30'):
+            response = client.get(f'/api/products?{query}')
+            assert response.status_code == 400
+    
+    def test_facets(self, client):
+        """Teste de contagens por categoria e faixa de preço"""
+        all_products = client.get('/api/products?limit=100').get_json()
+        response = client.get('/api/products?category=navais&facets=true')
+        
+        assert response.status_code == 200
+        facets = response.get_json()['facets']
+        
+        # A faceta de categoria ignora o próprio filtro
+        assert len(facets['categories']) > 1
+        assert sum(c['count'] for c in facets['categories']) == all_products['total']
+        
+        navais = [p for p in all_products['products'] if p['category'] == 'navais']
+        assert sum(b['count'] for b in facets['price']) == len(navais)
+    
+    def test_categories_from_catalog(self, client):
+        """Teste de categorias derivadas dos produtos"""
+        data = client.get('/api/products/categories').get_json()
+        
+        navais = [c for c in data['categories'] if c['id'] == 'navais']
+        assert navais[0]['name'] == 'Navais'
+        assert navais[0]['product_count'] >= 1
+    
+    def test_get_products_by_ids(self, client):
+        """Teste de busca de vários produtos por ID na ordem pedida"""
+        response = client.get('/api/products?ids=3,1,999,3&fields=name')
+        
+        assert response.status_code == 200
+        data = response.get_json()
+        
+        assert data['total'] == 2
+        assert data['missing'] == [999]
+        assert set(data['products'][0]) == {'name'}
+        
+        single = client.get('/api/products/3').get_json()
+        assert data['products'][0]['name'] == single['name']
+    
+    def test_get_products_by_ids_limits(self, client):
+        """Teste de validação de ?ids="""
+        too_many = ','.join(str(i) for i in range(1, 200))
+        for query in ('ids=', 'ids=1,abc', f'ids={too_many}'):
+            response = client.get(f'/api/products?{query}')
+            assert response.status_code == 400
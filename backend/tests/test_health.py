@@ -0,0 +1,40 @@
+import pytest
+
+class TestHealth:
+    """Testes para endpoints de monitoramento"""
+    
+    def test_database_stats(self, client, app, auth_headers):
+        """Teste de estatísticas do pool de conexões restritas a administradores"""
+        assert client.get('/api/health/db').status_code == 401
+        assert client.get('/api/health/db', headers=auth_headers).status_code == 403
+        
+        with app.db.get_connection() as conn:
+            conn.execute("UPDATE users SET is_admin = 1 WHERE email = 'teste@exemplo.com'")
+        login = client.post('/api/auth/login', json={
+            'email': 'teste@exemplo.com',
+            'password': 'MinhaSenh@123'
+        }).get_json()
+        headers = {'Authorization': f"Bearer {login['tokens']['access_token']}"}
+        
+        response = client.get('/api/health/db', headers=headers)
+        
+        assert response.status_code == 200
+        data = response.get_json()
+        
+        assert 'db_type' in data
+        assert 'pooled' in data
+    
+    def test_catalog_cache_stats(self, client):
+        """Teste de acerto do cache do catálogo em leituras repetidas"""
+        client.get('/api/products/featured')
+        before = client.get('/api/health/cache').get_json()
+        
+        client.get('/api/products/featured')
+        response = client.get('/api/health/cache')
+        
+        assert response.status_code == 200
+        data = response.get_json()
+        
+        assert 'hit_ratio' in data
+        assert data['version'] is not None
+        assert data['hits'] == before['hits'] + 1
@@ -0,0 +1,33 @@
+import pytest
+
+class TestHome:
+    """Testes para o endpoint agregado da página inicial"""
+    
+    def test_get_home(self, client):
+        """Teste de destaques, categorias e primeira página em uma resposta"""
+        response = client.get('/api/home')
+        
+        assert response.status_code == 200
+        data = response.get_json()
+        
+        assert len(data['featured']) > 0
+        assert all(product['is_featured'] for product in data['featured'])
+        assert len(data['categories']) > 0
+        assert data['products']['total'] > 0
+        assert 'next_cursor' in data['products']
+    
+    def test_home_snapshot_refreshed_on_catalog_change(self, app, client):
+        """Teste de snapshot refeito após alteração do catálogo"""
+        first = client.get('/api/home')
+        
+        with app.db.get_connection() as conn:
+            cursor = app.db.get_cursor(conn)
+            cursor.execute("UPDATE products SET name = 'Benchy Renomeado' WHERE id = 1")
+            conn.commit()
+        app.db.catalog_cache.invalidate()
+        
+        second = client.get('/api/home', headers={'If-None-Match': first.headers['ETag']})
+        
+        assert second.status_code == 200
+        names = [p['name'] for p in second.get_json()['products']['products']]
+        assert 'Benchy Renomeado' in names
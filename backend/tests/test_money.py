@@ -0,0 +1,54 @@
+import pytest
+from backend.utils.money import to_cents, format_brl, serialize_product
+from backend.utils.validators import ValidationError
+
+class TestMoney:
+    """Testes para valores monetários em centavos"""
+    
+    def test_to_cents(self):
+        """Teste de conversão de reais para centavos"""
+        assert to_cents('89,90') == 8990
+        assert to_cents('0.1') == 10
+        assert to_cents(0.29) == 29
+        assert to_cents('1.005') == 101
+        
+        with pytest.raises(ValidationError):
+            to_cents('abc')
+    
+    def test_to_cents_out_of_range(self):
+        """Teste de valores grandes demais rejeitados como inválidos"""
+        assert to_cents('21474836.47') == 2 ** 31 - 1
+        
+        for value in ('1e30', '9' * 29, '21474836.48', '-21474836.49'):
+            with pytest.raises(ValidationError):
+                to_cents(value)
+    
+    def test_format_brl(self):
+        """Teste de formatação em reais"""
+        assert format_brl(8990) == 'R$ 89,90'
+        assert format_brl(123456789) == 'R$ 1.234.567,89'
+        assert format_brl(5) == 'R$ 0,05'
+    
+    def test_serialize_product(self):
+        """Teste de serialização de preço e booleanos"""
+        product = serialize_product({'id': 1, 'price_cents': 1990, 'is_featured': 1})
+        
+        assert product == {
+            'id': 1,
+            'price_cents': 1990,
+            'price': 19.9,
+            'price_display': 'R$ 19,90',
+            'is_featured': True
+        }
+    
+    def test_cart_total_exact(self, client, auth_headers):
+        """Teste de total do carrinho sem erro de centavos"""
+        for product_id, quantity in ((1, 3), (2, 1)):
+            client.post('/api/cart', headers=auth_headers,
+                        json={'product_id': product_id, 'quantity': quantity})
+        
+        data = client.get('/api/cart', headers=auth_headers).get_json()
+        expected = sum(item['price_cents'] * item['quantity'] for item in data['items'])
+        
+        assert data['total_price_cents'] == expected
+        assert data['total_price_display'] == format_brl(expected)
@@ -0,0 +1,55 @@
+import io
+import pytest
+from backend.utils.product_import import ProductImporter
+
+CSV_CATALOG = """sku,name,description,price,category,is_featured,stock_quantity
+BENCHY-001,Benchy Clássico,O famoso barco de teste,15.90,navais,true,20
+BENCHY-002,Benchy Pixelizado,Versão retrô do Benchy,19.90,navais,false,5
+BENCHY-003,,Sem nome,9.90,navais,false,1
+"""
+
+class TestProductImport:
+    """Testes para a importação em massa de produtos"""
+    
+    def test_import_csv(self, app):
+        """Teste de importação CSV com linha inválida"""
+        result = ProductImporter(app.db).run(io.StringIO(CSV_CATALOG), 'csv')
+        
+        assert result['imported'] == 2
+        assert result['rejected'] == 1
+        assert result['errors'][0]['line'] == 4
+        
+        names = [p['name'] for p in app.db.get_products(category='navais')]
+        assert 'Benchy Clássico' in names
+    
+    def test_import_ndjson_upsert_by_sku(self, app):
+        """Teste de atualização de produto existente pelo SKU"""
+        ProductImporter(app.db).run(io.StringIO(CSV_CATALOG), 'csv')
+        
+        ndjson = '{"sku": "BENCHY-001", "name": "Benchy Clássico v2", "price": "17.50", "category": "navais"}\n'
+        result = ProductImporter(app.db, chunk_size=1).run(io.StringIO(ndjson), 'ndjson')
+        
+        assert result['imported'] == 1
+        
+        products = [p for p in app.db.get_products(category='navais') if p['sku'] == 'BENCHY-001']
+        assert len(products) == 1
+        assert products[0]['name'] == 'Benchy Clássico v2'
+    
+    def test_import_price_out_of_range(self, app):
+        """Teste de preço fora do limite contado como erro da linha"""
+        csv_data = CSV_CATALOG + 'BENCHY-004,Benchy Dourado,Caro demais,1e30,navais,false,1\n'
+        result = ProductImporter(app.db).run(io.StringIO(csv_data), 'csv')
+        
+        assert result['imported'] == 2
+        assert result['rejected'] == 2
+        assert result['errors'][1]['line'] == 5
+    
+    def test_import_ndjson_non_object_lines(self, app):
+        """Teste de linhas NDJSON que não são objetos contadas como erro"""
+        ndjson = ('[1, 2]\n5\n"x"\n'
+                  '{"sku": "BENCHY-005", "name": "Benchy Lunar", "price": "12.00", "category": "navais"}\n')
+        result = ProductImporter(app.db).run(io.StringIO(ndjson), 'ndjson')
+        
+        assert result['imported'] == 1
+        assert result['rejected'] == 3
+        assert [error['line'] for error in result['errors']] == [1, 2, 3]
@@ -1,3 +1,4 @@
+import gzip
 import pytest
 
 class TestProducts:
@@ -118,4 +119,117 @@ class TestProducts:
         for category in data['categories']:
             assert 'id' in category
             assert 'name' in category
-            assert 'description' in category
\ No newline at end of file
+            assert 'description' in category
+    
+    def test_get_products_pagination(self, client):
+        """Teste de paginação por cursor sem repetir produtos"""
+        first = client.get('/api/products?limit=4').get_json()
+        
+        assert len(first['products']) == 4
+        assert first['has_more'] is True
+        assert first['next_cursor']
+        
+        second = client.get(f"/api/products?limit=4&cursor={first['next_cursor']}").get_json()
+        
+        first_ids = {p['id'] for p in first['products']}
+        second_ids = {p['id'] for p in second['products']}
+        assert second_ids and not first_ids & second_ids
+        assert second['has_more'] is False
+        assert second['next_cursor'] is None
+    
+    def test_get_products_invalid_cursor(self, client):
+        """Teste de cursor de paginação inválido"""
+        response = client.get('/api/products?cursor=invalido')
+        
+        assert response.status_code == 400
+        data = response.get_json()
+        assert 'error' in data
+    
+    def test_get_products_default_projection(self, client):
+        """Teste de projeção compacta padrão na listagem"""
+        data = client.get('/api/products').get_json()
+        
+        for product in data['products']:
+            assert 'description' not in product
+            assert 'name' in product
+            assert 'price' in product
+    
+    def test_get_products_sparse_fields(self, client):
+        """Teste de seleção de campos com ?fields="""
+        data = client.get('/api/products?fields=id,name&limit=2').get_json()
+        
+        for product in data['products']:
+            assert set(product) == {'id', 'name'}
+        
+        product_id = data['products'][0]['id']
+        product = client.get(f'/api/products/{product_id}?fields=name,description').get_json()
+        assert set(product) == {'name', 'description'}
+    
+    def test_get_products_invalid_fields(self, client):
+        """Teste de campo inexistente em ?fields="""
+        response = client.get('/api/products?fields=id,password_hash')
+        
+        assert response.status_code == 400
+        data = response.get_json()
+        assert 'error' in data
+    
+    def test_get_products_etag(self, client):
+        """Teste de GET condicional com If-None-Match"""
+        response = client.get('/api/products')
+        
+        assert response.status_code == 200
+        assert response.headers.get('ETag')
+        assert 'stale-while-revalidate' in response.headers.get('Cache-Control', '')
+        
+        response = client.get('/api/products', headers={'If-None-Match': response.headers['ETag']})
+        
+        assert response.status_code == 304
+        assert response.data == b''
+    
+    def test_get_categories_if_modified_since(self, client):
+        """Teste de GET condicional com If-Modified-Since"""
+        response = client.get('/api/products/categories')
+        
+        assert response.status_code == 200
+        last_modified = response.headers.get('Last-Modified')
+        assert last_modified
+        
+        response = client.get('/api/products/categories', headers={'If-Modified-Since': last_modified})
+        
+        assert response.status_code == 304
+    
+    def test_get_products_gzip(self, client):
+        """Teste de resposta comprimida servida do cache"""
+        url = '/api/products?fields=id,name,description,price,category'
+        plain = client.get(url)
+        
+        for _ in range(2):
+            response = client.get(url, headers={'Accept-Encoding': 'gzip'})
+            
+            assert response.status_code == 200
+            assert response.headers.get('Content-Encoding') == 'gzip'
+            assert 'Accept-Encoding' in response.headers.get('Vary', '')
+            assert gzip.decompress(response.data) == plain.data
+            assert response.headers['ETag'] != plain.headers['ETag']
+    
+    def test_response_cache_region(self, app, client, monkeypatch):
+        """Teste de URLs inventadas sem expulsar os dados do catálogo do cache"""
+        cache = app.db.catalog_cache
+        monkeypatch.setattr(cache, 'response_max_entries', 4)
+        
+        client.get('/api/products?limit=2&fields=id')
+        client.get('/api/products/featured')
+        entries = cache.get_stats()['entries']
+        assert entries > 0
+        
+        for i in range(10):
+            client.get(f'/api/products/featured?x={i}')
+        
+        stats = cache.get_stats()
+        assert stats['entries'] == entries
+        assert stats['response_entries'] == 4
+        
+        # Mesmos parâmetros em outra ordem: mesma entrada
+        hits = stats['hits']
+        client.get('/api/products?fields=id&limit=2')
+        assert cache.get_stats()['hits'] == hits + 1
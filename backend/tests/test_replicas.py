@@ -0,0 +1,79 @@
+import time
+import pytest
+from backend.utils import replicas
+from backend.utils.replicas import ReplicaRouter, parse_replica_urls
+
+REPLICA_URLS = ['postgresql://replica-a/db', 'postgresql://replica-b/db']
+
+@pytest.fixture
+def router(app, monkeypatch):
+    """Roteador com réplicas falsas: conexões são só o índice da réplica"""
+    router = ReplicaRouter(REPLICA_URLS, app.db.settings)
+    monkeypatch.setattr(router, '_connect', lambda index: f'replica-{index}')
+    # Atraso já medido: nenhuma medição em segundo plano durante o teste
+    router._checked_at = [time.monotonic()] * len(REPLICA_URLS)
+    router._lag = [0.0, 0.0]
+    return router
+
+class TestReplicaRouter:
+    """Testes para o roteamento de leituras entre réplicas e primário"""
+    
+    def test_parse_replica_urls(self):
+        """Teste de lista de URLs normalizada"""
+        assert parse_replica_urls(' postgres://a/db, ,postgresql://b/db') == [
+            'postgresql://a/db', 'postgresql://b/db'
+        ]
+    
+    def test_round_robin_and_fallback(self, router, app):
+        """Teste de réplicas saudáveis em rodízio e primário sem réplica saudável"""
+        assert {router.connection_for_read(), router.connection_for_read()} == {'replica-0', 'replica-1'}
+        
+        router._lag = [app.db.settings.DB_REPLICA_MAX_LAG + 1, None]
+        assert router.connection_for_read() is None
+        assert router.stats['primary_fallbacks'] == 1
+    
+    def test_read_your_writes_cookie(self, router, app):
+        """Teste de leitura no primário após escrita, em outra requisição (outro worker)"""
+        cookie_name = app.db.settings.DB_READ_YOUR_WRITES_COOKIE
+        
+        with app.test_request_context('/api/cart', method='POST'):
+            router.mark_write(1)
+            assert router.connection_for_read(1) is None
+            # Leituras sem usuário (catálogo) continuam nas réplicas
+            assert router.connection_for_read() is not None
+            response = app.process_response(app.response_class())
+        
+        cookie = response.headers['Set-Cookie']
+        assert cookie.startswith(f'{cookie_name}=')
+        value = cookie.split(';')[0].split('=', 1)[1]
+        
+        # Outro processo: sem estado em memória, só o cookie
+        other = ReplicaRouter(REPLICA_URLS, app.db.settings)
+        other._connect, other._checked_at, other._lag = router._connect, router._checked_at, router._lag
+        with app.test_request_context('/api/cart', headers={'Cookie': f'{cookie_name}={value}'}):
+            assert other.connection_for_read(1) is None
+        
+        expired = time.time() - app.db.settings.DB_READ_YOUR_WRITES_WINDOW - 1
+        with app.test_request_context('/api/cart', headers={'Cookie': f'{cookie_name}={expired}'}):
+            assert other.connection_for_read(1) is not None
+        with app.test_request_context('/api/cart', headers={'Cookie': f'{cookie_name}=abc'}):
+            assert other.connection_for_read(1) is not None
+    
+    def test_unreachable_replica_probed_in_background(self, app, monkeypatch):
+        """Teste de réplica inacessível medida fora da requisição e tirada da rotação"""
+        def unreachable(*args, **kwargs):
+            time.sleep(0.2)
+            raise OSError('connection timed out')
+        monkeypatch.setattr(replicas.psycopg, 'connect', unreachable)
+        
+        router = ReplicaRouter(REPLICA_URLS[:1], app.db.settings)
+        router._lag = [0.0]
+        monkeypatch.setattr(router, '_connect', lambda index: f'replica-{index}')
+        
+        started = time.monotonic()
+        assert router.connection_for_read() == 'replica-0'
+        assert time.monotonic() - started < 0.1
+        
+        router._probe_thread.join()
+        assert router._lag == [None]
+        assert router.connection_for_read() is None
@@ -0,0 +1,427 @@
+"""
+Gerenciador de banco de dados assíncrono (deploy ASGI)
+
+``AsyncDatabaseManager`` espelha os métodos públicos do ``DatabaseManager`` sobre
+``psycopg.AsyncConnection`` com um pool assíncrono. Para SQLite, que não tem
+driver assíncrono na stdlib, ``AsyncSQLiteManager`` executa o gerenciador
+síncrono em threads via ``asyncio.to_thread``.
+"""
+
+import asyncio
+from datetime import datetime
+from typing import Optional, Dict, Any, List
+from psycopg.rows import dict_row
+from psycopg_pool import AsyncConnectionPool
+from backend.config import get_config
+from backend.utils.database import DatabaseManager, cart_add_failure, cart_counter, cart_from_rows
+from backend.utils.queries import QueryRegistry
+from backend.utils.search import search_params
+from backend.utils.filters import ProductFilters, listing_query, facets_query
+from backend.utils.fields import with_fields
+from backend.utils.cart import CartOperation
+
+class AsyncDatabaseManager:
+    """Gerenciador PostgreSQL assíncrono com pool de conexões"""
+
+    def __init__(self, database_url: str):
+        self.db_type = 'postgresql'
+        self.database_url = database_url
+        self.settings = get_config()
+        self.queries = QueryRegistry(self.db_type)
+        self.pool = AsyncConnectionPool(
+            database_url,
+            min_size=self.settings.DB_POOL_MIN_SIZE,
+            max_size=self.settings.DB_POOL_MAX_SIZE,
+            max_idle=self.settings.DB_POOL_MAX_IDLE,
+            timeout=self.settings.DB_POOL_TIMEOUT,
+            kwargs={'row_factory': dict_row},
+            check=AsyncConnectionPool.check_connection,
+            name='3dbenchy-async-pool',
+            open=False
+        )
+
+    async def open(self):
+        """Abrir o pool (deve ser chamado dentro do event loop da aplicação)"""
+        await self.pool.open()
+        print(f"🔌 Pool assíncrono aberto (min={self.settings.DB_POOL_MIN_SIZE}, max={self.settings.DB_POOL_MAX_SIZE})")
+
+    async def close(self):
+        await self.pool.close()
+
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Estatísticas do pool de conexões para monitoramento"""
+        stats = self.pool.get_stats()
+        stats.update({'db_type': self.db_type, 'pooled': True})
+        return stats
+
+    async def _fetchone(self, name: str, params=(), columns=None) -> Optional[Dict[str, Any]]:
+        async with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            await self.queries.execute(cursor, name, params, columns)
+            return await cursor.fetchone()
+
+    async def _fetchall(self, name: str, params=(), columns=None) -> List[Dict[str, Any]]:
+        async with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            await self.queries.execute(cursor, name, params, columns)
+            return await cursor.fetchall()
+
+    async def _execute(self, name: str, params=()) -> int:
+        """Executar comando de escrita e retornar linhas afetadas"""
+        async with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            await self.queries.execute(cursor, name, params)
+            return cursor.rowcount
+
+    # Métodos para usuários
+    async def create_user(self, name: str, email: str, password: str = None,
+                          oauth_provider: str = None, oauth_id: str = None,
+                          avatar_url: str = None) -> Dict[str, Any]:
+        """Criar novo usuário"""
+        try:
+            if await self._fetchone('users.id_by_email', (email,)):
+                return {
+                    'success': False,
+                    'error': 'Email já cadastrado',
+                    'code': 'EMAIL_EXISTS'
+                }
+
+            # PBKDF2 é CPU-bound: calcular fora do event loop
+            if password:
+                password_hash, salt = await asyncio.to_thread(DatabaseManager.hash_password, password)
+            else:
+                password_hash, salt = None, None
+
+            row = await self._fetchone('users.insert',
+                                       (name, email, password_hash, salt, oauth_provider, oauth_id, avatar_url))
+
+            print(f"✅ Usuário criado: {email} (ID: {row['id']})")
+            return {
+                'success': True,
+                'message': 'Usuário criado com sucesso',
+                'user': {
+                    'id': row['id'],
+                    'name': name,
+                    'email': email,
+                    'avatar_url': avatar_url,
+                    'is_admin': False
+                }
+            }
+
+        except Exception as e:
+            print(f"❌ Erro ao criar usuário: {e}")
+            return {'success': False, 'error': 'Erro interno do servidor'}
+
+    async def authenticate_user(self, email: str, password: str) -> Dict[str, Any]:
+        """Autenticar usuário com email e senha"""
+        try:
+            user = await self._fetchone('users.login_lookup', (email,))
+
+            if user and await asyncio.to_thread(
+                DatabaseManager.verify_password, password, user['password_hash'], user['salt']
+            ):
+                print(f"✅ Login bem-sucedido: {email}")
+                return {
+                    'success': True,
+                    'message': 'Login realizado com sucesso',
+                    'user': {
+                        'id': user['id'],
+                        'name': user['name'],
+                        'email': user['email'],
+                        'avatar_url': user['avatar_url'],
+                        'is_admin': bool(user['is_admin'])
+                    }
+                }
+            return {
+                'success': False,
+                'error': 'Email ou senha incorretos'
+            }
+
+        except Exception as e:
+            print(f"❌ Erro na autenticação: {e}")
+            return {'success': False, 'error': 'Erro interno do servidor'}
+
+    async def get_user_by_id(self, user_id: int) -> Optional[Dict[str, Any]]:
+        """Buscar usuário por ID"""
+        try:
+            user = await self._fetchone('users.by_id', (user_id,))
+
+            if user:
+                return {
+                    'id': user['id'],
+                    'name': user['name'],
+                    'email': user['email'],
+                    'avatar_url': user['avatar_url'],
+                    'is_admin': bool(user['is_admin']),
+                    'created_at': user['created_at']
+                }
+            return None
+
+        except Exception as e:
+            print(f"❌ Erro ao buscar usuário: {e}")
+            return None
+
+    # Métodos para produtos
+    async def get_products(self, category: str = None, featured_only: bool = False,
+                           limit: int = None, after: tuple = None,
+                           fields: List[str] = None) -> List[Dict[str, Any]]:
+        """Buscar produtos com filtros opcionais (paginação keyset via ``after``)"""
+        try:
+            name = 'products.featured' if featured_only else 'products.list'
+            params = []
+
+            if category:
+                name += '_by_category'
+                params.append(category)
+
+            if after:
+                created_at, last_id = after
+                if isinstance(created_at, str):
+                    created_at = datetime.fromisoformat(created_at)
+                name += '_after'
+                params.extend([created_at, last_id])
+
+            params.append(limit)
+            return await self._fetchall(name, params, fields)
+
+        except Exception as e:
+            print(f"❌ Erro ao buscar produtos: {e}")
+            return []
+
+    async def get_products_by_ids(self, ids: List[int], fields: List[str] = None) -> List[Dict[str, Any]]:
+        """Buscar vários produtos ativos em uma consulta, na ordem dos IDs pedidos"""
+        if not ids:
+            return []
+        try:
+            rows = await self._fetchall('products.by_ids', (list(ids),), with_fields(fields, ['id']) if fields else None)
+            by_id = {row['id']: row for row in rows}
+            return [by_id[product_id] for product_id in ids if product_id in by_id]
+
+        except Exception as e:
+            print(f"❌ Erro ao buscar produtos por IDs: {e}")
+            return []
+
+    async def filter_products(self, filters: ProductFilters, limit: int, after: tuple = None,
+                              fields: List[str] = None) -> List[Dict[str, Any]]:
+        """Listagem com filtros combinados (mesma ordenação e cursor de ``get_products``)"""
+        try:
+            name, sql, params = listing_query(filters, after=bool(after))
+            self.queries.register(name, sql)
+
+            if after:
+                created_at, last_id = after
+                if isinstance(created_at, str):
+                    created_at = datetime.fromisoformat(created_at)
+                params.extend([created_at, last_id])
+            params.append(limit)
+
+            return await self._fetchall(name, params, fields)
+
+        except Exception as e:
+            print(f"❌ Erro ao filtrar produtos: {e}")
+            return []
+
+    async def get_product_facets(self, filters: ProductFilters) -> List[Dict[str, Any]]:
+        """Contagens por categoria e faixa de preço em uma única consulta"""
+        try:
+            name, sql, params = facets_query(filters)
+            self.queries.register(name, sql)
+            return await self._fetchall(name, params)
+
+        except Exception as e:
+            print(f"❌ Erro ao calcular facetas: {e}")
+            return []
+
+    async def get_categories(self) -> List[Dict[str, Any]]:
+        """Categorias com produtos ativos e suas contagens"""
+        try:
+            return await self._fetchall('products.categories')
+
+        except Exception as e:
+            print(f"❌ Erro ao buscar categorias: {e}")
+            return []
+
+    async def get_product_by_id(self, product_id: int, fields: List[str] = None) -> Optional[Dict[str, Any]]:
+        """Buscar produto ativo por ID"""
+        try:
+            return await self._fetchone('products.by_id', (product_id,), fields)
+
+        except Exception as e:
+            print(f"❌ Erro ao buscar produto: {e}")
+            return None
+
+    async def search_products(self, terms: List[str], limit: int, offset: int = 0,
+                              fields: List[str] = None) -> List[Dict[str, Any]]:
+        """Busca textual em produtos ativos, ordenada por relevância"""
+        try:
+            columns = [f'p.{field}' for field in fields] if fields else ['p.*']
+            return await self._fetchall('products.search',
+                                        search_params(self.db_type, terms, limit, offset), columns)
+
+        except Exception as e:
+            print(f"❌ Erro na busca de produtos: {e}")
+            return []
+
+    # Métodos do carrinho
+    async def get_cart(self, user_id: int) -> Dict[str, Any]:
+        """Itens do carrinho com dados do produto e totais, em uma consulta"""
+        try:
+            return cart_from_rows(await self._fetchall('cart.summary', (user_id,)))
+
+        except Exception as e:
+            print(f"❌ Erro ao buscar carrinho: {e}")
+            return cart_from_rows([])
+
+    async def get_cart_counter(self, user_id: int) -> Dict[str, int]:
+        """Itens e total do carrinho (badge) lidos de cart_counters"""
+        try:
+            return cart_counter(await self._fetchone('cart.counter', (user_id,)))
+
+        except Exception as e:
+            print(f"❌ Erro ao contar itens do carrinho: {e}")
+            return {'total_items': 0, 'total_cents': 0}
+
+    async def add_to_cart(self, user_id: int, product_id: int, quantity: int = 1) -> Dict[str, Any]:
+        """Adicionar produto ao carrinho (soma à quantidade existente)"""
+        try:
+            row = await self._fetchone('cart.add', (user_id, quantity, product_id, quantity))
+            if row is None:
+                product = await self._fetchone('products.by_id', (product_id,), ['id', 'stock_quantity'])
+                return cart_add_failure(product)
+
+            return {
+                'success': True,
+                'message': 'Produto adicionado ao carrinho',
+                'quantity': row['quantity'],
+                'total_items': int(row['total_items']),
+                'total_cents': int(row['total_cents'])
+            }
+
+        except Exception as e:
+            print(f"❌ Erro ao adicionar ao carrinho: {e}")
+            return {'success': False, 'error': 'Erro ao adicionar ao carrinho'}
+
+    async def remove_from_cart(self, user_id: int, cart_item_id: int) -> Dict[str, Any]:
+        """Remover item do carrinho do usuário e devolver o contador atualizado"""
+        try:
+            async with self.pool.connection() as conn:
+                cursor = conn.cursor()
+
+                await self.queries.execute(cursor, 'cart.delete_item', (cart_item_id, user_id))
+                if not cursor.rowcount:
+                    return {'success': False, 'error': 'Item não encontrado'}
+
+                await self.queries.execute(cursor, 'cart.counter', (user_id,))
+                counter = cart_counter(await cursor.fetchone())
+                return {'success': True, 'message': 'Item removido do carrinho', **counter}
+
+        except Exception as e:
+            print(f"❌ Erro ao remover do carrinho: {e}")
+            return {'success': False, 'error': 'Erro ao remover do carrinho'}
+
+    async def clear_cart(self, user_id: int) -> Dict[str, Any]:
+        """Remover todos os itens do carrinho do usuário"""
+        try:
+            await self._execute('cart.clear', (user_id,))
+            return {'success': True, 'message': 'Carrinho limpo'}
+
+        except Exception as e:
+            print(f"❌ Erro ao limpar carrinho: {e}")
+            return {'success': False, 'error': 'Erro ao limpar carrinho'}
+
+    async def merge_guest_cart(self, user_id: int, items: Dict[int, int]) -> Dict[str, Any]:
+        """Incorporar o carrinho de visitante (``{product_id: quantidade}``) em um upsert"""
+        if not items:
+            return {'success': True, 'merged': 0}
+        try:
+            merged = await self._execute('cart.merge', (user_id, list(items.keys()), list(items.values())))
+            return {'success': True, 'merged': merged}
+
+        except Exception as e:
+            print(f"❌ Erro ao incorporar carrinho de visitante: {e}")
+            return {'success': False, 'error': 'Erro ao incorporar carrinho de visitante'}
+
+    async def apply_cart_operations(self, user_id: int, operations: List[CartOperation]) -> Dict[str, Any]:
+        """Aplicar operações do carrinho em uma transação e devolver o carrinho resultante"""
+        try:
+            async with self.pool.connection() as conn:
+                cursor = conn.cursor()
+
+                for index, operation in enumerate(operations):
+                    if operation.op == 'clear':
+                        await self.queries.execute(cursor, 'cart.clear', (user_id,))
+                    elif operation.op == 'remove' or operation.quantity == 0:
+                        await self.queries.execute(cursor, 'cart.delete_product', (user_id, operation.product_id))
+                    else:
+                        name = 'cart.add' if operation.op == 'add' else 'cart.set'
+                        await self.queries.execute(cursor, name, (user_id, operation.quantity,
+                                                                  operation.product_id, operation.quantity))
+                        if await cursor.fetchone() is None:
+                            await conn.rollback()
+                            product = await self._fetchone('products.by_id', (operation.product_id,),
+                                                           ['id', 'stock_quantity'])
+                            return {**cart_add_failure(product), 'index': index}
+
+                await self.queries.execute(cursor, 'cart.summary', (user_id,))
+                return {'success': True, 'cart': cart_from_rows(await cursor.fetchall())}
+
+        except Exception as e:
+            print(f"❌ Erro ao atualizar carrinho: {e}")
+            return {'success': False, 'error': 'Erro ao atualizar carrinho'}
+
+class AsyncSQLiteManager:
+    """Interface assíncrona para SQLite delegando ao DatabaseManager em threads
+
+    Cada thread do executor mantém sua própria conexão persistente (ver
+    ``DatabaseManager._get_sqlite_connection``).
+    """
+
+    PUBLIC_METHODS = (
+        'create_user', 'authenticate_user', 'get_user_by_id',
+        'get_products', 'get_product_by_id', 'search_products',
+        'get_products_by_ids', 'filter_products', 'get_product_facets', 'get_categories',
+        'get_cart', 'get_cart_counter', 'add_to_cart', 'remove_from_cart', 'clear_cart',
+        'apply_cart_operations', 'merge_guest_cart',
+    )
+
+    def __init__(self, db: DatabaseManager):
+        self.db = db
+        self.db_type = db.db_type
+
+    def __getattr__(self, name):
+        if name not in self.PUBLIC_METHODS:
+            raise AttributeError(name)
+
+        method = getattr(self.db, name)
+
+        async def offloaded(*args, **kwargs):
+            return await asyncio.to_thread(method, *args, **kwargs)
+
+        offloaded.__name__ = name
+        offloaded.__doc__ = method.__doc__
+        return offloaded
+
+    async def open(self):
+        await asyncio.to_thread(self.db.init_database)
+
+    async def close(self):
+        await asyncio.to_thread(self.db.close)
+
+    def get_pool_stats(self) -> Dict[str, Any]:
+        return self.db.get_pool_stats()
+
+async def create_async_db(db_path=None):
+    """Criar o gerenciador assíncrono adequado ao banco configurado
+
+    A detecção de DATABASE_URL é a mesma do ``DatabaseManager``. No PostgreSQL
+    o schema não é verificado aqui: use ``python -m utils.migrations upgrade``.
+    """
+    sync_db = DatabaseManager(db_path, init_schema=False)
+
+    if sync_db.db_type == 'postgresql':
+        db = AsyncDatabaseManager(sync_db.database_url)
+    else:
+        db = AsyncSQLiteManager(sync_db)
+
+    await db.open()
+    return db
@@ -1,19 +1,49 @@
 import sqlite3
 import psycopg
 from psycopg.rows import dict_row
+from psycopg_pool import ConnectionPool
 import hashlib
 import secrets
 import jwt
 import os
+import threading
+import weakref
+import json
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any, List
 from urllib.parse import urlparse
+from flask import current_app, has_app_context
+from backend.config import get_config
+from backend.utils.migrations import MigrationRunner
+from backend.utils.queries import QueryRegistry
+from backend.utils.replicas import ReplicaRouter, parse_replica_urls
+from backend.utils.catalog_cache import CatalogCache
+from backend.utils.search import search_params
+from backend.utils.filters import ProductFilters, listing_query, facets_query
+from backend.utils.fields import with_fields
+from backend.utils.inventory import InventoryManager
+from backend.utils.cart import CartOperation
+
+class _ThreadConnection:
+    """Conexão SQLite de uma thread, guardada no thread-local do DatabaseManager"""
+    __slots__ = ('conn', '__weakref__')
+
+    def __init__(self, conn):
+        self.conn = conn
 
 class DatabaseManager:
     """Gerenciador de banco de dados SQLite com funcionalidades completas"""
     
-    def __init__(self, db_path=None):
+    def __init__(self, db_path=None, init_schema=True):
         """Inicializar gerenciador de banco de dados"""
+        self.settings = get_config()
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        self._local = threading.local()
+        # Conexões SQLite vivas (fracas: somem quando a thread dona termina)
+        self._sqlite_connections = weakref.WeakSet()
+        self.replicas = None
+        
         # Detectar tipo de banco baseado na URL
         database_url = os.environ.get('DATABASE_URL')
         
@@ -38,6 +68,11 @@ class DatabaseManager:
                 self.db_type = 'postgresql'
                 self.database_url = database_url
                 print(f"🐘 Usando PostgreSQL: {database_url[:50]}...")
+                
+                replica_urls = parse_replica_urls(self.settings.DATABASE_REPLICA_URLS)
+                if replica_urls:
+                    self.replicas = ReplicaRouter(replica_urls, self.settings)
+                    print(f"📚 {len(replica_urls)} réplica(s) de leitura configurada(s)")
             else:
                 print("❌ Não foi possível configurar PostgreSQL, usando SQLite")
                 self.db_type = 'sqlite'
@@ -49,7 +84,19 @@ class DatabaseManager:
             self.db_path = db_path or "3dbenchy.db"
             print(f"📁 Usando SQLite: {self.db_path}")
         
-        self.init_database()
+        self.queries = QueryRegistry(self.db_type)
+        self.catalog_cache = CatalogCache(
+            self,
+            max_entries=self.settings.CATALOG_CACHE_MAX_ENTRIES,
+            ttl=self.settings.CATALOG_CACHE_TTL,
+            version_check_interval=self.settings.CATALOG_VERSION_CHECK_INTERVAL,
+            enabled=self.settings.CATALOG_CACHE_ENABLED,
+            response_max_entries=self.settings.HTTP_RESPONSE_CACHE_MAX_ENTRIES
+        )
+        self.inventory = InventoryManager(self)
+        
+        if init_schema:
+            self.init_database()
     
     def _build_database_url_from_components(self):
         """Tentar construir DATABASE_URL a partir de componentes individuais"""
@@ -78,16 +125,119 @@ class DatabaseManager:
             print(f"❌ Erro ao construir DATABASE_URL: {e}")
             return None
 
-    def get_connection(self):
-        """Obter conexão com o banco de dados"""
+    def get_connection(self, readonly: bool = False, user_id: int = None):
+        """Obter conexão com o banco de dados
+        
+        Com o pool habilitado (PostgreSQL) retorna o context manager do pool:
+        a conexão é devolvida ao pool ao sair do bloco ``with``. Leituras
+        (``readonly=True``) podem ser atendidas por uma réplica; ``user_id``
+        garante que o usuário leia as próprias escritas recentes.
+        """
         if self.db_type == 'postgresql':
+            if readonly and self.replicas is not None:
+                replica_conn = self.replicas.connection_for_read(user_id)
+                if replica_conn is not None:
+                    return replica_conn
+            
+            if self.settings.DB_POOL_ENABLED:
+                return self._get_pool().connection()
             conn = psycopg.connect(self.database_url, row_factory=dict_row)
             return conn
         else:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
+            if self.settings.SQLITE_PERSISTENT:
+                return self._get_sqlite_connection()
+            conn = sqlite3.connect(self.db_path, cached_statements=self.settings.SQLITE_CACHED_STATEMENTS)
+            self._configure_sqlite(conn)
             return conn
 
+    def _get_sqlite_connection(self):
+        """Conexão SQLite persistente da thread atual
+        
+        Usada como context manager faz commit/rollback sem fechar a conexão,
+        evitando reabrir o arquivo e reler o schema a cada operação. Quando a
+        thread termina (servidores com uma thread por requisição), o
+        thread-local é descartado e a conexão é fechada junto.
+        """
+        holder = getattr(self._local, 'sqlite', None)
+        if holder is None:
+            # Cada conexão é usada só pela thread que a criou; check_same_thread=False
+            # permite que close() ou o fim da thread a encerrem de outra thread
+            conn = sqlite3.connect(
+                self.db_path,
+                check_same_thread=False,
+                cached_statements=self.settings.SQLITE_CACHED_STATEMENTS
+            )
+            self._configure_sqlite(conn)
+            holder = _ThreadConnection(conn)
+            weakref.finalize(holder, conn.close)
+            self._local.sqlite = holder
+            with self._pool_lock:
+                self._sqlite_connections.add(holder)
+        return holder.conn
+
+    def _configure_sqlite(self, conn):
+        """Aplicar PRAGMAs de desempenho na conexão SQLite"""
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+        cursor.execute(f'PRAGMA busy_timeout = {int(self.settings.SQLITE_BUSY_TIMEOUT_MS)}')
+        cursor.execute(f'PRAGMA journal_mode = {self.settings.SQLITE_JOURNAL_MODE}')
+        cursor.execute(f'PRAGMA synchronous = {self.settings.SQLITE_SYNCHRONOUS}')
+        # Valor negativo = tamanho em KiB em vez de número de páginas
+        cursor.execute(f'PRAGMA cache_size = -{int(self.settings.SQLITE_CACHE_SIZE_KB)}')
+        cursor.execute(f'PRAGMA mmap_size = {int(self.settings.SQLITE_MMAP_SIZE)}')
+        cursor.close()
+
+    def _get_pool(self):
+        """Criar o pool de conexões sob demanda (seguro após o fork dos workers)"""
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = ConnectionPool(
+                        self.database_url,
+                        min_size=self.settings.DB_POOL_MIN_SIZE,
+                        max_size=self.settings.DB_POOL_MAX_SIZE,
+                        max_idle=self.settings.DB_POOL_MAX_IDLE,
+                        timeout=self.settings.DB_POOL_TIMEOUT,
+                        kwargs={'row_factory': dict_row},
+                        # Verificar conexão antes de entregá-la (descarta conexões quebradas)
+                        check=ConnectionPool.check_connection,
+                        name='3dbenchy-pool',
+                        open=True
+                    )
+                    print(f"🔌 Pool de conexões aberto (min={self.settings.DB_POOL_MIN_SIZE}, max={self.settings.DB_POOL_MAX_SIZE})")
+        return self._pool
+
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Estatísticas do pool de conexões para monitoramento"""
+        if self._pool is None:
+            return {'db_type': self.db_type, 'pooled': False}
+        
+        stats = self._pool.get_stats()
+        stats.update({'db_type': self.db_type, 'pooled': True})
+        if self.replicas is not None:
+            stats['read_replicas'] = self.replicas.get_stats()
+        return stats
+
+    def mark_write(self, user_id: int):
+        """Direcionar as próximas leituras do usuário ao primário"""
+        if self.replicas is not None:
+            self.replicas.mark_write(user_id)
+
+    def close(self):
+        """Fechar o pool de conexões e as conexões SQLite persistentes"""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
+        
+        if self.replicas is not None:
+            self.replicas.close()
+        
+        with self._pool_lock:
+            for holder in list(self._sqlite_connections):
+                holder.conn.close()
+            self._sqlite_connections.clear()
+        self._local = threading.local()
+
     def get_cursor(self, conn):
         """Obter cursor apropriado para o tipo de banco"""
         if self.db_type == 'postgresql':
@@ -96,205 +246,33 @@ class DatabaseManager:
             return conn.cursor()
     
     def init_database(self):
-        """Inicializar todas as tabelas do banco de dados"""
+        """Verificar/aplicar as migrações do schema
+        
+        Com o banco já na versão mais recente nenhum DDL é executado. Com
+        DB_AUTO_MIGRATE desligado (produção) as migrações ficam a cargo do
+        comando ``python -m utils.migrations upgrade``.
+        """
         try:
-            with self.get_connection() as conn:
-                cursor = self.get_cursor(conn)
-                
-                if self.db_type == 'postgresql':
-                    self._create_postgresql_tables(cursor)
-                else:
-                    self._create_sqlite_tables(cursor)
-                
-                conn.commit()
-                print("✅ Banco de dados inicializado com sucesso")
-                
-                # Inserir produtos de exemplo se não existirem
-                self._insert_sample_products(cursor)
-                conn.commit()
+            runner = MigrationRunner(self)
+            
+            if runner.is_at_head():
+                print(f"✅ Schema do banco em dia (versão {runner.head})")
+                return
+            
+            if not self.settings.DB_AUTO_MIGRATE:
+                print("⚠️  Migrações pendentes: execute 'python -m utils.migrations upgrade'")
+                return
+            
+            runner.upgrade()
+            print("✅ Banco de dados inicializado com sucesso")
                 
         except Exception as e:
             print(f"❌ Erro ao inicializar banco de dados: {e}")
             raise
     
-    def _create_postgresql_tables(self, cursor):
-        """Criar tabelas para PostgreSQL"""
-        # Tabela de usuários
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS users (
-                id SERIAL PRIMARY KEY,
-                name VARCHAR(255) NOT NULL,
-                email VARCHAR(255) UNIQUE NOT NULL,
-                password_hash VARCHAR(255),
-                salt VARCHAR(255),
-                oauth_provider VARCHAR(50),
-                oauth_id VARCHAR(255),
-                avatar_url TEXT,
-                is_admin BOOLEAN DEFAULT FALSE,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # Tabela de produtos
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS products (
-                id SERIAL PRIMARY KEY,
-                name VARCHAR(255) NOT NULL,
-                description TEXT,
-                price DECIMAL(10,2) NOT NULL,
-                category VARCHAR(100),
-                image_url TEXT,
-                is_featured BOOLEAN DEFAULT FALSE,
-                is_active BOOLEAN DEFAULT TRUE,
-                stock_quantity INTEGER DEFAULT 0,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # Tabela de carrinho
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS cart_items (
-                id SERIAL PRIMARY KEY,
-                user_id INTEGER NOT NULL,
-                product_id INTEGER NOT NULL,
-                quantity INTEGER NOT NULL DEFAULT 1,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users (id),
-                FOREIGN KEY (product_id) REFERENCES products (id),
-                UNIQUE(user_id, product_id)
-            )
-        ''')
-        
-        # Tabela de tokens JWT
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS jwt_tokens (
-                id SERIAL PRIMARY KEY,
-                user_id INTEGER NOT NULL,
-                token_hash VARCHAR(255) NOT NULL,
-                expires_at TIMESTAMP NOT NULL,
-                is_revoked BOOLEAN DEFAULT FALSE,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users (id)
-            )
-        ''')
-        
-        # Índices para PostgreSQL
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_users_email ON users(email)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_products_category ON products(category)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_products_featured ON products(is_featured)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_cart_user ON cart_items(user_id)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_jwt_tokens_user ON jwt_tokens(user_id)')
-    
-    def _create_sqlite_tables(self, cursor):
-        """Criar tabelas para SQLite (código original)"""
-        # Tabela de usuários
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS users (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                email TEXT UNIQUE NOT NULL,
-                password_hash TEXT,
-                salt TEXT,
-                oauth_provider TEXT,
-                oauth_id TEXT,
-                avatar_url TEXT,
-                is_admin BOOLEAN DEFAULT FALSE,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # Tabela de produtos
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS products (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                description TEXT,
-                price DECIMAL(10,2) NOT NULL,
-                category TEXT,
-                image_url TEXT,
-                is_featured BOOLEAN DEFAULT FALSE,
-                is_active BOOLEAN DEFAULT TRUE,
-                stock_quantity INTEGER DEFAULT 0,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # Tabela de carrinho
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS cart_items (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                product_id INTEGER NOT NULL,
-                quantity INTEGER NOT NULL DEFAULT 1,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users (id),
-                FOREIGN KEY (product_id) REFERENCES products (id),
-                UNIQUE(user_id, product_id)
-            )
-        ''')
-        
-        # Tabela de tokens JWT
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS jwt_tokens (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                token_hash TEXT NOT NULL,
-                expires_at TIMESTAMP NOT NULL,
-                is_revoked BOOLEAN DEFAULT FALSE,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users (id)
-            )
-        ''')
-        
-        # Índices para SQLite
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_users_email ON users(email)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_products_category ON products(category)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_products_featured ON products(is_featured)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_cart_user ON cart_items(user_id)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_jwt_tokens_user ON jwt_tokens(user_id)')
-    
-    def _insert_sample_products(self, cursor):
-        """Inserir produtos de exemplo"""
-        cursor.execute('SELECT COUNT(*) FROM products')
-        count = cursor.fetchone()
-        
-        # Acessar o valor baseado no tipo de banco
-        if self.db_type == 'postgresql':
-            product_count = count['count'] if isinstance(count, dict) else count[0]
-        else:
-            product_count = count[0]
-        
-        if product_count == 0:
-            sample_products = [
-                ("Apache AH-64 Helicopter", "Modelo detalhado do helicóptero de combate Apache AH-64. Perfeito para colecionadores e entusiastas de aviação militar.", 89.90, "aeronaves", None, True, True, 10),
-                ("F-22 Raptor Fighter Jet", "Caça stealth F-22 Raptor em escala detalhada. Inclui detalhes internos e externos precisos.", 129.90, "aeronaves", None, True, True, 8),
-                ("M1A2 Abrams Tank", "Tanque de guerra americano M1A2 Abrams com detalhes realistas e alta qualidade de impressão.", 149.90, "terrestres", None, True, True, 5),
-                ("USS Enterprise Aircraft Carrier", "Porta-aviões nuclear USS Enterprise em escala reduzida com detalhes impressionantes.", 299.90, "navais", None, True, True, 3),
-                ("Millennium Falcon", "Nave espacial icônica de Star Wars com todos os detalhes externos e internos.", 199.90, "ficção", None, False, True, 7),
-                ("Lamborghini Aventador", "Superesportivo italiano em escala perfeita com detalhes automotivos precisos.", 179.90, "automotivos", None, False, True, 6)
-            ]
-            
-            if self.db_type == 'postgresql':
-                cursor.executemany('''
-                    INSERT INTO products (name, description, price, category, image_url, is_featured, is_active, stock_quantity)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                ''', sample_products)
-            else:
-                cursor.executemany('''
-                    INSERT INTO products (name, description, price, category, image_url, is_featured, is_active, stock_quantity)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                ''', sample_products)
-            
-            print("✅ Produtos de exemplo inseridos")
-
     # Métodos para usuários (adaptados para ambos os bancos)
-    def hash_password(self, password: str) -> tuple:
+    @staticmethod
+    def hash_password(password: str) -> tuple:
         """Gerar hash seguro da senha com salt"""
         salt = secrets.token_hex(32)
         password_hash = hashlib.pbkdf2_hmac('sha256', 
@@ -303,7 +281,8 @@ class DatabaseManager:
                                           100000)
         return password_hash.hex(), salt
     
-    def verify_password(self, password: str, password_hash: str, salt: str) -> bool:
+    @staticmethod
+    def verify_password(password: str, password_hash: str, salt: str) -> bool:
         """Verificar senha contra hash armazenado"""
         computed_hash = hashlib.pbkdf2_hmac('sha256',
                                           password.encode('utf-8'),
@@ -320,10 +299,7 @@ class DatabaseManager:
                 cursor = self.get_cursor(conn)
                 
                 # Verificar se email já existe
-                if self.db_type == 'postgresql':
-                    cursor.execute('SELECT id FROM users WHERE email = %s', (email,))
-                else:
-                    cursor.execute('SELECT id FROM users WHERE email = ?', (email,))
+                self.queries.execute(cursor, 'users.id_by_email', (email,))
                 
                 if cursor.fetchone():
                     return {
@@ -339,20 +315,12 @@ class DatabaseManager:
                     password_hash, salt = None, None
                 
                 # Inserir usuário
-                if self.db_type == 'postgresql':
-                    cursor.execute('''
-                        INSERT INTO users (name, email, password_hash, salt, oauth_provider, oauth_id, avatar_url)
-                        VALUES (%s, %s, %s, %s, %s, %s, %s) RETURNING id
-                    ''', (name, email, password_hash, salt, oauth_provider, oauth_id, avatar_url))
-                    user_id = cursor.fetchone()['id']
-                else:
-                    cursor.execute('''
-                        INSERT INTO users (name, email, password_hash, salt, oauth_provider, oauth_id, avatar_url)
-                        VALUES (?, ?, ?, ?, ?, ?, ?)
-                    ''', (name, email, password_hash, salt, oauth_provider, oauth_id, avatar_url))
-                    user_id = cursor.lastrowid
+                self.queries.execute(cursor, 'users.insert',
+                                     (name, email, password_hash, salt, oauth_provider, oauth_id, avatar_url))
+                user_id = cursor.fetchone()['id']
                 
                 conn.commit()
+                self.mark_write(user_id)
                 
                 print(f"✅ Usuário criado: {email} (ID: {user_id})")
                 return {
@@ -377,18 +345,7 @@ class DatabaseManager:
             with self.get_connection() as conn:
                 cursor = self.get_cursor(conn)
                 
-                if self.db_type == 'postgresql':
-                    cursor.execute('''
-                        SELECT id, name, email, password_hash, salt, avatar_url, is_admin 
-                        FROM users 
-                        WHERE email = %s AND password_hash IS NOT NULL
-                    ''', (email,))
-                else:
-                    cursor.execute('''
-                        SELECT id, name, email, password_hash, salt, avatar_url, is_admin 
-                        FROM users 
-                        WHERE email = ? AND password_hash IS NOT NULL
-                    ''', (email,))
+                self.queries.execute(cursor, 'users.login_lookup', (email,))
                 
                 user = cursor.fetchone()
                 
@@ -418,21 +375,10 @@ class DatabaseManager:
     def get_user_by_id(self, user_id: int) -> Optional[Dict[str, Any]]:
         """Buscar usuário por ID"""
         try:
-            with self.get_connection() as conn:
+            with self.get_connection(readonly=True, user_id=user_id) as conn:
                 cursor = self.get_cursor(conn)
                 
-                if self.db_type == 'postgresql':
-                    cursor.execute('''
-                        SELECT id, name, email, avatar_url, is_admin, created_at
-                        FROM users 
-                        WHERE id = %s
-                    ''', (user_id,))
-                else:
-                    cursor.execute('''
-                        SELECT id, name, email, avatar_url, is_admin, created_at
-                        FROM users 
-                        WHERE id = ?
-                    ''', (user_id,))
+                self.queries.execute(cursor, 'users.by_id', (user_id,))
                 
                 user = cursor.fetchone()
                 
@@ -451,28 +397,39 @@ class DatabaseManager:
             print(f"❌ Erro ao buscar usuário: {e}")
             return None
 
-    def get_products(self, category: str = None, featured_only: bool = False) -> List[Dict[str, Any]]:
-        """Buscar produtos com filtros opcionais"""
+    def get_products(self, category: str = None, featured_only: bool = False,
+                     limit: int = None, after: tuple = None,
+                     fields: List[str] = None) -> List[Dict[str, Any]]:
+        """Buscar produtos com filtros opcionais
+        
+        Ordenados por (created_at, id) decrescente. ``after`` é o par
+        (created_at, id) da última linha da página anterior (paginação keyset).
+        ``fields`` restringe as colunas do SELECT (validadas em utils/fields.py).
+        """
         try:
-            with self.get_connection() as conn:
+            with self.get_connection(readonly=True) as conn:
                 cursor = self.get_cursor(conn)
                 
-                query = 'SELECT * FROM products WHERE is_active = TRUE'
+                name = 'products.featured' if featured_only else 'products.list'
                 params = []
                 
                 if category:
-                    if self.db_type == 'postgresql':
-                        query += ' AND category = %s'
-                    else:
-                        query += ' AND category = ?'
+                    name += '_by_category'
                     params.append(category)
                 
-                if featured_only:
-                    query += ' AND is_featured = TRUE'
+                if after:
+                    created_at, last_id = after
+                    if self.db_type == 'postgresql' and isinstance(created_at, str):
+                        created_at = datetime.fromisoformat(created_at)
+                    name += '_after'
+                    params.extend([created_at, last_id])
                 
-                query += ' ORDER BY created_at DESC'
+                # Sem limite: NULL no PostgreSQL, -1 no SQLite
+                if limit is None:
+                    limit = None if self.db_type == 'postgresql' else -1
+                params.append(limit)
                 
-                cursor.execute(query, params)
+                self.queries.execute(cursor, name, params, fields)
                 products = cursor.fetchall()
                 
                 return [dict(product) for product in products]
@@ -481,5 +438,351 @@ class DatabaseManager:
             print(f"❌ Erro ao buscar produtos: {e}")
             return []
 
+    def get_products_by_ids(self, ids: List[int], fields: List[str] = None) -> List[Dict[str, Any]]:
+        """Buscar vários produtos ativos em uma consulta, na ordem dos IDs pedidos"""
+        if not ids:
+            return []
+        try:
+            with self.get_connection(readonly=True) as conn:
+                cursor = self.get_cursor(conn)
+                
+                param = list(ids) if self.db_type == 'postgresql' else json.dumps(list(ids))
+                self.queries.execute(cursor, 'products.by_ids', (param,), with_fields(fields, ['id']) if fields else None)
+                by_id = {row['id']: dict(row) for row in cursor.fetchall()}
+                
+                return [by_id[product_id] for product_id in ids if product_id in by_id]
+                
+        except Exception as e:
+            print(f"❌ Erro ao buscar produtos por IDs: {e}")
+            return []
+
+    def filter_products(self, filters: ProductFilters, limit: int, after: tuple = None,
+                        fields: List[str] = None) -> List[Dict[str, Any]]:
+        """Listagem com filtros combinados (mesma ordenação e cursor de ``get_products``)"""
+        try:
+            with self.get_connection(readonly=True) as conn:
+                cursor = self.get_cursor(conn)
+                
+                name, sql, params = listing_query(filters, after=bool(after))
+                self.queries.register(name, sql)
+                
+                if after:
+                    created_at, last_id = after
+                    if self.db_type == 'postgresql' and isinstance(created_at, str):
+                        created_at = datetime.fromisoformat(created_at)
+                    params.extend([created_at, last_id])
+                params.append(limit)
+                
+                self.queries.execute(cursor, name, params, fields)
+                return [dict(product) for product in cursor.fetchall()]
+                
+        except Exception as e:
+            print(f"❌ Erro ao filtrar produtos: {e}")
+            return []
+
+    def get_product_facets(self, filters: ProductFilters) -> List[Dict[str, Any]]:
+        """Contagens por categoria e faixa de preço em uma única consulta"""
+        try:
+            with self.get_connection(readonly=True) as conn:
+                cursor = self.get_cursor(conn)
+                
+                name, sql, params = facets_query(filters)
+                self.queries.register(name, sql)
+                
+                self.queries.execute(cursor, name, params)
+                return [dict(row) for row in cursor.fetchall()]
+                
+        except Exception as e:
+            print(f"❌ Erro ao calcular facetas: {e}")
+            return []
+
+    def get_categories(self) -> List[Dict[str, Any]]:
+        """Categorias com produtos ativos e suas contagens"""
+        try:
+            with self.get_connection(readonly=True) as conn:
+                cursor = self.get_cursor(conn)
+                
+                self.queries.execute(cursor, 'products.categories')
+                return [dict(row) for row in cursor.fetchall()]
+                
+        except Exception as e:
+            print(f"❌ Erro ao buscar categorias: {e}")
+            return []
+
+    def get_product_by_id(self, product_id: int, fields: List[str] = None) -> Optional[Dict[str, Any]]:
+        """Buscar produto ativo por ID"""
+        try:
+            with self.get_connection(readonly=True) as conn:
+                cursor = self.get_cursor(conn)
+                
+                self.queries.execute(cursor, 'products.by_id', (product_id,), fields)
+                product = cursor.fetchone()
+                
+                return dict(product) if product else None
+                
+        except Exception as e:
+            print(f"❌ Erro ao buscar produto: {e}")
+            return None
+
+    def search_products(self, terms: List[str], limit: int, offset: int = 0,
+                        fields: List[str] = None) -> List[Dict[str, Any]]:
+        """Busca textual em produtos ativos, ordenada por relevância"""
+        try:
+            with self.get_connection(readonly=True) as conn:
+                cursor = self.get_cursor(conn)
+                
+                columns = [f'p.{field}' for field in fields] if fields else ['p.*']
+                self.queries.execute(cursor, 'products.search',
+                                     search_params(self.db_type, terms, limit, offset), columns)
+                return [dict(product) for product in cursor.fetchall()]
+                
+        except Exception as e:
+            print(f"❌ Erro na busca de produtos: {e}")
+            return []
+
+    def get_catalog_meta(self) -> Optional[Dict[str, Any]]:
+        """Versão e data da última alteração do catálogo"""
+        try:
+            with self.get_connection(readonly=True) as conn:
+                cursor = self.get_cursor(conn)
+                
+                self.queries.execute(cursor, 'catalog.meta')
+                meta = cursor.fetchone()
+                
+                return dict(meta) if meta else None
+                
+        except Exception as e:
+            print(f"❌ Erro ao buscar versão do catálogo: {e}")
+            return None
+
+    def set_product_image(self, product_id: int, image_hash: str, image_width: int) -> Dict[str, Any]:
+        """Associar derivados de imagem (já gerados) ao produto"""
+        try:
+            with self.get_connection() as conn:
+                cursor = self.get_cursor(conn)
+                
+                self.queries.execute(cursor, 'products.set_image', (image_hash, image_width, product_id))
+                updated = cursor.rowcount
+                conn.commit()
+                
+                if not updated:
+                    return {'success': False, 'error': 'Produto não encontrado'}
+                
+                # O gatilho já incrementou a versão; descartar o cache deste worker na hora
+                self.catalog_cache.invalidate()
+                return {'success': True}
+                
+        except Exception as e:
+            print(f"❌ Erro ao salvar imagem do produto: {e}")
+            return {'success': False, 'error': 'Erro ao salvar imagem do produto'}
+
+    # Métodos do carrinho
+    def get_cart(self, user_id: int) -> Dict[str, Any]:
+        """Itens do carrinho com dados do produto e totais, em uma consulta"""
+        try:
+            with self.get_connection(readonly=True, user_id=user_id) as conn:
+                cursor = self.get_cursor(conn)
+                
+                self.queries.execute(cursor, 'cart.summary', (user_id,))
+                return cart_from_rows(cursor.fetchall())
+                
+        except Exception as e:
+            print(f"❌ Erro ao buscar carrinho: {e}")
+            return cart_from_rows([])
+
+    def get_cart_counter(self, user_id: int) -> Dict[str, int]:
+        """Itens e total do carrinho (badge): uma linha de cart_counters por chave primária"""
+        try:
+            with self.get_connection(readonly=True, user_id=user_id) as conn:
+                cursor = self.get_cursor(conn)
+                
+                self.queries.execute(cursor, 'cart.counter', (user_id,))
+                return cart_counter(cursor.fetchone())
+                
+        except Exception as e:
+            print(f"❌ Erro ao contar itens do carrinho: {e}")
+            return {'total_items': 0, 'total_cents': 0}
+
+    def add_to_cart(self, user_id: int, product_id: int, quantity: int = 1) -> Dict[str, Any]:
+        """Adicionar produto ao carrinho (soma à quantidade existente)
+        
+        Um único statement verifica o produto (ativo e com estoque), grava o
+        item e devolve os novos totais do carrinho.
+        """
+        try:
+            with self.get_connection() as conn:
+                cursor = self.get_cursor(conn)
+                
+                self.queries.execute(cursor, 'cart.add', (user_id, quantity, product_id, quantity))
+                row = cursor.fetchone()
+                
+                if row is None:
+                    conn.rollback()
+                    return cart_add_failure(self.get_product_by_id(product_id, fields=['id', 'stock_quantity']))
+                
+                conn.commit()
+                self.mark_write(user_id)
+                
+                return {
+                    'success': True,
+                    'message': 'Produto adicionado ao carrinho',
+                    'quantity': row['quantity'],
+                    'total_items': int(row['total_items']),
+                    'total_cents': int(row['total_cents'])
+                }
+                
+        except Exception as e:
+            print(f"❌ Erro ao adicionar ao carrinho: {e}")
+            return {'success': False, 'error': 'Erro ao adicionar ao carrinho'}
+
+    def apply_cart_operations(self, user_id: int, operations: List[CartOperation]) -> Dict[str, Any]:
+        """Aplicar operações do carrinho em uma transação e devolver o carrinho resultante
+        
+        Se uma operação falhar (produto inexistente ou sem estoque), nenhuma é
+        aplicada; ``index`` indica a operação que falhou.
+        """
+        try:
+            with self.get_connection() as conn:
+                cursor = self.get_cursor(conn)
+                
+                for index, operation in enumerate(operations):
+                    if operation.op == 'clear':
+                        self.queries.execute(cursor, 'cart.clear', (user_id,))
+                    elif operation.op == 'remove' or operation.quantity == 0:
+                        self.queries.execute(cursor, 'cart.delete_product', (user_id, operation.product_id))
+                    else:
+                        name = 'cart.add' if operation.op == 'add' else 'cart.set'
+                        self.queries.execute(cursor, name, (user_id, operation.quantity,
+                                                            operation.product_id, operation.quantity))
+                        if cursor.fetchone() is None:
+                            conn.rollback()
+                            product = self.get_product_by_id(operation.product_id, fields=['id', 'stock_quantity'])
+                            return {**cart_add_failure(product), 'index': index}
+                
+                # Carrinho resultante lido na mesma transação
+                self.queries.execute(cursor, 'cart.summary', (user_id,))
+                cart = cart_from_rows(cursor.fetchall())
+                conn.commit()
+                self.mark_write(user_id)
+                
+                return {'success': True, 'cart': cart}
+                
+        except Exception as e:
+            print(f"❌ Erro ao atualizar carrinho: {e}")
+            return {'success': False, 'error': 'Erro ao atualizar carrinho'}
+
+    def merge_guest_cart(self, user_id: int, items: Dict[int, int]) -> Dict[str, Any]:
+        """Incorporar o carrinho de visitante (``{product_id: quantidade}``) em um upsert
+        
+        Quantidades são somadas às já existentes e limitadas ao estoque;
+        produtos inativos ou esgotados são ignorados.
+        """
+        if not items:
+            return {'success': True, 'merged': 0}
+        try:
+            with self.get_connection() as conn:
+                cursor = self.get_cursor(conn)
+                
+                if self.db_type == 'postgresql':
+                    params = (user_id, list(items.keys()), list(items.values()))
+                else:
+                    params = (user_id, json.dumps([[product_id, quantity] for product_id, quantity in items.items()]))
+                self.queries.execute(cursor, 'cart.merge', params)
+                merged = cursor.rowcount
+                conn.commit()
+                self.mark_write(user_id)
+                
+                return {'success': True, 'merged': merged}
+                
+        except Exception as e:
+            print(f"❌ Erro ao incorporar carrinho de visitante: {e}")
+            return {'success': False, 'error': 'Erro ao incorporar carrinho de visitante'}
+
+    def remove_from_cart(self, user_id: int, cart_item_id: int) -> Dict[str, Any]:
+        """Remover item do carrinho do usuário e devolver o contador atualizado
+        
+        O gatilho já atualizou ``cart_counters`` na mesma transação do DELETE.
+        """
+        try:
+            with self.get_connection() as conn:
+                cursor = self.get_cursor(conn)
+                
+                self.queries.execute(cursor, 'cart.delete_item', (cart_item_id, user_id))
+                if not cursor.rowcount:
+                    conn.rollback()
+                    return {'success': False, 'error': 'Item não encontrado'}
+                
+                self.queries.execute(cursor, 'cart.counter', (user_id,))
+                counter = cart_counter(cursor.fetchone())
+                conn.commit()
+                self.mark_write(user_id)
+                
+                return {'success': True, 'message': 'Item removido do carrinho', **counter}
+                
+        except Exception as e:
+            print(f"❌ Erro ao remover do carrinho: {e}")
+            return {'success': False, 'error': 'Erro ao remover do carrinho'}
+
+    def clear_cart(self, user_id: int) -> Dict[str, Any]:
+        """Remover todos os itens do carrinho do usuário"""
+        try:
+            with self.get_connection() as conn:
+                cursor = self.get_cursor(conn)
+                
+                self.queries.execute(cursor, 'cart.clear', (user_id,))
+                conn.commit()
+                self.mark_write(user_id)
+                
+                return {'success': True, 'message': 'Carrinho limpo'}
+                
+        except Exception as e:
+            print(f"❌ Erro ao limpar carrinho: {e}")
+            return {'success': False, 'error': 'Erro ao limpar carrinho'}
+
     # Adicionar outros métodos conforme necessário...
 
+
+def cart_add_failure(product: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Motivo de ``cart.add`` não ter gravado nada (só consultado no caminho de erro)"""
+    if not product:
+        return {'success': False, 'error': 'Produto não encontrado', 'code': 'NOT_FOUND'}
+    return {'success': False, 'error': 'Estoque insuficiente', 'code': 'OUT_OF_STOCK'}
+
+def cart_counter(row) -> Dict[str, int]:
+    """Linha de ``cart.counter`` (ausente para quem nunca teve carrinho)"""
+    if row is None:
+        return {'total_items': 0, 'total_cents': 0}
+    return {'total_items': int(row['total_items']), 'total_cents': int(row['total_cents'])}
+
+def cart_from_rows(rows) -> Dict[str, Any]:
+    """Separar as linhas de ``cart.summary`` em itens e totais"""
+    items = [dict(row) for row in rows]
+    total_items = total_cents = 0
+    for item in items:
+        # Totais da janela: iguais em todas as linhas
+        total_items = int(item.pop('total_items'))
+        total_cents = int(item.pop('total_cents'))
+    return {'items': items, 'total_items': total_items, 'total_cents': total_cents}
+
+# Instância compartilhada pelo processo (criada no primeiro uso)
+_db_instance = None
+_db_lock = threading.Lock()
+
+def get_db() -> DatabaseManager:
+    """Obter o DatabaseManager da aplicação
+    
+    Usa ``app.db`` quando a aplicação define um (ex.: testes); caso contrário
+    cria uma única instância por processo, compartilhada entre blueprints e threads.
+    """
+    global _db_instance
+    
+    if has_app_context():
+        app_db = getattr(current_app, 'db', None)
+        if app_db is not None:
+            return app_db
+    
+    if _db_instance is None:
+        with _db_lock:
+            if _db_instance is None:
+                _db_instance = DatabaseManager()
+    return _db_instance
@@ -0,0 +1,174 @@
+"""
+Filtros combinados e facetas da listagem de produtos
+
+Os filtros (categorias, faixa de preço, em estoque, destaque) são compilados em
+uma única cláusula WHERE montada apenas com fragmentos fixos; valores do
+cliente vão sempre como parâmetros. Cada combinação de filtros presentes tem
+um nome estável no registro de consultas, então o SQL é renderizado (e, no
+PostgreSQL, preparado) uma vez por formato.
+
+As facetas saem de uma única consulta agregada (``UNION ALL`` de dois
+``GROUP BY``). Cada faceta ignora o próprio filtro, para que o cliente veja
+quantos produtos teria ao trocar de categoria ou de faixa de preço.
+"""
+
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+from backend.utils.money import to_cents
+from backend.utils.validators import ValidationError
+
+MAX_FILTER_CATEGORIES = 10
+
+# Limites das faixas de preço das facetas (R$): [0, 50), [50, 100), ..., [500, ∞)
+# (comparados em centavos no SQL)
+PRICE_BUCKETS = (50, 100, 200, 500)
+
+# Nome e descrição de exibição das categorias conhecidas
+CATEGORY_LABELS = {
+    'aeronaves': ("Aeronaves", "Aviões, helicópteros e aeronaves militares"),
+    'terrestres': ("Terrestres", "Tanques, veículos militares e terrestres"),
+    'navais': ("Navais", "Navios, submarinos e embarcações"),
+    'ficção': ("Ficção Científica", "Naves espaciais e veículos de ficção"),
+    'automotivos': ("Automotivos", "Carros esportivos e veículos civis"),
+}
+
+TRUE_VALUES = {'1', 'true', 'sim', 'yes'}
+
+class ProductFilters(NamedTuple):
+    categories: Tuple[str, ...] = ()
+    min_price_cents: Optional[int] = None
+    max_price_cents: Optional[int] = None
+    in_stock: bool = False
+    featured: bool = False
+
+def _parse_price(value: Optional[str], name: str) -> Optional[int]:
+    if value in (None, ''):
+        return None
+    cents = to_cents(value, name)
+    if cents < 0:
+        raise ValidationError(f"{name} inválido")
+    return cents
+
+def parse_filters(args) -> ProductFilters:
+    """Validar ``?category=a,b&min_price=&max_price=&in_stock=&featured=``"""
+    categories = tuple(sorted({c.strip() for c in (args.get('category') or '').split(',') if c.strip()}))
+    if len(categories) > MAX_FILTER_CATEGORIES:
+        raise ValidationError(f"Máximo de {MAX_FILTER_CATEGORIES} categorias por filtro")
+
+    min_price = _parse_price(args.get('min_price'), 'min_price')
+    max_price = _parse_price(args.get('max_price'), 'max_price')
+    if min_price is not None and max_price is not None and min_price > max_price:
+        raise ValidationError("min_price não pode ser maior que max_price")
+
+    return ProductFilters(
+        categories=categories,
+        min_price_cents=min_price,
+        max_price_cents=max_price,
+        in_stock=(args.get('in_stock') or '').lower() in TRUE_VALUES,
+        featured=(args.get('featured') or '').lower() in TRUE_VALUES,
+    )
+
+def parse_ids(value: str, maximum: int) -> List[int]:
+    """Validar ``?ids=1,2,3`` (sem repetição, na ordem pedida, até ``maximum``)"""
+    ids = []
+    for part in value.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        try:
+            product_id = int(part)
+        except ValueError:
+            raise ValidationError("ids deve conter apenas números inteiros")
+        if product_id not in ids:
+            ids.append(product_id)
+
+    if not ids:
+        raise ValidationError("ids não pode ser vazio")
+    if len(ids) > maximum:
+        raise ValidationError(f"Máximo de {maximum} IDs por requisição")
+    return ids
+
+def build_where(filters: ProductFilters, exclude: Tuple[str, ...] = ()) -> Tuple[str, str, List[Any]]:
+    """Montar (formato, SQL, parâmetros) dos filtros, exceto os de ``exclude``
+
+    O formato identifica quais filtros estão presentes (não os valores) e
+    compõe o nome da consulta no registro.
+    """
+    shape, sql, params = [], '', []
+
+    if filters.categories and 'category' not in exclude:
+        shape.append(f'c{len(filters.categories)}')
+        sql += f" AND category IN ({', '.join('%s' for _ in filters.categories)})"
+        params.extend(filters.categories)
+    if filters.min_price_cents is not None and 'price' not in exclude:
+        shape.append('min')
+        sql += ' AND price_cents >= %s'
+        params.append(filters.min_price_cents)
+    if filters.max_price_cents is not None and 'price' not in exclude:
+        shape.append('max')
+        sql += ' AND price_cents <= %s'
+        params.append(filters.max_price_cents)
+    if filters.in_stock:
+        shape.append('stock')
+        sql += ' AND stock_quantity > 0'
+    if filters.featured:
+        shape.append('featured')
+        sql += ' AND is_featured = TRUE'
+
+    return ','.join(shape), sql, params
+
+def listing_query(filters: ProductFilters, after: bool) -> Tuple[str, str, List[Any]]:
+    """Nome, SQL e parâmetros (sem cursor/limit) da listagem filtrada"""
+    shape, where, params = build_where(filters)
+    keyset = ' AND (created_at, id) < (%s, %s)' if after else ''
+    name = f"products.filtered[{shape}]{'_after' if after else ''}"
+    sql = f'''
+        SELECT {{columns}} FROM products
+        WHERE is_active = TRUE{where}{keyset}
+        ORDER BY created_at DESC, id DESC
+        LIMIT %s
+    '''
+    return name, sql, params
+
+def _price_bucket_case() -> str:
+    bounds = (0,) + PRICE_BUCKETS
+    whens = ' '.join(f"WHEN price_cents < {upper * 100} THEN '{lower}-{upper}'"
+                     for lower, upper in zip(bounds, PRICE_BUCKETS))
+    return f"CASE {whens} ELSE '{PRICE_BUCKETS[-1]}-' END"
+
+def facets_query(filters: ProductFilters) -> Tuple[str, str, List[Any]]:
+    """Nome, SQL e parâmetros da consulta agregada de facetas"""
+    category_shape, category_where, category_params = build_where(filters, exclude=('category',))
+    price_shape, price_where, price_params = build_where(filters, exclude=('price',))
+    name = f'products.facets[{category_shape}|{price_shape}]'
+    sql = f'''
+        SELECT 'category' AS facet, category AS value, COUNT(*) AS count
+        FROM products
+        WHERE is_active = TRUE AND category IS NOT NULL{category_where}
+        GROUP BY category
+        UNION ALL
+        SELECT 'price' AS facet, {_price_bucket_case()} AS value, COUNT(*) AS count
+        FROM products
+        WHERE is_active = TRUE{price_where}
+        GROUP BY 2
+    '''
+    return name, sql, category_params + price_params
+
+def format_facets(rows: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    """Converter as linhas agregadas no formato da API"""
+    categories = sorted(
+        ({'id': row['value'], 'count': row['count']} for row in rows if row['facet'] == 'category'),
+        key=lambda item: item['id']
+    )
+    price = []
+    for row in rows:
+        if row['facet'] != 'price':
+            continue
+        lower, upper = row['value'].split('-')
+        price.append({'min': int(lower), 'max': int(upper) if upper else None, 'count': row['count']})
+    price.sort(key=lambda item: item['min'])
+    return {'categories': categories, 'price': price}
+
+def category_info(category_id: str, product_count: int) -> Dict[str, Any]:
+    """Categoria com nome de exibição (categorias novas usam o próprio id)"""
+    name, description = CATEGORY_LABELS.get(category_id, (category_id.capitalize(), None))
+    return {'id': category_id, 'name': name, 'description': description, 'product_count': product_count}
@@ -0,0 +1,112 @@
+"""
+Carrinho de visitantes em cookie assinado
+
+Visitantes não logados guardam o carrinho no próprio navegador: uma lista
+``[[product_id, quantidade], ...]`` serializada em JSON, comprimida (zlib,
+quando reduz o tamanho) e assinada com ``SECRET_KEY`` por
+``itsdangerous.URLSafeSerializer``. O servidor não grava nada; o banco só é
+lido para mostrar nome e preço dos produtos.
+
+No cadastro/login o cookie é incorporado a ``cart_items`` com um único
+upsert em lote (``DatabaseManager.merge_guest_cart``) e apagado.
+"""
+
+from typing import Any, Dict, Iterable, List
+from itsdangerous import BadSignature, URLSafeSerializer
+from backend.utils.cart import CartOperation
+from backend.utils.validators import ValidationError
+
+GUEST_CART_SALT = 'guest-cart'
+
+# O cookie só vale para a API
+COOKIE_PATH = '/api'
+
+class GuestCart:
+    """Lê e grava o carrinho de visitante no cookie"""
+
+    def __init__(self, settings):
+        self.settings = settings
+        self.name = settings.GUEST_CART_COOKIE_NAME
+        self.serializer = URLSafeSerializer(settings.SECRET_KEY, salt=GUEST_CART_SALT)
+
+    def load(self, cookies) -> Dict[int, int]:
+        """``{product_id: quantidade}`` do cookie; cookie inválido vale carrinho vazio"""
+        raw = cookies.get(self.name)
+        if not raw:
+            return {}
+        try:
+            data = self.serializer.loads(raw)
+        except BadSignature:
+            return {}
+
+        items = {}
+        for entry in data if isinstance(data, list) else []:
+            if (isinstance(entry, list) and len(entry) == 2
+                    and all(type(value) is int for value in entry) and entry[1] > 0):
+                items[entry[0]] = entry[1]
+            if len(items) >= self.settings.GUEST_CART_MAX_ITEMS:
+                break
+        return items
+
+    def dump(self, items: Dict[int, int]) -> str:
+        return self.serializer.dumps([[product_id, quantity] for product_id, quantity in items.items()])
+
+    def save(self, response, items: Dict[int, int]):
+        """Gravar o carrinho na resposta (apaga o cookie quando vazio)"""
+        if not items:
+            self.clear(response)
+            return
+        response.set_cookie(
+            self.name, self.dump(items),
+            max_age=self.settings.GUEST_CART_MAX_AGE,
+            path=COOKIE_PATH,
+            httponly=True,
+            secure=self.settings.GUEST_CART_COOKIE_SECURE,
+            samesite=self.settings.GUEST_CART_COOKIE_SAMESITE
+        )
+
+    def clear(self, response):
+        response.delete_cookie(
+            self.name,
+            path=COOKIE_PATH,
+            httponly=True,
+            secure=self.settings.GUEST_CART_COOKIE_SECURE,
+            samesite=self.settings.GUEST_CART_COOKIE_SAMESITE
+        )
+
+def apply_guest_operations(items: Dict[int, int], operations: Iterable[CartOperation],
+                           max_items: int) -> Dict[int, int]:
+    """Aplicar operações (mesmo formato de ``PATCH /api/cart``) a uma cópia do carrinho"""
+    items = dict(items)
+    for operation in operations:
+        if operation.op == 'clear':
+            items.clear()
+        elif operation.op == 'remove' or operation.quantity == 0:
+            items.pop(operation.product_id, None)
+        elif operation.op == 'add':
+            items[operation.product_id] = items.get(operation.product_id, 0) + operation.quantity
+        else:
+            items[operation.product_id] = operation.quantity
+
+    if len(items) > max_items:
+        raise ValidationError(f"Máximo de {max_items} produtos no carrinho de visitante")
+    return items
+
+def guest_cart_view(items: Dict[int, int], products: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Montar o carrinho no formato de ``DatabaseManager.get_cart``
+
+    Produtos que deixaram de existir ou de estar ativos não aparecem.
+    """
+    lines = []
+    for product in products:
+        line = dict(product)
+        line['product_id'] = line.pop('id')
+        line.pop('stock_quantity', None)
+        line['quantity'] = items[line['product_id']]
+        lines.append(line)
+
+    return {
+        'items': lines,
+        'total_items': sum(line['quantity'] for line in lines),
+        'total_cents': sum(line['quantity'] * line['price_cents'] for line in lines)
+    }
@@ -0,0 +1,227 @@
+"""
+Migrações versionadas do schema
+
+Os arquivos ficam em ``migrations/<dialeto>/NNNN_descricao.sql`` e são aplicados
+em ordem. Cada versão aplicada é registrada na tabela ``schema_version`` com o
+checksum do arquivo, permitindo detectar migrações alteradas depois de aplicadas.
+
+Uso (fora dos workers web):
+    python -m utils.migrations upgrade
+    python -m utils.migrations status
+"""
+
+import argparse
+import hashlib
+import os
+import re
+import sqlite3
+from typing import Dict, List, NamedTuple
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'migrations')
+MIGRATION_FILE_PATTERN = re.compile(r'^(\d{4})_(\w+)\.sql$')
+
+# Chave do advisory lock do PostgreSQL (evita dois processos migrando ao mesmo tempo)
+PG_MIGRATION_LOCK_ID = 31983
+
+SCHEMA_VERSION_DDL = '''
+    CREATE TABLE IF NOT EXISTS schema_version (
+        version INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        checksum TEXT NOT NULL,
+        applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+'''
+
+class MigrationError(Exception):
+    pass
+
+class Migration(NamedTuple):
+    version: int
+    name: str
+    sql: str
+    checksum: str
+
+def load_migrations(dialect: str) -> List[Migration]:
+    """Carregar migrações do dialeto em ordem de versão"""
+    directory = os.path.join(MIGRATIONS_DIR, dialect)
+    migrations = []
+
+    for filename in sorted(os.listdir(directory)):
+        match = MIGRATION_FILE_PATTERN.match(filename)
+        if not match:
+            continue
+
+        with open(os.path.join(directory, filename), 'rb') as f:
+            content = f.read()
+
+        migrations.append(Migration(
+            version=int(match.group(1)),
+            name=match.group(2),
+            sql=content.decode('utf-8'),
+            checksum=hashlib.sha256(content).hexdigest()
+        ))
+
+    versions = [m.version for m in migrations]
+    if len(versions) != len(set(versions)):
+        raise MigrationError(f"Versões de migração duplicadas em {directory}")
+
+    return migrations
+
+def split_sqlite_statements(sql: str) -> List[str]:
+    """Separar script SQLite em comandos (respeitando corpos de triggers)"""
+    statements = []
+    buffer = ''
+
+    for line in sql.splitlines(keepends=True):
+        if not buffer and (not line.strip() or line.strip().startswith('--')):
+            continue
+        buffer += line
+        if sqlite3.complete_statement(buffer):
+            statements.append(buffer.strip())
+            buffer = ''
+
+    if buffer.strip():
+        statements.append(buffer.strip())
+
+    return statements
+
+class MigrationRunner:
+    """Aplica e verifica migrações usando as conexões do DatabaseManager"""
+
+    def __init__(self, db):
+        self.db = db
+        self.dialect = db.db_type
+        self.migrations = load_migrations(self.dialect)
+
+    @property
+    def head(self) -> int:
+        return self.migrations[-1].version if self.migrations else 0
+
+    def _applied(self, cursor) -> Dict[int, str]:
+        """Versões aplicadas e seus checksums"""
+        cursor.execute('SELECT version, checksum FROM schema_version')
+        return {row['version']: row['checksum'] for row in cursor.fetchall()}
+
+    def _has_version_table(self, cursor) -> bool:
+        if self.dialect == 'postgresql':
+            cursor.execute("SELECT to_regclass('schema_version') IS NOT NULL AS present")
+            return bool(cursor.fetchone()['present'])
+
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'schema_version'")
+        return cursor.fetchone() is not None
+
+    def _verify(self, applied: Dict[int, str]):
+        """Garantir que migrações já aplicadas não foram alteradas"""
+        known = {m.version: m for m in self.migrations}
+
+        for version, checksum in applied.items():
+            migration = known.get(version)
+            if migration is None:
+                raise MigrationError(f"Versão {version} aplicada no banco não existe em {MIGRATIONS_DIR}/{self.dialect}")
+            if migration.checksum != checksum:
+                raise MigrationError(f"Checksum divergente na migração {version:04d}_{migration.name}")
+
+    def status(self) -> Dict[str, object]:
+        """Situação do schema: versão atual, head e pendências"""
+        with self.db.get_connection() as conn:
+            cursor = self.db.get_cursor(conn)
+            applied = self._applied(cursor) if self._has_version_table(cursor) else {}
+
+        self._verify(applied)
+        current = max(applied) if applied else 0
+        return {
+            'current': current,
+            'head': self.head,
+            'pending': [f"{m.version:04d}_{m.name}" for m in self.migrations if m.version not in applied]
+        }
+
+    def is_at_head(self) -> bool:
+        """Caminho rápido do boot: uma única consulta, nenhum DDL"""
+        return not self.status()['pending']
+
+    def upgrade(self) -> List[str]:
+        """Aplicar migrações pendentes, cada uma em sua própria transação"""
+        with self.db.get_connection() as conn:
+            cursor = self.db.get_cursor(conn)
+            cursor.execute(SCHEMA_VERSION_DDL)
+            conn.commit()
+
+            if self.dialect == 'postgresql':
+                cursor.execute('SELECT pg_advisory_lock(%s)', (PG_MIGRATION_LOCK_ID,))
+
+            try:
+                self._verify(self._applied(cursor))
+                conn.commit()
+                return self._apply_pending(conn, cursor)
+            finally:
+                if self.dialect == 'postgresql':
+                    cursor.execute('SELECT pg_advisory_unlock(%s)', (PG_MIGRATION_LOCK_ID,))
+                    conn.commit()
+
+    def _apply_pending(self, conn, cursor) -> List[str]:
+        placeholder = '%s' if self.dialect == 'postgresql' else '?'
+        applied = []
+
+        for migration in self.migrations:
+            label = f"{migration.version:04d}_{migration.name}"
+            try:
+                if self.dialect == 'sqlite':
+                    # Lock de escrita antes de reler a versão: outro processo pode ter migrado
+                    cursor.execute('BEGIN IMMEDIATE')
+
+                cursor.execute(f'SELECT 1 FROM schema_version WHERE version = {placeholder}', (migration.version,))
+                if cursor.fetchone():
+                    conn.commit()
+                    continue
+
+                if self.dialect == 'postgresql':
+                    # Sem parâmetros o psycopg aceita vários comandos em um execute
+                    cursor.execute(migration.sql)
+                else:
+                    for statement in split_sqlite_statements(migration.sql):
+                        cursor.execute(statement)
+
+                cursor.execute(
+                    f'INSERT INTO schema_version (version, name, checksum) VALUES ({placeholder}, {placeholder}, {placeholder})',
+                    (migration.version, migration.name, migration.checksum)
+                )
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                raise MigrationError(f"Falha ao aplicar {label}: {e}") from e
+
+            print(f"✅ Migração aplicada: {label}")
+            applied.append(label)
+
+        return applied
+
+def main(argv=None):
+    from backend.utils.database import DatabaseManager
+
+    parser = argparse.ArgumentParser(description='Migrações do banco de dados 3DBenchy Bros')
+    parser.add_argument('command', choices=['upgrade', 'status'], help='upgrade aplica pendências; status mostra a versão atual')
+    parser.add_argument('--db-path', help='Arquivo SQLite (quando DATABASE_URL não estiver definida)')
+    args = parser.parse_args(argv)
+
+    db = DatabaseManager(args.db_path, init_schema=False)
+    runner = MigrationRunner(db)
+
+    try:
+        if args.command == 'upgrade':
+            applied = runner.upgrade()
+            print(f"Schema na versão {runner.head} ({len(applied)} migração(ões) aplicada(s))")
+        else:
+            status = runner.status()
+            print(f"Versão atual: {status['current']} | head: {status['head']}")
+            for label in status['pending']:
+                print(f"  pendente: {label}")
+    except MigrationError as e:
+        print(f"❌ {e}")
+        return 1
+    finally:
+        db.close()
+
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
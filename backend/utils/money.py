@@ -0,0 +1,71 @@
+"""
+Dinheiro em centavos inteiros
+
+Preços são armazenados e somados como ``int`` de centavos; ``Decimal`` só
+aparece na entrada (importação, filtros) e nada passa por ``float`` antes da
+formatação. A conversão para exibição acontece uma única vez, na borda da
+API, em ``serialize_product``/``money_fields``.
+"""
+
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from typing import Any, Dict, Optional
+from backend.utils.validators import ValidationError
+
+CURRENCY = 'BRL'
+
+_CENT = Decimal('0.01')
+
+# products.price_cents é INTEGER (32 bits): um valor maior derrubaria o lote
+# inteiro do COPY/upsert no PostgreSQL
+MAX_CENTS = 2 ** 31 - 1
+
+# Colunas booleanas que o SQLite devolve como 0/1
+BOOLEAN_FIELDS = ('is_featured', 'is_active')
+
+def to_cents(value: Any, name: str = 'price') -> int:
+    """Converter valor em reais (``"89,90"``, ``89.9``, ``Decimal``) para centavos"""
+    if isinstance(value, bool):
+        raise ValidationError(f"{name} inválido")
+    try:
+        amount = Decimal(str(value).strip().replace(',', '.'))
+    except InvalidOperation:
+        raise ValidationError(f"{name} inválido")
+    if not amount.is_finite():
+        raise ValidationError(f"{name} inválido")
+    try:
+        cents = int((amount.quantize(_CENT, rounding=ROUND_HALF_UP) * 100).to_integral_value())
+    except InvalidOperation:
+        # Mais dígitos do que a precisão do contexto decimal
+        raise ValidationError(f"{name} fora do limite")
+    if abs(cents) > MAX_CENTS:
+        raise ValidationError(f"{name} fora do limite")
+    return cents
+
+def format_brl(cents: int) -> str:
+    """Formatar centavos como ``R$ 1.234,56``"""
+    sign = '-' if cents < 0 else ''
+    reais, centavos = divmod(abs(cents), 100)
+    return f"{sign}R$ {reais:,}".replace(',', '.') + f",{centavos:02d}"
+
+def money_fields(cents: int, prefix: str = 'price') -> Dict[str, Any]:
+    """Campos de um valor monetário na API: centavos, reais e texto formatado
+
+    ``<prefix>`` continua numérico (em reais) para clientes existentes; é
+    derivado dos centavos, então não acumula erro de arredondamento.
+    """
+    return {
+        f'{prefix}_cents': cents,
+        prefix: cents / 100,
+        f'{prefix}_display': format_brl(cents),
+    }
+
+def serialize_product(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Preparar produto para a resposta JSON (preço e booleanos)"""
+    product = dict(row)
+    cents: Optional[int] = product.pop('price_cents', None)
+    if cents is not None:
+        product.update(money_fields(cents))
+    for field in BOOLEAN_FIELDS:
+        if field in product and product[field] is not None:
+            product[field] = bool(product[field])
+    return product
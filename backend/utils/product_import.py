@@ -0,0 +1,233 @@
+"""
+Importação em massa de produtos (CSV ou NDJSON)
+
+Os arquivos são lidos em streaming, linha a linha, e nunca são carregados
+inteiros em memória. No PostgreSQL as linhas vão por ``COPY`` para uma tabela
+temporária e depois são gravadas com um único upsert por SKU. No SQLite são
+gravadas com ``executemany`` em lotes, dentro de uma única transação.
+
+Uso:
+    python -m utils.product_import catalogo.csv
+    python -m utils.product_import catalogo.ndjson --format ndjson
+"""
+
+import argparse
+import csv
+import json
+import time
+from typing import Any, Dict, IO, Iterator, List, Optional, Tuple
+from backend.utils.money import to_cents
+from backend.utils.validators import ValidationError
+
+IMPORT_COLUMNS = ('sku', 'name', 'description', 'price_cents', 'category', 'image_url',
+                  'is_featured', 'is_active', 'stock_quantity')
+
+# Colunas atualizadas quando o SKU já existe
+UPDATE_COLUMNS = IMPORT_COLUMNS[1:]
+
+MAX_REPORTED_ERRORS = 20
+
+TRUE_VALUES = {'1', 'true', 't', 'yes', 'y', 'sim', 's'}
+
+def detect_format(filename: Optional[str], content_type: Optional[str] = None) -> str:
+    """Inferir formato pelo nome do arquivo ou Content-Type"""
+    name = (filename or '').lower()
+    if name.endswith(('.ndjson', '.jsonl')) or 'ndjson' in (content_type or ''):
+        return 'ndjson'
+    return 'csv'
+
+def iter_records(stream: IO[str], fmt: str) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Gerar (número da linha, registro) sem carregar o arquivo inteiro"""
+    if fmt == 'ndjson':
+        for line_no, line in enumerate(stream, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield line_no, json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_no, {'__error__': f'JSON inválido: {e.msg}'}
+    else:
+        reader = csv.DictReader(stream)
+        for record in reader:
+            yield reader.line_num, record
+
+def _parse_bool(value, default: bool) -> bool:
+    if value is None or value == '':
+        return default
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in TRUE_VALUES
+
+def normalize_record(record: Dict[str, Any]) -> tuple:
+    """Validar registro e convertê-lo na tupla de IMPORT_COLUMNS"""
+    # Linha NDJSON válida que não é objeto (lista, número, texto)
+    if not isinstance(record, dict):
+        raise ValidationError("Registro deve ser um objeto JSON")
+    if '__error__' in record:
+        raise ValidationError(record['__error__'])
+
+    sku = str(record.get('sku') or '').strip()
+    name = str(record.get('name') or '').strip()
+    if not sku:
+        raise ValidationError("sku é obrigatório")
+    if not name:
+        raise ValidationError("name é obrigatório")
+
+    # Arquivo traz o preço em reais; o banco guarda centavos
+    price_cents = to_cents(record.get('price', ''))
+    if price_cents < 0:
+        raise ValidationError("price não pode ser negativo")
+
+    try:
+        stock_quantity = int(record.get('stock_quantity') or 0)
+    except (TypeError, ValueError):
+        raise ValidationError("stock_quantity inválido")
+    if stock_quantity < 0:
+        raise ValidationError("stock_quantity não pode ser negativo")
+
+    return (
+        sku,
+        name,
+        record.get('description') or None,
+        price_cents,
+        record.get('category') or None,
+        record.get('image_url') or None,
+        _parse_bool(record.get('is_featured'), False),
+        _parse_bool(record.get('is_active'), True),
+        stock_quantity,
+    )
+
+class ProductImporter:
+    """Importa produtos por SKU usando o caminho mais rápido de cada banco"""
+
+    def __init__(self, db, chunk_size: int = None):
+        self.db = db
+        self.chunk_size = chunk_size or db.settings.IMPORT_CHUNK_SIZE
+        self.rejected = 0
+        self.errors: List[Dict[str, Any]] = []
+
+    def _valid_rows(self, stream: IO[str], fmt: str) -> Iterator[tuple]:
+        for line_no, record in iter_records(stream, fmt):
+            try:
+                yield normalize_record(record)
+            except ValidationError as e:
+                self.rejected += 1
+                if len(self.errors) < MAX_REPORTED_ERRORS:
+                    self.errors.append({'line': line_no, 'error': str(e)})
+
+    def run(self, stream: IO[str], fmt: str = 'csv') -> Dict[str, Any]:
+        """Importar todas as linhas válidas em uma única transação"""
+        started = time.perf_counter()
+        rows = self._valid_rows(stream, fmt)
+
+        with self.db.get_connection() as conn:
+            cursor = self.db.get_cursor(conn)
+            try:
+                if self.db.db_type == 'postgresql':
+                    imported = self._import_postgresql(cursor, rows)
+                else:
+                    imported = self._import_sqlite(cursor, rows)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+        # Os gatilhos já incrementaram a versão; descartar o cache deste worker na hora
+        self.db.catalog_cache.invalidate()
+
+        elapsed = time.perf_counter() - started
+        rows_per_second = round(imported / elapsed) if elapsed > 0 else imported
+        print(f"✅ Importação concluída: {imported} produtos em {elapsed:.2f}s ({rows_per_second} linhas/s)")
+
+        return {
+            'imported': imported,
+            'rejected': self.rejected,
+            'errors': self.errors,
+            'seconds': round(elapsed, 3),
+            'rows_per_second': rows_per_second
+        }
+
+    def _import_postgresql(self, cursor, rows: Iterator[tuple]) -> int:
+        columns = ', '.join(IMPORT_COLUMNS)
+        cursor.execute(f'''
+            CREATE TEMP TABLE products_import (
+                line_no BIGSERIAL,
+                sku VARCHAR(64) NOT NULL,
+                name VARCHAR(255) NOT NULL,
+                description TEXT,
+                price_cents INTEGER NOT NULL,
+                category VARCHAR(100),
+                image_url TEXT,
+                is_featured BOOLEAN,
+                is_active BOOLEAN,
+                stock_quantity INTEGER
+            ) ON COMMIT DROP
+        ''')
+
+        imported = 0
+        with cursor.copy(f'COPY products_import ({columns}) FROM STDIN') as copy:
+            for row in rows:
+                copy.write_row(row)
+                imported += 1
+
+        # Em SKUs repetidos no arquivo vale a última ocorrência
+        updates = ', '.join(f'{col} = excluded.{col}' for col in UPDATE_COLUMNS)
+        cursor.execute(f'''
+            INSERT INTO products ({columns})
+            SELECT DISTINCT ON (sku) {columns}
+            FROM products_import
+            ORDER BY sku, line_no DESC
+            ON CONFLICT (sku) DO UPDATE SET {updates}, updated_at = CURRENT_TIMESTAMP
+        ''')
+        return imported
+
+    def _import_sqlite(self, cursor, rows: Iterator[tuple]) -> int:
+        columns = ', '.join(IMPORT_COLUMNS)
+        placeholders = ', '.join('?' for _ in IMPORT_COLUMNS)
+        updates = ', '.join(f'{col} = excluded.{col}' for col in UPDATE_COLUMNS)
+        sql = f'''
+            INSERT INTO products ({columns}) VALUES ({placeholders})
+            ON CONFLICT (sku) DO UPDATE SET {updates}, updated_at = CURRENT_TIMESTAMP
+        '''
+
+        imported = 0
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= self.chunk_size:
+                cursor.executemany(sql, chunk)
+                imported += len(chunk)
+                chunk = []
+
+        if chunk:
+            cursor.executemany(sql, chunk)
+            imported += len(chunk)
+
+        return imported
+
+def main(argv=None):
+    from backend.utils.database import DatabaseManager
+
+    parser = argparse.ArgumentParser(description='Importação em massa de produtos 3DBenchy Bros')
+    parser.add_argument('path', help='Arquivo CSV ou NDJSON')
+    parser.add_argument('--format', choices=['csv', 'ndjson'], help='Formato (padrão: pela extensão)')
+    parser.add_argument('--db-path', help='Arquivo SQLite (quando DATABASE_URL não estiver definida)')
+    args = parser.parse_args(argv)
+
+    fmt = args.format or detect_format(args.path)
+    db = DatabaseManager(args.db_path)
+
+    try:
+        with open(args.path, newline='', encoding='utf-8') as stream:
+            result = ProductImporter(db).run(stream, fmt)
+    finally:
+        db.close()
+
+    for error in result['errors']:
+        print(f"  linha {error['line']}: {error['error']}")
+    print(f"Importados: {result['imported']} | Rejeitados: {result['rejected']} | {result['rows_per_second']} linhas/s")
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
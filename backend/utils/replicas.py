@@ -0,0 +1,191 @@
+"""
+Roteamento de leituras para réplicas PostgreSQL
+
+Consultas somente leitura podem ir para réplicas configuradas em
+``DATABASE_REPLICA_URLS``. Escritas continuam no primário, e um usuário que
+acabou de escrever lê do primário durante ``DB_READ_YOUR_WRITES_WINDOW``
+segundos. Réplicas com atraso acima de ``DB_REPLICA_MAX_LAG`` (ou inacessíveis)
+ficam fora da rotação até a próxima verificação.
+
+O marcador de escrita viaja com o cliente (cookie com o horário da escrita),
+não na memória do processo: a leitura seguinte pode cair em qualquer worker.
+Um cookie adulterado só faz o próprio cliente ler do primário.
+
+O atraso é medido em uma thread de fundo, com ``connect_timeout`` curto; a
+requisição nunca espera por uma réplica inacessível.
+"""
+
+import itertools
+import math
+import threading
+import time
+from typing import Any, Dict, List, Optional
+import psycopg
+from flask import after_this_request, g, has_request_context, request
+from psycopg.rows import dict_row
+from psycopg_pool import ConnectionPool
+
+# Atraso de replicação em segundos; zero quando a réplica já aplicou todo o WAL recebido
+REPLICA_LAG_QUERY = '''
+    SELECT CASE
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END AS lag
+'''
+
+def parse_replica_urls(value: Optional[str]) -> List[str]:
+    """Converter lista separada por vírgulas em URLs postgresql://"""
+    urls = []
+    for url in (value or '').split(','):
+        url = url.strip()
+        if not url:
+            continue
+        if url.startswith('postgres://'):
+            url = url.replace('postgres://', 'postgresql://', 1)
+        urls.append(url)
+    return urls
+
+class ReplicaRouter:
+    """Escolhe a conexão de leitura entre réplicas saudáveis"""
+
+    def __init__(self, urls: List[str], settings):
+        self.urls = urls
+        self.settings = settings
+        self._pools: List[Optional[ConnectionPool]] = [None] * len(urls)
+        self._lag: List[Optional[float]] = [None] * len(urls)
+        self._checked_at: List[float] = [0.0] * len(urls)
+        self._lock = threading.Lock()
+        self._check_lock = threading.Lock()
+        self._round_robin = itertools.count()
+        self._probe_thread: Optional[threading.Thread] = None
+        self.stats = {'replica_reads': 0, 'primary_fallbacks': 0, 'read_your_writes': 0}
+
+    def mark_write(self, user_id):
+        """Registrar escrita do usuário (próximas leituras dele vão ao primário)
+
+        Vale para o resto da requisição atual e, pelo cookie gravado na
+        resposta, para as próximas requisições do mesmo cliente.
+        """
+        if user_id is None or not has_request_context():
+            return
+
+        first = 'db_written_at' not in g
+        g.db_written_at = time.time()
+        if first:
+            after_this_request(self._set_write_cookie)
+
+    def _set_write_cookie(self, response):
+        response.set_cookie(
+            self.settings.DB_READ_YOUR_WRITES_COOKIE,
+            f'{g.db_written_at:.3f}',
+            max_age=math.ceil(self.settings.DB_READ_YOUR_WRITES_WINDOW),
+            path='/api',
+            httponly=True,
+            # A API fica em outro domínio: mesmos atributos do cookie do carrinho de visitante
+            secure=self.settings.GUEST_CART_COOKIE_SECURE,
+            samesite=self.settings.GUEST_CART_COOKIE_SAMESITE
+        )
+        return response
+
+    def _wrote_recently(self, user_id) -> bool:
+        if user_id is None or not has_request_context():
+            return False
+
+        written_at = g.get('db_written_at')
+        if written_at is None:
+            try:
+                written_at = float(request.cookies.get(self.settings.DB_READ_YOUR_WRITES_COOKIE, ''))
+            except ValueError:
+                return False
+        # Relógios de workers em máquinas diferentes: tolerar desvio nos dois sentidos
+        return abs(time.time() - written_at) <= self.settings.DB_READ_YOUR_WRITES_WINDOW
+
+    def connection_for_read(self, user_id=None):
+        """Conexão de réplica para leitura, ou None para usar o primário"""
+        if self._wrote_recently(user_id):
+            self.stats['read_your_writes'] += 1
+            return None
+
+        self._refresh_lag()
+        healthy = [i for i, lag in enumerate(self._lag)
+                   if lag is not None and lag <= self.settings.DB_REPLICA_MAX_LAG]
+        if not healthy:
+            self.stats['primary_fallbacks'] += 1
+            return None
+
+        index = healthy[next(self._round_robin) % len(healthy)]
+        self.stats['replica_reads'] += 1
+        return self._connect(index)
+
+    def _connect(self, index: int):
+        if not self.settings.DB_POOL_ENABLED:
+            return psycopg.connect(self.urls[index], row_factory=dict_row)
+
+        if self._pools[index] is None:
+            with self._lock:
+                if self._pools[index] is None:
+                    self._pools[index] = ConnectionPool(
+                        self.urls[index],
+                        min_size=self.settings.DB_POOL_MIN_SIZE,
+                        max_size=self.settings.DB_POOL_MAX_SIZE,
+                        max_idle=self.settings.DB_POOL_MAX_IDLE,
+                        timeout=self.settings.DB_POOL_TIMEOUT,
+                        kwargs={'row_factory': dict_row},
+                        check=ConnectionPool.check_connection,
+                        name=f'3dbenchy-replica-{index}',
+                        open=True
+                    )
+        return self._pools[index].connection()
+
+    def _refresh_lag(self):
+        """Disparar a medição de atraso das réplicas no máximo uma vez por intervalo"""
+        now = time.monotonic()
+        interval = self.settings.DB_REPLICA_LAG_CHECK_INTERVAL
+        stale = [i for i, checked_at in enumerate(self._checked_at) if now - checked_at >= interval]
+
+        # Apenas uma medição por vez; as requisições usam o último valor conhecido
+        if not stale or not self._check_lock.acquire(blocking=False):
+            return
+
+        try:
+            self._probe_thread = threading.Thread(target=self._probe, args=(stale,),
+                                                  name='replica-lag-probe', daemon=True)
+            self._probe_thread.start()
+        except Exception:
+            self._check_lock.release()
+            raise
+
+    def _probe(self, indexes: List[int]):
+        """Medir o atraso em conexões próprias (fora do pool), com timeout curto"""
+        try:
+            for index in indexes:
+                try:
+                    with psycopg.connect(self.urls[index], row_factory=dict_row,
+                                         connect_timeout=self.settings.DB_REPLICA_PROBE_TIMEOUT) as conn:
+                        row = conn.execute(REPLICA_LAG_QUERY).fetchone()
+                        self._lag[index] = float(row['lag'])
+                except Exception as e:
+                    print(f"⚠️  Réplica {index} indisponível: {e}")
+                    self._lag[index] = None
+                self._checked_at[index] = time.monotonic()
+        finally:
+            self._check_lock.release()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            'replicas': [
+                {
+                    'index': i,
+                    'lag_seconds': self._lag[i],
+                    'pool': self._pools[i].get_stats() if self._pools[i] is not None else None
+                }
+                for i in range(len(self.urls))
+            ]
+        }
+
+    def close(self):
+        for i, pool in enumerate(self._pools):
+            if pool is not None:
+                pool.close()
+                self._pools[i] = None
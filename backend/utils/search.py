@@ -0,0 +1,66 @@
+"""
+Busca textual de produtos
+
+O texto digitado pelo cliente nunca chega cru ao banco: é quebrado em termos
+alfanuméricos e remontado na sintaxe de cada motor (``to_tsquery`` no
+PostgreSQL, ``MATCH`` do FTS5 no SQLite). Todos os termos são obrigatórios e o
+último casa por prefixo, para funcionar enquanto o cliente digita.
+
+Os trechos destacados vêm do banco com marcadores de controle e só viram
+``<mark>`` depois de escapar o HTML do conteúdo.
+"""
+
+import html
+import re
+from typing import List, Optional
+from backend.utils.validators import ValidationError
+
+MAX_QUERY_LENGTH = 200
+MAX_SEARCH_TERMS = 8
+
+# Marcadores usados por ts_headline/highlight(); não aparecem em texto de produto
+HIGHLIGHT_START = '\x02'
+HIGHLIGHT_STOP = '\x03'
+
+PG_HEADLINE_OPTIONS = f'StartSel="{HIGHLIGHT_START}", StopSel="{HIGHLIGHT_STOP}", HighlightAll=true'
+PG_SNIPPET_OPTIONS = f'StartSel="{HIGHLIGHT_START}", StopSel="{HIGHLIGHT_STOP}", MaxWords=24, MinWords=8'
+
+_TERM_RE = re.compile(r'\w+', re.UNICODE)
+
+def parse_search_terms(value: Optional[str]) -> List[str]:
+    """Validar ``?q=`` e extrair os termos de busca"""
+    value = (value or '').strip()
+    if not value:
+        raise ValidationError("Parâmetro q é obrigatório")
+    if len(value) > MAX_QUERY_LENGTH:
+        raise ValidationError(f"Busca deve ter no máximo {MAX_QUERY_LENGTH} caracteres")
+
+    terms = _TERM_RE.findall(value.lower())[:MAX_SEARCH_TERMS]
+    if not terms:
+        raise ValidationError("Busca sem termos válidos")
+    return terms
+
+def to_tsquery(terms: List[str]) -> str:
+    """Expressão para ``to_tsquery('portuguese', ...)``"""
+    return ' & '.join(terms[:-1] + [f'{terms[-1]}:*'])
+
+def to_fts5_query(terms: List[str]) -> str:
+    """Expressão para ``products_fts MATCH ...``"""
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += '*'
+    return ' '.join(quoted)
+
+def highlight_html(text: Optional[str]) -> Optional[str]:
+    """Escapar o texto e trocar os marcadores por ``<mark>``"""
+    if text is None:
+        return None
+    return (html.escape(text)
+            .replace(HIGHLIGHT_START, '<mark>')
+            .replace(HIGHLIGHT_STOP, '</mark>'))
+
+def search_params(dialect: str, terms: List[str], limit: int, offset: int) -> tuple:
+    """Parâmetros de ``products.search`` na ordem esperada por cada dialeto"""
+    if dialect == 'postgresql':
+        return (PG_HEADLINE_OPTIONS, PG_SNIPPET_OPTIONS, to_tsquery(terms), limit, offset)
+    return (HIGHLIGHT_START, HIGHLIGHT_STOP, HIGHLIGHT_START, HIGHLIGHT_STOP,
+            to_fts5_query(terms), limit, offset)
@@ -34,11 +34,13 @@ class AuthManager {
         }
 
         try {
-            const response = await fetch(`${CONFIG.API_BASE_URL}/auth/register`, {
+            // credentials: envia o cookie do carrinho de visitante para ser incorporado
+            const response = await fetch(`${CONFIG.API_BASE_URL}/api/auth/register`, {
                 method: 'POST',
                 headers: {
                     'Content-Type': 'application/json'
                 },
+                credentials: 'include',
                 body: JSON.stringify({
                     name: securityManager.sanitizeInput(name),
                     email: securityManager.sanitizeInput(email),
@@ -52,6 +54,7 @@ class AuthManager {
                 this.saveTokens(data.tokens);
                 this.currentUser = data.user;
                 this.updateUserInterface();
+                cartManager.loadCart();
                 alert('Cadastro realizado com sucesso!');
             } else {
                 alert(data.error || 'Erro no cadastro');
@@ -2,6 +2,12 @@
 class CartManager {
     constructor() {
         this.cartItems = [];
+        // Operações acumuladas (ex.: cliques no +/-) enviadas juntas em um PATCH
+        this.pendingOperations = [];
+        this.flushTimer = null;
+        this.flushDelay = 300;
+        // Mesmo limite de CART_MAX_BATCH_OPERATIONS no servidor
+        this.maxBatchOperations = 50;
     }
 
     getAuthHeaders() {
@@ -9,20 +15,28 @@ class CartManager {
         return token ? { 'Authorization': `Bearer ${token}` } : {};
     }
 
+    // Visitantes usam o carrinho em cookie assinado (incorporado no login/cadastro)
+    get cartUrl() {
+        return `${CONFIG.API_BASE_URL}/api/cart${authManager.currentUser ? '' : '/guest'}`;
+    }
+
     async addToCart(productId) {
         if (!authManager.currentUser) {
-            alert('Faça login para adicionar produtos ao carrinho!');
-            authManager.showLoginOptions();
+            if (await this.applyOperations([{ op: 'add', product_id: productId, quantity: 1 }])) {
+                alert('Produto adicionado ao carrinho!');
+            }
             return;
         }
 
         try {
-            const response = await fetch(`${CONFIG.API_BASE_URL}/cart`, {
+            const response = await fetch(`${CONFIG.API_BASE_URL}/api/cart`, {
                 method: 'POST',
                 headers: {
                     'Content-Type': 'application/json',
                     ...this.getAuthHeaders()
                 },
+                // credentials: guarda o cookie de leitura após escrita (read_primary)
+                credentials: 'include',
                 body: JSON.stringify({
                     product_id: productId,
                     quantity: 1
@@ -44,18 +58,14 @@ class CartManager {
     }
 
     async loadCart() {
-        if (!authManager.currentUser) return;
-
         try {
-            const response = await fetch(`${CONFIG.API_BASE_URL}/cart`, {
-                headers: this.getAuthHeaders()
+            const response = await fetch(this.cartUrl, {
+                headers: this.getAuthHeaders(),
+                credentials: 'include'
             });
 
             if (response.ok) {
-                const data = await response.json();
-                this.cartItems = data.items || [];
-                this.displayCart();
-                this.updateCartCount(data.total_items);
+                this.setCart(await response.json());
             }
         } catch (error) {
             console.error('Erro ao carregar carrinho:', error);
@@ -64,9 +74,10 @@ class CartManager {
 
     async removeFromCart(itemId) {
         try {
-            const response = await fetch(`${CONFIG.API_BASE_URL}/cart/${itemId}`, {
+            const response = await fetch(`${CONFIG.API_BASE_URL}/api/cart/${itemId}`, {
                 method: 'DELETE',
-                headers: this.getAuthHeaders()
+                headers: this.getAuthHeaders(),
+                credentials: 'include'
             });
 
             if (response.ok) {
@@ -80,6 +91,125 @@ class CartManager {
         }
     }
 
+    // Várias operações (set, add, remove, clear) em uma requisição; o servidor
+    // aplica todas ou nenhuma e devolve o carrinho resultante
+    async applyOperations(operations) {
+        try {
+            const response = await fetch(this.cartUrl, {
+                method: 'PATCH',
+                headers: {
+                    'Content-Type': 'application/json',
+                    ...this.getAuthHeaders()
+                },
+                credentials: 'include',
+                body: JSON.stringify({ operations })
+            });
+
+            const data = await response.json();
+
+            if (response.ok) {
+                this.setCart(data);
+            } else {
+                alert(data.error || 'Erro ao atualizar carrinho');
+                this.loadCart(); // Voltar ao estado do servidor
+            }
+            return response.ok;
+        } catch (error) {
+            console.error('Erro ao atualizar carrinho:', error);
+            return false;
+        }
+    }
+
+    queueOperation(operation) {
+        if (operation.op === 'clear') {
+            this.pendingOperations = [];
+        } else if (operation.op === 'set' || operation.op === 'remove') {
+            // set/remove são absolutos: substituem o que estava na fila para o produto
+            this.pendingOperations = this.pendingOperations.filter(pending =>
+                pending.product_id !== operation.product_id);
+        }
+        this.pendingOperations.push(operation);
+        clearTimeout(this.flushTimer);
+        this.flushTimer = setTimeout(() => this.flushOperations(), this.flushDelay);
+    }
+
+    async flushOperations() {
+        const operations = this.pendingOperations;
+        this.pendingOperations = [];
+        // Acima do limite do servidor: várias requisições em sequência
+        for (let start = 0; start < operations.length; start += this.maxBatchOperations) {
+            if (!await this.applyOperations(operations.slice(start, start + this.maxBatchOperations))) {
+                break;
+            }
+        }
+    }
+
+    changeQuantity(productId, quantity) {
+        const item = this.cartItems.find(cartItem => cartItem.product_id === productId);
+        if (item) {
+            item.quantity = quantity; // Mostrar na hora; o servidor confirma no PATCH
+            this.displayCart();
+        }
+        this.queueOperation({ op: 'set', product_id: productId, quantity });
+    }
+
+    setCart(data) {
+        this.cartItems = data.items || [];
+        this.totalDisplay = data.total_price_display;
+        this.displayCart();
+        this.updateCartCount(data.total_items);
+    }
+
+    displayCart() {
+        const container = document.getElementById('cartItems');
+        const total = document.getElementById('cartTotal');
+        if (!container) return;
+
+        container.innerHTML = '';
+        if (this.cartItems.length === 0) {
+            container.innerHTML = '<div class="loading">Seu carrinho está vazio</div>';
+            if (total) total.style.display = 'none';
+            return;
+        }
+
+        this.cartItems.forEach(item => {
+            const row = document.createElement('div');
+            row.className = 'cart-item';
+
+            const name = document.createElement('span');
+            name.className = 'cart-item-name';
+            name.textContent = `${item.name} (${item.price_display})`; // textContent é seguro
+
+            const decrease = document.createElement('button');
+            decrease.textContent = '−';
+            decrease.setAttribute('aria-label', `Diminuir quantidade de ${item.name}`);
+            decrease.addEventListener('click', () => this.changeQuantity(item.product_id, Math.max(item.quantity - 1, 0)));
+
+            const quantity = document.createElement('span');
+            quantity.className = 'cart-item-quantity';
+            quantity.textContent = item.quantity;
+
+            const increase = document.createElement('button');
+            increase.textContent = '+';
+            increase.setAttribute('aria-label', `Aumentar quantidade de ${item.name}`);
+            increase.addEventListener('click', () => this.changeQuantity(item.product_id, item.quantity + 1));
+
+            const remove = document.createElement('button');
+            remove.textContent = '🗑️';
+            remove.setAttribute('aria-label', `Remover ${item.name} do carrinho`);
+            remove.addEventListener('click', () => this.queueOperation({ op: 'remove', product_id: item.product_id }));
+
+            row.append(name, decrease, quantity, increase, remove);
+            container.appendChild(row);
+        });
+
+        if (total) {
+            total.style.display = 'block';
+            // Formatado no servidor a partir dos centavos ("R$ 1.234,56")
+            document.getElementById('totalAmount').textContent = (this.totalDisplay || '').replace('R$ ', '');
+        }
+    }
+
     updateCartCount(count) {
         const cartCount = document.getElementById('cartCount');
         if (cartCount) {
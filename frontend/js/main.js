@@ -19,8 +19,7 @@ class App {
         try {
             // Inicializar todos os gerenciadores
             await authManager.checkAuthStatus();
-            await productManager.loadFeaturedProducts();
-            await productManager.loadProducts();
+            await productManager.loadHome();
             await cartManager.loadCart();
             
             console.log('Aplicação inicializada com sucesso!');
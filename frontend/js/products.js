@@ -2,6 +2,83 @@
 class ProductManager {
     constructor() {
         this.products = [];
+        this.fields = 'id,name,description,price,category,image_url,image';
+    }
+
+    // Sem cache-busting: o navegador reaproveita a resposta enquanto o
+    // Cache-Control permitir e depois revalida com ETag (304 sem corpo)
+    async fetchCatalog(path) {
+        const response = await fetch(`${CONFIG.API_BASE_URL}/api/products${path}`);
+        if (!response.ok) {
+            throw new Error(`HTTP ${response.status}`);
+        }
+        return response.json();
+    }
+
+    // Página inicial em uma requisição: destaques, categorias e primeira página
+    async loadHome() {
+        try {
+            const response = await fetch(`${CONFIG.API_BASE_URL}/api/home`);
+            if (!response.ok) {
+                throw new Error(`HTTP ${response.status}`);
+            }
+            const data = await response.json();
+            this.categories = data.categories;
+            this.products = data.products.products;
+            this.displayProducts(data.featured, 'featuredGrid');
+            this.displayProducts(this.products, 'productsGrid');
+        } catch (error) {
+            console.error('Erro ao carregar página inicial:', error);
+        }
+    }
+
+    async loadFeaturedProducts() {
+        try {
+            const products = await this.fetchCatalog(`/featured?fields=${this.fields}`);
+            this.displayProducts(products, 'featuredGrid');
+        } catch (error) {
+            console.error('Erro ao carregar produtos em destaque:', error);
+        }
+    }
+
+    async loadProducts() {
+        try {
+            const data = await this.fetchCatalog(`?fields=${this.fields}`);
+            this.products = data.products;
+            this.displayProducts(this.products, 'productsGrid');
+        } catch (error) {
+            console.error('Erro ao carregar produtos:', error);
+        }
+    }
+
+    async filterByCategory(category) {
+        if (category === 'todos') {
+            return this.displayProducts(this.products, 'productsGrid');
+        }
+
+        try {
+            const data = await this.fetchCatalog(
+                `?category=${encodeURIComponent(category)}&fields=${this.fields}`
+            );
+            this.displayProducts(data.products, 'productsGrid');
+        } catch (error) {
+            console.error('Erro ao filtrar produtos:', error);
+        }
+    }
+
+    async searchProducts(query) {
+        if (!query.trim()) {
+            return this.displayProducts(this.products, 'productsGrid');
+        }
+
+        try {
+            const data = await this.fetchCatalog(
+                `/search?q=${encodeURIComponent(query)}&fields=${this.fields}`
+            );
+            this.displayProducts(data.products, 'productsGrid');
+        } catch (error) {
+            console.error('Erro ao buscar produtos:', error);
+        }
     }
 
     displayProducts(products, containerId) {
@@ -25,6 +102,29 @@ class ProductManager {
             return `<span role="img" aria-label="${securityManager.escapeHTML(icon.alt)}">${icon.emoji}</span>`;
         };
 
+        // Derivados WebP/JPEG no tamanho certo para a tela (srcset); URLs da API são relativas
+        const createProductPicture = (product) => {
+            const withBase = (srcset) => srcset.split(', ').map(entry => `${CONFIG.API_BASE_URL}${entry}`).join(', ');
+            const picture = document.createElement('picture');
+
+            const webp = document.createElement('source');
+            webp.type = 'image/webp';
+            webp.srcset = withBase(product.image.srcset.webp);
+            webp.sizes = product.image.sizes;
+
+            const img = document.createElement('img');
+            img.src = `${CONFIG.API_BASE_URL}${product.image.src}`;
+            img.srcset = withBase(product.image.srcset.jpeg);
+            img.sizes = product.image.sizes;
+            img.width = product.image.width;
+            img.alt = product.name;
+            img.loading = 'lazy';
+            img.decoding = 'async';
+
+            picture.append(webp, img);
+            return picture;
+        };
+
         // Usar createElement em vez de innerHTML para segurança
         container.innerHTML = ''; // Limpar container
 
@@ -32,7 +132,8 @@ class ProductManager {
             // Sanitizar todos os dados do produto
             const sanitizedName = securityManager.escapeHTML(product.name);
             const sanitizedDescription = securityManager.escapeHTML(product.description);
-            const sanitizedPrice = parseFloat(product.price).toFixed(2).replace('.', ',');
+            // Formatado no servidor a partir dos centavos
+            const priceDisplay = product.price_display;
 
             // Criar elementos de forma segura
             const productCard = document.createElement('div');
@@ -42,7 +143,11 @@ class ProductManager {
 
             const productImage = document.createElement('div');
             productImage.className = 'product-image';
-            productImage.innerHTML = getProductIcon(product.id, product.name);
+            if (product.image) {
+                productImage.appendChild(createProductPicture(product));
+            } else {
+                productImage.innerHTML = getProductIcon(product.id, product.name);
+            }
 
             const productName = document.createElement('h3');
             productName.className = 'product-name';
@@ -51,8 +156,8 @@ class ProductManager {
 
             const productPrice = document.createElement('div');
             productPrice.className = 'product-price';
-            productPrice.setAttribute('aria-label', `Preço: R$ ${sanitizedPrice}`);
-            productPrice.textContent = `R$ ${sanitizedPrice}`;
+            productPrice.setAttribute('aria-label', `Preço: ${priceDisplay}`);
+            productPrice.textContent = priceDisplay;
 
             const productDescription = document.createElement('p');
             productDescription.className = 'product-description';
@@ -74,8 +179,20 @@ class ProductManager {
             container.appendChild(productCard);
         });
     }
+}
+// Criar instância global
+const productManager = new ProductManager();
 
+// Chamado pelo botão de busca da seção de produtos
+function searchProducts() {
+    productManager.searchProducts(document.getElementById('searchInput').value);
+}
 
+// Chamado pelos botões de categoria da seção de produtos
+function filterByCategory(category) {
+    document.querySelectorAll('.category-btn').forEach(button => {
+        button.classList.toggle('active', button.id === `filter-${category}`);
+    });
+    // O id do botão não tem acento; a categoria no catálogo tem
+    productManager.filterByCategory(category === 'ficcao' ? 'ficção' : category);
 }
-// Criar instância global
-const productManager = new ProductManager();
\ No newline at end of file
@@ -0,0 +1,3 @@
+-- SKU do fornecedor: chave natural usada pela importação em massa
+ALTER TABLE products ADD COLUMN IF NOT EXISTS sku VARCHAR(64);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_products_sku ON products(sku);
@@ -0,0 +1,24 @@
+-- Versão do catálogo: incrementada a cada escrita em produtos para invalidar caches
+-- (alterações só de stock_quantity não invalidam; o estoque em cache expira pelo TTL)
+CREATE TABLE IF NOT EXISTS catalog_meta (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    version BIGINT NOT NULL DEFAULT 1,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+INSERT INTO catalog_meta (id) VALUES (1) ON CONFLICT (id) DO NOTHING;
+
+CREATE OR REPLACE FUNCTION bump_catalog_version() RETURNS trigger AS $$
+BEGIN
+    UPDATE catalog_meta SET version = version + 1, updated_at = CURRENT_TIMESTAMP WHERE id = 1;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Gatilho por comando: uma importação em massa incrementa a versão uma única vez
+DROP TRIGGER IF EXISTS trg_products_catalog_version ON products;
+CREATE TRIGGER trg_products_catalog_version
+    AFTER INSERT OR DELETE
+       OR UPDATE OF sku, name, description, price, category, image_url, is_featured, is_active
+    ON products
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_catalog_version();
@@ -0,0 +1,16 @@
+-- Reservas de estoque com expiração (o estoque reservado já foi abatido de products)
+CREATE TABLE IF NOT EXISTS inventory_reservations (
+    id SERIAL PRIMARY KEY,
+    product_id INTEGER NOT NULL REFERENCES products (id) ON DELETE CASCADE,
+    user_id INTEGER REFERENCES users (id) ON DELETE CASCADE,
+    quantity INTEGER NOT NULL CHECK (quantity > 0),
+    expires_at TIMESTAMP NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_inventory_reservations_expires ON inventory_reservations (expires_at);
+CREATE INDEX IF NOT EXISTS idx_inventory_reservations_user ON inventory_reservations (user_id, product_id);
+
+-- Nenhuma escrita pode deixar o estoque negativo
+ALTER TABLE products DROP CONSTRAINT IF EXISTS chk_products_stock_non_negative;
+ALTER TABLE products ADD CONSTRAINT chk_products_stock_non_negative CHECK (stock_quantity >= 0);
@@ -0,0 +1,67 @@
+-- Contador do carrinho por usuário (badge do cabeçalho), mantido por gatilhos
+-- na mesma transação das escritas em cart_items
+CREATE TABLE IF NOT EXISTS cart_counters (
+    user_id INTEGER PRIMARY KEY REFERENCES users (id) ON DELETE CASCADE,
+    total_items INTEGER NOT NULL DEFAULT 0,
+    total_cents BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+INSERT INTO cart_counters (user_id, total_items, total_cents)
+SELECT ci.user_id, SUM(ci.quantity), SUM(ci.quantity * p.price_cents)
+FROM cart_items ci
+JOIN products p ON p.id = ci.product_id
+GROUP BY ci.user_id
+ON CONFLICT (user_id) DO UPDATE
+SET total_items = excluded.total_items, total_cents = excluded.total_cents, updated_at = CURRENT_TIMESTAMP;
+
+CREATE OR REPLACE FUNCTION apply_cart_counter() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE cart_counters
+        SET total_items = total_items - OLD.quantity,
+            total_cents = total_cents - OLD.quantity * (SELECT price_cents FROM products WHERE id = OLD.product_id),
+            updated_at = CURRENT_TIMESTAMP
+        WHERE user_id = OLD.user_id;
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO cart_counters (user_id, total_items, total_cents)
+        SELECT NEW.user_id, NEW.quantity, NEW.quantity * price_cents FROM products WHERE id = NEW.product_id
+        ON CONFLICT (user_id) DO UPDATE
+        SET total_items = cart_counters.total_items + excluded.total_items,
+            total_cents = cart_counters.total_cents + excluded.total_cents,
+            updated_at = CURRENT_TIMESTAMP;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_cart_items_counter ON cart_items;
+CREATE TRIGGER trg_cart_items_counter
+    AFTER INSERT OR DELETE OR UPDATE OF user_id, product_id, quantity
+    ON cart_items
+    FOR EACH ROW EXECUTE FUNCTION apply_cart_counter();
+
+-- Mudança de preço corrige o total dos carrinhos que têm o produto
+CREATE OR REPLACE FUNCTION reprice_cart_counters() RETURNS trigger AS $$
+BEGIN
+    UPDATE cart_counters cc
+    SET total_cents = cc.total_cents + (NEW.price_cents - OLD.price_cents) * ci.quantity,
+        updated_at = CURRENT_TIMESTAMP
+    FROM cart_items ci
+    WHERE ci.product_id = NEW.id AND cc.user_id = ci.user_id;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_products_cart_counters ON products;
+CREATE TRIGGER trg_products_cart_counters
+    AFTER UPDATE OF price_cents ON products
+    FOR EACH ROW
+    WHEN (OLD.price_cents IS DISTINCT FROM NEW.price_cents)
+    EXECUTE FUNCTION reprice_cart_counters();
+
+-- Carrinhos que contêm um produto (usado pelo gatilho de preço)
+CREATE INDEX IF NOT EXISTS idx_cart_items_product ON cart_items (product_id);
@@ -0,0 +1,27 @@
+-- Versão do catálogo: incrementada a cada escrita em produtos para invalidar caches
+-- (alterações só de stock_quantity não invalidam; o estoque em cache expira pelo TTL)
+CREATE TABLE IF NOT EXISTS catalog_meta (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    version INTEGER NOT NULL DEFAULT 1,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+INSERT OR IGNORE INTO catalog_meta (id) VALUES (1);
+
+CREATE TRIGGER IF NOT EXISTS trg_products_catalog_version_insert
+AFTER INSERT ON products
+BEGIN
+    UPDATE catalog_meta SET version = version + 1, updated_at = CURRENT_TIMESTAMP WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_products_catalog_version_update
+AFTER UPDATE OF sku, name, description, price, category, image_url, is_featured, is_active ON products
+BEGIN
+    UPDATE catalog_meta SET version = version + 1, updated_at = CURRENT_TIMESTAMP WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_products_catalog_version_delete
+AFTER DELETE ON products
+BEGIN
+    UPDATE catalog_meta SET version = version + 1, updated_at = CURRENT_TIMESTAMP WHERE id = 1;
+END;
@@ -0,0 +1,32 @@
+-- Busca textual de produtos: tabela FTS5 de conteúdo externo sincronizada por gatilhos
+-- (remove_diacritics: "aviao" encontra "avião")
+CREATE VIRTUAL TABLE IF NOT EXISTS products_fts USING fts5(
+    name, category, description,
+    content='products', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+);
+
+INSERT INTO products_fts (products_fts) VALUES ('rebuild');
+
+CREATE TRIGGER IF NOT EXISTS trg_products_fts_insert
+AFTER INSERT ON products
+BEGIN
+    INSERT INTO products_fts (rowid, name, category, description)
+    VALUES (new.id, new.name, new.category, new.description);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_products_fts_update
+AFTER UPDATE OF name, category, description ON products
+BEGIN
+    INSERT INTO products_fts (products_fts, rowid, name, category, description)
+    VALUES ('delete', old.id, old.name, old.category, old.description);
+    INSERT INTO products_fts (rowid, name, category, description)
+    VALUES (new.id, new.name, new.category, new.description);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_products_fts_delete
+AFTER DELETE ON products
+BEGIN
+    INSERT INTO products_fts (products_fts, rowid, name, category, description)
+    VALUES ('delete', old.id, old.name, old.category, old.description);
+END;
@@ -0,0 +1,20 @@
+-- Reservas de estoque com expiração (o estoque reservado já foi abatido de products)
+CREATE TABLE IF NOT EXISTS inventory_reservations (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    product_id INTEGER NOT NULL REFERENCES products (id) ON DELETE CASCADE,
+    user_id INTEGER REFERENCES users (id) ON DELETE CASCADE,
+    quantity INTEGER NOT NULL CHECK (quantity > 0),
+    expires_at TIMESTAMP NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_inventory_reservations_expires ON inventory_reservations (expires_at);
+CREATE INDEX IF NOT EXISTS idx_inventory_reservations_user ON inventory_reservations (user_id, product_id);
+
+-- SQLite não adiciona CHECK a tabela existente: gatilho equivalente
+CREATE TRIGGER IF NOT EXISTS trg_products_stock_non_negative
+BEFORE UPDATE OF stock_quantity ON products
+WHEN new.stock_quantity < 0
+BEGIN
+    SELECT RAISE(ABORT, 'stock_quantity não pode ser negativo');
+END;
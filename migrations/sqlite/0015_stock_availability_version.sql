@@ -0,0 +1,10 @@
+-- Esgotar ou repor um produto muda a versão do catálogo: o ETag das listagens
+-- e do detalhe (utils/http_cache.py) deixa de validar respostas com a
+-- disponibilidade antiga. Variações de estoque que não cruzam zero não mudam a
+-- versão (reservas frequentes não invalidam o cache do catálogo inteiro)
+CREATE TRIGGER IF NOT EXISTS trg_products_stock_availability
+AFTER UPDATE OF stock_quantity ON products
+WHEN (COALESCE(old.stock_quantity, 0) > 0) <> (COALESCE(new.stock_quantity, 0) > 0)
+BEGIN
+    UPDATE catalog_meta SET version = version + 1, updated_at = CURRENT_TIMESTAMP WHERE id = 1;
+END;
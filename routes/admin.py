@@ -0,0 +1,84 @@
+import io
+from flask import Blueprint, request, jsonify
+from werkzeug.local import LocalProxy
+from utils.database import get_db
+from utils.auth_helpers import require_admin
+from utils.product_import import ProductImporter, detect_format
+from utils.images import ImageStore, ImageProcessingError, image_metadata
+from utils.validators import ValidationError
+
+admin_bp = Blueprint('admin', __name__)
+db = LocalProxy(get_db)
+
+@admin_bp.route('/products/import', methods=['POST'])
+@require_admin
+def import_products():
+    """Importar produtos em massa (CSV ou NDJSON)
+    
+    Aceita upload multipart no campo ``file`` ou o arquivo direto no corpo
+    (``Content-Type: text/csv`` ou ``application/x-ndjson``).
+    """
+    try:
+        upload = request.files.get('file')
+        
+        if upload:
+            fmt = request.args.get('format') or detect_format(upload.filename, upload.mimetype)
+            raw = upload.stream
+        else:
+            fmt = request.args.get('format') or detect_format(None, request.content_type)
+            raw = request.stream
+        
+        if fmt not in ('csv', 'ndjson'):
+            return jsonify({"error": "Formato deve ser csv ou ndjson"}), 400
+        
+        # Ler em streaming: o arquivo nunca é carregado inteiro em memória
+        stream = io.TextIOWrapper(raw, encoding='utf-8', newline='')
+        result = ProductImporter(db._get_current_object()).run(stream, fmt)
+        
+        return jsonify({
+            "message": "Importação concluída",
+            **result
+        }), 200
+        
+    except UnicodeDecodeError:
+        return jsonify({"error": "Arquivo deve estar em UTF-8"}), 400
+    except Exception as e:
+        print(f"❌ Erro na importação de produtos: {e}")
+        return jsonify({"error": "Erro interno do servidor"}), 500
+
+@admin_bp.route('/products/<int:product_id>/image', methods=['POST'])
+@require_admin
+def upload_product_image(product_id):
+    """Enviar imagem do produto (multipart, campo ``image``)
+    
+    Gera os derivados WebP/JPEG uma única vez; reenviar a mesma imagem
+    reaproveita os arquivos já existentes.
+    """
+    try:
+        upload = request.files.get('image')
+        if not upload:
+            return jsonify({"error": "Campo image é obrigatório"}), 400
+        
+        if not db.get_product_by_id(product_id, fields=['id']):
+            return jsonify({"error": "Produto não encontrado"}), 404
+        
+        image = ImageStore(db.settings).save_upload(upload.stream)
+        result = db.set_product_image(product_id, image['image_hash'], image['image_width'])
+        
+        if not result['success']:
+            status = 404 if result['error'] == 'Produto não encontrado' else 500
+            return jsonify({"error": result['error']}), status
+        
+        return jsonify({
+            "message": "Imagem atualizada",
+            "image": image_metadata(image['image_hash'], image['image_width'], db.settings.IMAGE_BASE_URL)
+        }), 200
+        
+    except ValidationError as e:
+        return jsonify({"error": str(e)}), 400
+    except ImageProcessingError as e:
+        print(f"❌ Processamento de imagens indisponível: {e}")
+        return jsonify({"error": "Processamento de imagens indisponível"}), 503
+    except Exception as e:
+        print(f"❌ Erro no envio de imagem: {e}")
+        return jsonify({"error": "Erro interno do servidor"}), 500
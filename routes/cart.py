@@ -1,9 +1,28 @@
-from flask import Blueprint, request, jsonify
-from utils.database import DatabaseManager
+from flask import Blueprint, request, jsonify, make_response
+from werkzeug.local import LocalProxy
+from utils.database import get_db
 from utils.auth_helpers import require_auth, get_current_user
+from utils.money import CURRENCY, money_fields, serialize_product
+from utils.images import with_image
+from utils.cart import parse_operations
+from utils.guest_cart import GuestCart, apply_guest_operations, guest_cart_view
+from utils.validators import ValidationError
 
 cart_bp = Blueprint('cart', __name__)
-db = DatabaseManager()
+db = LocalProxy(get_db)
+
+# Colunas dos produtos do carrinho de visitante (estoque só para validar)
+GUEST_CART_FIELDS = ['id', 'name', 'price_cents', 'category', 'image_url', 'image_hash', 'image_width',
+                     'stock_quantity']
+
+def cart_response(cart):
+    """Corpo JSON do carrinho (itens e totais vindos de ``db.get_cart``)"""
+    return {
+        "items": [with_image(serialize_product(item), db.settings.IMAGE_BASE_URL) for item in cart['items']],
+        "total_items": cart['total_items'],
+        **money_fields(cart['total_cents'], 'total_price'),
+        "currency": CURRENCY
+    }
 
 @cart_bp.route('', methods=['GET'])
 @require_auth
@@ -11,18 +30,10 @@ def get_cart():
     """Obter itens do carrinho do usuário logado"""
     try:
         current_user = get_current_user()
-        cart_items = db.get_cart_items(current_user['user_id'])
-        
-        # Calcular totais
-        total_items = sum(item.get('quantity', 0) for item in cart_items)
-        total_price = sum(item.get('price', 0) * item.get('quantity', 0) for item in cart_items)
+        # Itens e totais (em centavos) calculados pelo banco na mesma consulta
+        cart = db.get_cart(current_user['user_id'])
         
-        return jsonify({
-            "items": cart_items,
-            "total_items": total_items,
-            "total_price": round(total_price, 2),
-            "currency": "BRL"
-        }), 200
+        return jsonify(cart_response(cart)), 200
         
     except Exception as e:
         print(f"❌ Erro ao buscar carrinho: {e}")
@@ -52,23 +63,21 @@ def add_to_cart():
         except (ValueError, TypeError):
             return jsonify({"error": "product_id e quantity devem ser números válidos"}), 400
         
-        # Verificar se produto existe
-        product = db.get_product_by_id(product_id)
-        if not product:
-            return jsonify({"error": "Produto não encontrado"}), 404
-        
-        # Adicionar ao carrinho
+        # Verificação do produto, gravação e novos totais em um único statement
         result = db.add_to_cart(current_user['user_id'], product_id, quantity)
         
         if result.get('success'):
-            # Retornar carrinho atualizado
-            cart_items = db.get_cart_items(current_user['user_id'])
-            total_items = sum(item.get('quantity', 0) for item in cart_items)
-            
             return jsonify({
                 "message": result.get('message', 'Produto adicionado ao carrinho'),
-                "cart_total_items": total_items
+                "quantity": result['quantity'],
+                "cart_total_items": result['total_items'],
+                **money_fields(result['total_cents'], 'cart_total_price'),
+                "currency": CURRENCY
             }), 200
+        elif result.get('code') == 'NOT_FOUND':
+            return jsonify({"error": result['error']}), 404
+        elif result.get('code') == 'OUT_OF_STOCK':
+            return jsonify({"error": result['error'], "code": "OUT_OF_STOCK"}), 409
         else:
             return jsonify({"error": result.get('error', 'Erro ao adicionar ao carrinho')}), 400
             
@@ -76,6 +85,36 @@ def add_to_cart():
         print(f"❌ Erro ao adicionar ao carrinho: {e}")
         return jsonify({"error": "Erro interno do servidor"}), 500
 
+@cart_bp.route('', methods=['PATCH'])
+@require_auth
+def update_cart():
+    """Aplicar várias operações (set, add, remove, clear) em uma transação
+    
+    Retorna o carrinho resultante; se uma operação falhar, nada é aplicado.
+    """
+    try:
+        current_user = get_current_user()
+        
+        try:
+            operations = parse_operations(request.get_json(silent=True), db.settings.CART_MAX_BATCH_OPERATIONS)
+        except ValidationError as e:
+            return jsonify({"error": str(e)}), 400
+        
+        result = db.apply_cart_operations(current_user['user_id'], operations)
+        
+        if result.get('success'):
+            return jsonify(cart_response(result['cart'])), 200
+        
+        status = {'NOT_FOUND': 404, 'OUT_OF_STOCK': 409}.get(result.get('code'), 500)
+        body = {"error": result.get('error', 'Erro ao atualizar carrinho')}
+        if 'index' in result:
+            body.update({"code": result['code'], "index": result['index']})
+        return jsonify(body), status
+        
+    except Exception as e:
+        print(f"❌ Erro ao atualizar carrinho: {e}")
+        return jsonify({"error": "Erro interno do servidor"}), 500
+
 @cart_bp.route('/<int:cart_item_id>', methods=['DELETE'])
 @require_auth
 def remove_from_cart(cart_item_id):
@@ -86,13 +125,11 @@ def remove_from_cart(cart_item_id):
         result = db.remove_from_cart(current_user['user_id'], cart_item_id)
         
         if result.get('success'):
-            # Retornar carrinho atualizado
-            cart_items = db.get_cart_items(current_user['user_id'])
-            total_items = sum(item.get('quantity', 0) for item in cart_items)
-            
             return jsonify({
                 "message": result.get('message', 'Item removido do carrinho'),
-                "cart_total_items": total_items
+                "cart_total_items": result['total_items'],
+                **money_fields(result['total_cents'], 'cart_total_price'),
+                "currency": CURRENCY
             }), 200
         else:
             return jsonify({"error": result.get('error', 'Item não encontrado')}), 404
@@ -125,16 +162,73 @@ def clear_cart():
 @cart_bp.route('/count', methods=['GET'])
 @require_auth
 def get_cart_count():
-    """Obter apenas a contagem de itens no carrinho"""
+    """Obter apenas a contagem de itens e o total do carrinho (badge do cabeçalho)
+    
+    Uma leitura por chave primária do contador mantido por gatilhos.
+    """
     try:
         current_user = get_current_user()
-        cart_items = db.get_cart_items(current_user['user_id'])
-        total_items = sum(item.get('quantity', 0) for item in cart_items)
+        counter = db.get_cart_counter(current_user['user_id'])
         
         return jsonify({
-            "total_items": total_items
+            "total_items": counter['total_items'],
+            **money_fields(counter['total_cents'], 'total_price'),
+            "currency": CURRENCY
         }), 200
         
     except Exception as e:
         print(f"❌ Erro ao contar itens do carrinho: {e}")
         return jsonify({"error": "Erro interno do servidor"}), 500
+
+def _guest_products(items):
+    """Produtos do carrinho de visitante (leitura do catálogo, via cache)"""
+    ids = sorted(items)
+    if not ids:
+        return []
+    return db.catalog_cache.get_or_load(
+        ('products.by_ids', tuple(ids), tuple(GUEST_CART_FIELDS)),
+        lambda: db.get_products_by_ids(ids, fields=GUEST_CART_FIELDS)
+    )
+
+@cart_bp.route('/guest', methods=['GET'])
+def get_guest_cart():
+    """Carrinho de visitante (cookie assinado, sem login e sem escrita no banco)"""
+    try:
+        items = GuestCart(db.settings).load(request.cookies)
+        return jsonify(cart_response(guest_cart_view(items, _guest_products(items)))), 200
+        
+    except Exception as e:
+        print(f"❌ Erro ao buscar carrinho de visitante: {e}")
+        return jsonify({"error": "Erro interno do servidor"}), 500
+
+@cart_bp.route('/guest', methods=['PATCH'])
+def update_guest_cart():
+    """Aplicar operações (mesmo formato de PATCH /api/cart) ao carrinho de visitante"""
+    try:
+        guest = GuestCart(db.settings)
+        
+        try:
+            operations = parse_operations(request.get_json(silent=True), db.settings.CART_MAX_BATCH_OPERATIONS)
+            items = apply_guest_operations(guest.load(request.cookies), operations,
+                                           db.settings.GUEST_CART_MAX_ITEMS)
+        except ValidationError as e:
+            return jsonify({"error": str(e)}), 400
+        
+        products = _guest_products(items)
+        stock = {product['id']: product['stock_quantity'] for product in products}
+        
+        for index, operation in enumerate(operations):
+            if operation.product_id not in items:
+                continue
+            if operation.product_id not in stock:
+                return jsonify({"error": "Produto não encontrado", "code": "NOT_FOUND", "index": index}), 404
+            if (stock[operation.product_id] or 0) < items[operation.product_id]:
+                return jsonify({"error": "Estoque insuficiente", "code": "OUT_OF_STOCK", "index": index}), 409
+        
+        response = make_response(jsonify(cart_response(guest_cart_view(items, products))), 200)
+        guest.save(response, items)
+        return response
+        
+    except Exception as e:
+        print(f"❌ Erro ao atualizar carrinho de visitante: {e}")
+        return jsonify({"error": "Erro interno do servidor"}), 500
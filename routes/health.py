@@ -0,0 +1,28 @@
+from flask import Blueprint, jsonify
+from werkzeug.local import LocalProxy
+from utils.database import get_db
+from utils.auth_helpers import require_admin
+
+health_bp = Blueprint('health', __name__)
+db = LocalProxy(get_db)
+
+@health_bp.route('/db', methods=['GET'])
+@require_admin
+def database_stats():
+    """Estatísticas do pool de conexões do banco de dados (somente administradores)"""
+    try:
+        return jsonify(db.get_pool_stats()), 200
+        
+    except Exception as e:
+        print(f"❌ Erro ao obter estatísticas do banco: {e}")
+        return jsonify({"error": "Erro interno do servidor"}), 500
+
+@health_bp.route('/cache', methods=['GET'])
+def catalog_cache_stats():
+    """Estatísticas do cache do catálogo deste worker"""
+    try:
+        return jsonify(db.catalog_cache.get_stats()), 200
+        
+    except Exception as e:
+        print(f"❌ Erro ao obter estatísticas do cache: {e}")
+        return jsonify({"error": "Erro interno do servidor"}), 500
@@ -0,0 +1,71 @@
+from flask import Blueprint, request, jsonify
+from werkzeug.local import LocalProxy
+from utils.database import get_db
+from utils.auth_helpers import require_auth, get_current_user
+
+inventory_bp = Blueprint('inventory', __name__)
+db = LocalProxy(get_db)
+
+@inventory_bp.route('/reservations', methods=['POST'])
+@require_auth
+def create_reservation():
+    """Reservar estoque de um produto (expira em INVENTORY_RESERVATION_TTL)"""
+    try:
+        current_user = get_current_user()
+        data = request.get_json(silent=True)
+        
+        if not data or 'product_id' not in data:
+            return jsonify({"error": "product_id é obrigatório"}), 400
+        
+        try:
+            product_id = int(data['product_id'])
+            quantity = int(data.get('quantity', 1))
+        except (ValueError, TypeError):
+            return jsonify({"error": "product_id e quantity devem ser números válidos"}), 400
+        
+        if quantity <= 0 or quantity > db.settings.INVENTORY_MAX_QUANTITY:
+            return jsonify({"error": f"Quantidade deve estar entre 1 e {db.settings.INVENTORY_MAX_QUANTITY}"}), 400
+        
+        result = db.inventory.reserve(product_id, quantity, user_id=current_user['user_id'])
+        
+        if result.get('success'):
+            return jsonify(result), 201
+        if result.get('code') == 'OUT_OF_STOCK':
+            return jsonify(result), 409
+        return jsonify(result), 500
+        
+    except Exception as e:
+        print(f"❌ Erro ao reservar estoque: {e}")
+        return jsonify({"error": "Erro interno do servidor"}), 500
+
+@inventory_bp.route('/reservations/<int:reservation_id>', methods=['DELETE'])
+@require_auth
+def release_reservation(reservation_id):
+    """Cancelar reserva e devolver o estoque"""
+    try:
+        current_user = get_current_user()
+        result = db.inventory.release(reservation_id, user_id=current_user['user_id'])
+        
+        if result.get('success'):
+            return jsonify(result), 200
+        return jsonify(result), 404
+        
+    except Exception as e:
+        print(f"❌ Erro ao cancelar reserva: {e}")
+        return jsonify({"error": "Erro interno do servidor"}), 500
+
+@inventory_bp.route('/reservations/<int:reservation_id>/confirm', methods=['POST'])
+@require_auth
+def confirm_reservation(reservation_id):
+    """Efetivar reserva (o estoque não volta)"""
+    try:
+        current_user = get_current_user()
+        result = db.inventory.confirm(reservation_id, user_id=current_user['user_id'])
+        
+        if result.get('success'):
+            return jsonify(result), 200
+        return jsonify(result), 404
+        
+    except Exception as e:
+        print(f"❌ Erro ao confirmar reserva: {e}")
+        return jsonify({"error": "Erro interno do servidor"}), 500
@@ -138,4 +138,130 @@ class TestCart:
         # Verificar se está vazio
         cart_response = client.get('/api/cart', headers=auth_headers)
         cart_data = cart_response.get_json()
-        assert cart_data['total_items'] == 0
\ No newline at end of file
+        assert cart_data['total_items'] == 0
+    
+    def test_cart_totals(self, client, auth_headers):
+        """Teste de totais do carrinho calculados na mesma consulta dos itens"""
+        products = client.get('/api/products').get_json()['products'][:2]
+        
+        for product in products:
+            response = client.post('/api/cart', headers=auth_headers,
+                                   json={'product_id': product['id'], 'quantity': 2})
+            assert response.status_code == 200
+        
+        assert response.get_json()['cart_total_items'] == 2 * len(products)
+        
+        data = client.get('/api/cart', headers=auth_headers).get_json()
+        assert data['total_items'] == 2 * len(products)
+        assert data['total_price_cents'] == sum(2 * p['price_cents'] for p in products)
+        assert 'total_cents' not in data['items'][0]
+        
+        count = client.get('/api/cart/count', headers=auth_headers).get_json()
+        assert count['total_items'] == data['total_items']
+    
+    def test_add_to_cart_returns_totals(self, client, auth_headers):
+        """Teste de upsert no carrinho devolvendo os novos totais"""
+        product = client.get('/api/products').get_json()['products'][0]
+        
+        client.post('/api/cart', headers=auth_headers, json={'product_id': product['id'], 'quantity': 1})
+        response = client.post('/api/cart', headers=auth_headers,
+                               json={'product_id': product['id'], 'quantity': 2})
+        
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data['quantity'] == 3
+        assert data['cart_total_items'] == 3
+        assert data['cart_total_price_cents'] == 3 * product['price_cents']
+    
+    def test_add_to_cart_out_of_stock(self, client, auth_headers):
+        """Teste de quantidade acima do estoque"""
+        product = client.get('/api/products').get_json()['products'][0]
+        
+        response = client.post('/api/cart', headers=auth_headers,
+                               json={'product_id': product['id'], 'quantity': product['stock_quantity'] + 1})
+        
+        assert response.status_code == 409
+        assert response.get_json()['code'] == 'OUT_OF_STOCK'
+    
+    def test_patch_cart_batch(self, client, auth_headers):
+        """Teste de operações em lote aplicadas em uma requisição"""
+        first, second = client.get('/api/products').get_json()['products'][:2]
+        
+        response = client.patch('/api/cart', headers=auth_headers, json={'operations': [
+            {'op': 'add', 'product_id': first['id'], 'quantity': 2},
+            {'op': 'add', 'product_id': second['id']},
+            {'op': 'set', 'product_id': first['id'], 'quantity': 5},
+            {'op': 'remove', 'product_id': second['id']},
+        ]})
+        
+        assert response.status_code == 200
+        data = response.get_json()
+        assert [item['product_id'] for item in data['items']] == [first['id']]
+        assert data['total_items'] == 5
+        assert data['total_price_cents'] == 5 * first['price_cents']
+    
+    def test_patch_cart_atomic(self, client, auth_headers):
+        """Teste de lote com operação inválida: nada é aplicado"""
+        product = client.get('/api/products').get_json()['products'][0]
+        
+        response = client.patch('/api/cart', headers=auth_headers, json={'operations': [
+            {'op': 'add', 'product_id': product['id']},
+            {'op': 'add', 'product_id': 99999},
+        ]})
+        
+        assert response.status_code == 404
+        assert response.get_json()['index'] == 1
+        
+        cart = client.get('/api/cart', headers=auth_headers).get_json()
+        assert cart['total_items'] == 0
+    
+    def test_patch_cart_validation(self, client, auth_headers, app):
+        """Teste de validação do lote (formato e tamanho máximo)"""
+        response = client.patch('/api/cart', headers=auth_headers,
+                                json={'operations': [{'op': 'explode'}]})
+        assert response.status_code == 400
+        
+        operations = [{'op': 'clear'}] * (app.db.settings.CART_MAX_BATCH_OPERATIONS + 1)
+        response = client.patch('/api/cart', headers=auth_headers, json={'operations': operations})
+        assert response.status_code == 400
+    
+    def test_cart_counter(self, client, auth_headers, app):
+        """Teste do contador do carrinho mantido na mesma transação das escritas"""
+        first, second = client.get('/api/products').get_json()['products'][:2]
+        
+        client.post('/api/cart', headers=auth_headers, json={'product_id': first['id'], 'quantity': 2})
+        client.patch('/api/cart', headers=auth_headers, json={'operations': [
+            {'op': 'add', 'product_id': second['id'], 'quantity': 3},
+            {'op': 'set', 'product_id': first['id'], 'quantity': 1},
+        ]})
+        
+        count = client.get('/api/cart/count', headers=auth_headers).get_json()
+        
+        assert count['total_items'] == 4
+        assert count['total_price_cents'] == first['price_cents'] + 3 * second['price_cents']
+        
+        cart = client.get('/api/cart', headers=auth_headers).get_json()
+        assert count['total_items'] == cart['total_items']
+        assert count['total_price_cents'] == cart['total_price_cents']
+        
+        # A remoção devolve o contador lido na mesma transação
+        item = next(i for i in cart['items'] if i['product_id'] == second['id'])
+        response = client.delete(f"/api/cart/{item['id']}", headers=auth_headers)
+        assert response.get_json()['cart_total_items'] == 1
+        assert response.get_json()['cart_total_price_cents'] == first['price_cents']
+        
+        client.delete('/api/cart/clear', headers=auth_headers)
+        assert client.get('/api/cart/count', headers=auth_headers).get_json()['total_items'] == 0
+    
+    def test_cart_counter_reprice(self, client, auth_headers, app):
+        """Teste de total do contador corrigido quando o preço do produto muda"""
+        product = client.get('/api/products').get_json()['products'][0]
+        client.post('/api/cart', headers=auth_headers, json={'product_id': product['id'], 'quantity': 2})
+        
+        with app.db.get_connection() as conn:
+            cursor = app.db.get_cursor(conn)
+            cursor.execute('UPDATE products SET price_cents = price_cents + 100 WHERE id = ?', (product['id'],))
+            conn.commit()
+        
+        count = client.get('/api/cart/count', headers=auth_headers).get_json()
+        assert count['total_price_cents'] == 2 * (product['price_cents'] + 100)
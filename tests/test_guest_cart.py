@@ -0,0 +1,78 @@
+import pytest
+from utils.guest_cart import GuestCart
+
+class TestGuestCart:
+    """Testes para o carrinho de visitante em cookie assinado"""
+
+    def test_guest_cart_cookie(self, client, app):
+        """Teste de carrinho de visitante sem login e sem escrita no banco"""
+        first, second = client.get('/api/products').get_json()['products'][:2]
+
+        response = client.patch('/api/cart/guest', json={'operations': [
+            {'op': 'add', 'product_id': first['id'], 'quantity': 2},
+            {'op': 'add', 'product_id': second['id']},
+        ]})
+
+        assert response.status_code == 200
+        assert response.get_json()['total_items'] == 3
+        assert 'HttpOnly' in response.headers['Set-Cookie']
+
+        data = client.get('/api/cart/guest').get_json()
+        assert data['total_items'] == 3
+        assert data['total_price_cents'] == 2 * first['price_cents'] + second['price_cents']
+
+    def test_guest_cart_tampered_cookie(self, client, app):
+        """Teste de cookie adulterado tratado como carrinho vazio"""
+        cookie = GuestCart(app.db.settings).dump({1: 2})
+        client.set_cookie(app.db.settings.GUEST_CART_COOKIE_NAME, cookie[:-2] + 'xx', path='/api')
+
+        data = client.get('/api/cart/guest').get_json()
+        assert data['total_items'] == 0
+
+    def test_guest_cart_unknown_product(self, client):
+        """Teste de produto inexistente no carrinho de visitante"""
+        response = client.patch('/api/cart/guest',
+                                json={'operations': [{'op': 'add', 'product_id': 99999}]})
+
+        assert response.status_code == 404
+        assert 'Set-Cookie' not in response.headers
+
+    def test_guest_cart_merged_on_register(self, client):
+        """Teste de carrinho de visitante incorporado ao carrinho no cadastro"""
+        product = client.get('/api/products').get_json()['products'][0]
+        client.patch('/api/cart/guest', json={'operations': [
+            {'op': 'add', 'product_id': product['id'], 'quantity': 2}
+        ]})
+
+        response = client.post('/api/auth/register', json={
+            'name': 'Visitante Convertido',
+            'email': 'visitante@exemplo.com',
+            'password': 'MinhaSenh@123'
+        })
+
+        assert response.status_code == 201
+        data = response.get_json()
+        assert data['cart_merged_items'] == 1
+
+        headers = {'Authorization': f"Bearer {data['tokens']['access_token']}"}
+        cart = client.get('/api/cart', headers=headers).get_json()
+        assert cart['total_items'] == 2
+        assert client.get('/api/cart/guest').get_json()['total_items'] == 0
+
+    def test_guest_cart_merge_capped_at_stock(self, client, app, auth_headers):
+        """Teste de soma do carrinho existente com o de visitante limitada ao estoque"""
+        product = client.get('/api/products/1').get_json()
+        stock = product['stock_quantity']
+        client.post('/api/cart', headers=auth_headers, json={'product_id': 1, 'quantity': stock - 1})
+
+        cookie = GuestCart(app.db.settings).dump({1: 5})
+        client.set_cookie(app.db.settings.GUEST_CART_COOKIE_NAME, cookie, path='/api')
+
+        response = client.post('/api/auth/login', json={
+            'email': 'teste@exemplo.com',
+            'password': 'MinhaSenh@123'
+        })
+        assert response.status_code == 200
+
+        cart = client.get('/api/cart', headers=auth_headers).get_json()
+        assert cart['items'][0]['quantity'] == stock
@@ -0,0 +1,93 @@
+import io
+import pytest
+from utils.fields import parse_fields, PRODUCT_LIST_FIELDS
+from utils.images import ImageStore, image_metadata, image_filename, with_image
+
+IMAGE_HASH = 'a' * 32
+
+class TestProductImages:
+    """Testes para os derivados de imagens de produtos"""
+
+    def test_image_metadata_srcset(self):
+        """Teste de srcset sem ampliar imagens menores que os derivados"""
+        image = image_metadata(IMAGE_HASH, 300, '/api/media/products')
+
+        assert image['src'] == f'/api/media/products/{IMAGE_HASH}-card.jpg'
+        assert image['width'] == 300
+        assert image['srcset']['webp'] == (
+            f'/api/media/products/{IMAGE_HASH}-thumb.webp 160w, '
+            f'/api/media/products/{IMAGE_HASH}-card.webp 300w'
+        )
+
+    def test_with_image(self):
+        """Teste de serialização do objeto image a partir do hash"""
+        product = with_image({'id': 1, 'image_hash': IMAGE_HASH, 'image_width': 2000}, '/api/media/products')
+
+        assert 'image_hash' not in product
+        assert product['image']['srcset']['jpeg'].endswith('detail.jpg 1200w')
+
+        assert 'image' not in with_image({'id': 2, 'image_hash': None, 'image_width': None}, '/api/media/products')
+
+    def test_fields_image_alias(self):
+        """Teste de ?fields=image trazendo também a largura original"""
+        assert parse_fields('id,image', PRODUCT_LIST_FIELDS) == ['id', 'image_hash', 'image_width']
+
+    def test_product_with_image(self, client, app):
+        """Teste de produto com imagem associada na resposta da API"""
+        product_id = client.get('/api/products').get_json()['products'][0]['id']
+
+        result = app.db.set_product_image(product_id, IMAGE_HASH, 800)
+        assert result['success'] is True
+
+        data = client.get(f'/api/products/{product_id}').get_json()
+        assert data['image']['width'] == 480
+        assert IMAGE_HASH in data['image']['src']
+
+    def test_media_immutable(self, client, app, tmp_path, monkeypatch):
+        """Teste de derivado servido com cache imutável"""
+        monkeypatch.setattr(app.db.settings, 'IMAGE_STORAGE_DIR', str(tmp_path))
+        filename = image_filename(IMAGE_HASH, 'thumb', 'webp')
+        (tmp_path / filename).write_bytes(b'RIFF....WEBP')
+
+        response = client.get(f'/api/media/products/{filename}')
+
+        assert response.status_code == 200
+        assert response.data == b'RIFF....WEBP'
+        assert 'immutable' in response.headers['Cache-Control']
+
+        assert client.get('/api/media/products/../config.py').status_code == 404
+        assert client.get(f'/api/media/products/{IMAGE_HASH}-huge.webp').status_code == 404
+
+    def test_save_upload(self, app, tmp_path, monkeypatch):
+        """Teste de geração dos derivados endereçados pelo conteúdo"""
+        Image = pytest.importorskip('PIL.Image')
+        monkeypatch.setattr(app.db.settings, 'IMAGE_STORAGE_DIR', str(tmp_path))
+
+        original = io.BytesIO()
+        Image.new('RGB', (640, 320), 'navy').save(original, 'PNG')
+
+        store = ImageStore(app.db.settings)
+        result = store.save_upload(io.BytesIO(original.getvalue()))
+
+        assert result['image_width'] == 640
+        assert (tmp_path / image_filename(result['image_hash'], 'card', 'webp')).exists()
+        with Image.open(tmp_path / image_filename(result['image_hash'], 'detail', 'jpg')) as detail:
+            assert detail.size == (640, 320)
+
+        # Mesmo conteúdo, mesmo nome
+        again = store.save_upload(io.BytesIO(original.getvalue()))
+        assert again['image_hash'] == result['image_hash']
+
+    def test_save_upload_tall_image(self, app, tmp_path, monkeypatch):
+        """Teste de derivados com a largura anunciada no srcset em imagens muito altas"""
+        Image = pytest.importorskip('PIL.Image')
+        monkeypatch.setattr(app.db.settings, 'IMAGE_STORAGE_DIR', str(tmp_path))
+
+        original = io.BytesIO()
+        Image.new('RGB', (1000, 6000), 'navy').save(original, 'PNG')
+
+        result = ImageStore(app.db.settings).save_upload(io.BytesIO(original.getvalue()))
+
+        for name, width in (('thumb', 160), ('card', 480), ('detail', 1000)):
+            with Image.open(tmp_path / image_filename(result['image_hash'], name, 'webp')) as derivative:
+                assert derivative.size == (width, width * 6)
@@ -0,0 +1,105 @@
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+
+def get_stock(app, product_id):
+    with app.db.get_connection() as conn:
+        cursor = app.db.get_cursor(conn)
+        cursor.execute('SELECT stock_quantity FROM products WHERE id = ?', (product_id,))
+        return cursor.fetchone()['stock_quantity']
+
+class TestInventory:
+    """Testes para reservas de estoque"""
+    
+    def test_reserve_and_release(self, app, client, auth_headers):
+        """Teste de reserva abatendo e devolvendo estoque"""
+        stock = get_stock(app, 1)
+        
+        response = client.post('/api/inventory/reservations', headers=auth_headers,
+                               json={'product_id': 1, 'quantity': 2})
+        
+        assert response.status_code == 201
+        reservation_id = response.get_json()['reservation_id']
+        assert get_stock(app, 1) == stock - 2
+        
+        response = client.delete(f'/api/inventory/reservations/{reservation_id}', headers=auth_headers)
+        assert response.status_code == 200
+        assert get_stock(app, 1) == stock
+        
+        # Liberar de novo não devolve estoque duas vezes
+        response = client.delete(f'/api/inventory/reservations/{reservation_id}', headers=auth_headers)
+        assert response.status_code == 404
+        assert get_stock(app, 1) == stock
+    
+    def test_reserve_out_of_stock(self, app, client, auth_headers):
+        """Teste de reserva acima do estoque disponível"""
+        stock = get_stock(app, 1)
+        
+        response = client.post('/api/inventory/reservations', headers=auth_headers,
+                               json={'product_id': 1, 'quantity': stock + 1})
+        
+        assert response.status_code == 409
+        assert get_stock(app, 1) == stock
+    
+    def test_expired_reservations_return_stock(self, app):
+        """Teste de devolução de reservas vencidas"""
+        stock = get_stock(app, 2)
+        
+        result = app.db.inventory.reserve(2, 3, ttl=-1)
+        assert result['success']
+        assert get_stock(app, 2) == stock - 3
+        
+        assert app.db.inventory.release_expired() == 1
+        assert get_stock(app, 2) == stock
+    
+    def test_concurrent_reservations(self, app):
+        """Teste de compradores concorrentes disputando o último estoque"""
+        stock = get_stock(app, 4)
+        
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            results = list(executor.map(lambda _: app.db.inventory.reserve(4, 1), range(stock * 4)))
+        
+        assert sum(1 for r in results if r['success']) == stock
+        assert get_stock(app, 4) == 0
+    
+    def test_add_to_cart_checks_stock(self, app, client, auth_headers):
+        """Teste de carrinho recusando quantidade acima do estoque"""
+        response = client.post('/api/cart', headers=auth_headers,
+                               json={'product_id': 1, 'quantity': get_stock(app, 1) + 1})
+        
+        assert response.status_code == 409
+    
+    def test_add_to_cart_checks_resulting_quantity(self, app, client, auth_headers):
+        """Teste de adições sucessivas recusadas quando a soma passa do estoque"""
+        stock = get_stock(app, 1)
+        
+        for _ in range(stock):
+            response = client.post('/api/cart', headers=auth_headers, json={'product_id': 1, 'quantity': 1})
+            assert response.status_code == 200
+        
+        response = client.post('/api/cart', headers=auth_headers, json={'product_id': 1, 'quantity': 1})
+        assert response.status_code == 409
+        
+        cart = client.get('/api/cart', headers=auth_headers).get_json()
+        assert cart['items'][0]['quantity'] == stock
+    
+    def test_sold_out_changes_etag(self, app, client):
+        """Teste de ETag do produto mudando quando o estoque esgota e volta"""
+        stock = get_stock(app, 3)
+        etag = client.get('/api/products/3').headers['ETag']
+        
+        # Reserva parcial não muda a disponibilidade nem a versão do catálogo
+        partial = app.db.inventory.reserve(3, 1)
+        app.db.catalog_cache.invalidate()
+        assert client.get('/api/products/3', headers={'If-None-Match': etag}).status_code == 304
+        
+        sold_out = app.db.inventory.reserve(3, stock - 1)
+        assert get_stock(app, 3) == 0
+        app.db.catalog_cache.invalidate()
+        response = client.get('/api/products/3', headers={'If-None-Match': etag})
+        assert response.status_code == 200
+        
+        app.db.inventory.release(sold_out['reservation_id'])
+        app.db.catalog_cache.invalidate()
+        response = client.get('/api/products/3', headers={'If-None-Match': response.headers['ETag']})
+        assert response.status_code == 200
+        app.db.inventory.release(partial['reservation_id'])
@@ -0,0 +1,36 @@
+import pytest
+from utils.migrations import MigrationRunner, MigrationError
+
+class TestMigrations:
+    """Testes para o runner de migrações"""
+    
+    def test_database_at_head(self, app):
+        """Teste de banco na versão mais recente após inicialização"""
+        runner = MigrationRunner(app.db)
+        
+        assert runner.is_at_head()
+        assert runner.status()['current'] == runner.head
+    
+    def test_upgrade_is_idempotent(self, app):
+        """Teste de upgrade sem migrações pendentes"""
+        runner = MigrationRunner(app.db)
+        
+        assert runner.upgrade() == []
+    
+    def test_checksum_mismatch(self, app):
+        """Teste de detecção de migração alterada após aplicada"""
+        with app.db.get_connection() as conn:
+            conn.execute("UPDATE schema_version SET checksum = 'alterado' WHERE version = 1")
+            conn.commit()
+        
+        with pytest.raises(MigrationError):
+            MigrationRunner(app.db).status()
+    
+    def test_featured_listing_index(self, app):
+        """Teste de índice parcial usado na listagem de destaques (sem ordenação extra)"""
+        with app.db.get_connection() as conn:
+            sql = app.db.queries.sql('products.featured', ['id'])
+            plan = ' '.join(row[3] for row in conn.execute(f'EXPLAIN QUERY PLAN {sql}', (8,)))
+        
+        assert 'idx_products_featured_listing' in plan
+        assert 'TEMP B-TREE' not in plan
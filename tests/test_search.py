@@ -0,0 +1,49 @@
+import io
+import pytest
+from utils.product_import import ProductImporter
+
+class TestSearch:
+    """Testes para a busca textual de produtos"""
+    
+    def test_search_products(self, client):
+        """Teste de busca com destaque do termo"""
+        response = client.get('/api/products/search?q=apache')
+        
+        assert response.status_code == 200
+        data = response.get_json()
+        
+        assert data['total'] >= 1
+        assert data['products'][0]['name'] == 'Apache AH-64 Helicopter'
+        assert '<mark>Apache</mark>' in data['products'][0]['highlight']['name']
+    
+    def test_search_prefix_and_accents(self, client):
+        """Teste de busca por prefixo e sem acentos"""
+        response = client.get('/api/products/search?q=helicop')
+        
+        assert response.status_code == 200
+        assert response.get_json()['total'] >= 1
+    
+    def test_search_escapes_html(self, app, client):
+        """Teste de escape do conteúdo destacado"""
+        catalog = 'sku,name,price\nXSS-1,Benchy <b>ousado</b>,9.90\n'
+        ProductImporter(app.db).run(io.StringIO(catalog), 'csv')
+        
+        data = client.get('/api/products/search?q=ousado').get_json()
+        
+        assert data['total'] == 1
+        assert '&lt;b&gt;<mark>ousado</mark>&lt;/b&gt;' in data['products'][0]['highlight']['name']
+    
+    def test_search_pagination(self, client):
+        """Teste de paginação da busca"""
+        first = client.get('/api/products/search?q=detalhes&limit=1').get_json()
+        second = client.get('/api/products/search?q=detalhes&limit=1&page=2').get_json()
+        
+        assert first['has_more'] is True
+        assert second['page'] == 2
+        assert first['products'][0]['id'] != second['products'][0]['id']
+    
+    def test_search_requires_query(self, client):
+        """Teste de busca sem termos"""
+        for url in ('/api/products/search', '/api/products/search?q=%22%2A%28'):
+            response = client.get(url)
+            assert response.status_code == 400
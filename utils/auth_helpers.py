@@ -65,6 +65,17 @@ def require_auth(f):
 def get_current_user():
     return getattr(g, 'current_user', None)
 
+def require_admin(f):
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        current_user = get_current_user()
+        if not current_user or not current_user.get('is_admin'):
+            return jsonify({'error': 'Acesso restrito a administradores'}), 403
+        
+        return f(*args, **kwargs)
+    
+    return require_auth(decorated_function)
+
 def hash_password(password):
     salt = secrets.token_hex(16)
     pwdhash = hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt.encode('utf-8'), 100000)
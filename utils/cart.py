@@ -0,0 +1,69 @@
+"""
+Operações em lote no carrinho
+
+``PATCH /api/cart`` recebe uma lista de operações que são validadas aqui,
+antes de abrir a transação, e depois aplicadas todas ou nenhuma por
+``DatabaseManager.apply_cart_operations``.
+
+O contador do carrinho (badge do cabeçalho) vem da tabela ``cart_counters``,
+mantida por gatilhos (migração 0013) na mesma transação das escritas: uma
+leitura por chave primária, sempre atual para todos os workers.
+
+Formato::
+
+    {"operations": [
+        {"op": "set", "product_id": 1, "quantity": 3},
+        {"op": "add", "product_id": 2, "quantity": 1},
+        {"op": "remove", "product_id": 3},
+        {"op": "clear"}
+    ]}
+"""
+
+from typing import Any, List, NamedTuple, Optional
+from utils.validators import ValidationError
+
+OPERATIONS = ('set', 'add', 'remove', 'clear')
+
+class CartOperation(NamedTuple):
+    op: str
+    product_id: Optional[int] = None
+    quantity: Optional[int] = None
+
+def _parse_int(value: Any, name: str, index: int) -> int:
+    if isinstance(value, bool):
+        raise ValidationError(f"operations[{index}].{name} deve ser um número inteiro")
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValidationError(f"operations[{index}].{name} deve ser um número inteiro")
+
+def parse_operations(data: Any, maximum: int) -> List[CartOperation]:
+    """Validar o corpo de ``PATCH /api/cart`` (até ``maximum`` operações)"""
+    operations = data.get('operations') if isinstance(data, dict) else None
+    if not isinstance(operations, list) or not operations:
+        raise ValidationError("operations deve ser uma lista não vazia")
+    if len(operations) > maximum:
+        raise ValidationError(f"Máximo de {maximum} operações por requisição")
+
+    parsed = []
+    for index, operation in enumerate(operations):
+        op = operation.get('op') if isinstance(operation, dict) else None
+        if op not in OPERATIONS:
+            raise ValidationError(f"operations[{index}].op deve ser um de: {', '.join(OPERATIONS)}")
+
+        if op == 'clear':
+            parsed.append(CartOperation(op))
+            continue
+
+        product_id = _parse_int(operation.get('product_id'), 'product_id', index)
+        if op == 'remove':
+            parsed.append(CartOperation(op, product_id))
+            continue
+
+        quantity = _parse_int(operation.get('quantity', 1), 'quantity', index)
+        # set com quantidade 0 remove o item; add precisa somar algo
+        if quantity < 0 or (op == 'add' and quantity == 0):
+            raise ValidationError(f"operations[{index}].quantity inválida")
+        parsed.append(CartOperation(op, product_id, quantity))
+
+    return parsed
@@ -0,0 +1,130 @@
+"""
+Cache do catálogo de produtos em memória (um por worker)
+
+Cada entrada guarda a versão do catálogo em que foi calculada e expira pelo
+TTL. A versão atual é lida de ``catalog_meta`` no máximo uma vez por
+``CATALOG_VERSION_CHECK_INTERVAL`` segundos; qualquer escrita em produtos
+incrementa essa versão (gatilhos da migração 0005) e invalida as entradas
+antigas em todos os workers.
+
+Corpos de resposta HTTP ficam em uma região própria (``region='responses'``)
+com limite separado: URLs inventadas pelo cliente só disputam espaço entre
+si e não expulsam os dados do catálogo.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+class CatalogCache:
+    """Cache LRU limitado com TTL e invalidação por versão"""
+
+    def __init__(self, db, max_entries: int = 512, ttl: float = 60.0,
+                 version_check_interval: float = 1.0, enabled: bool = True,
+                 response_max_entries: int = 256):
+        self.db = db
+        self.max_entries = max_entries
+        self.response_max_entries = response_max_entries
+        self.ttl = ttl
+        self.version_check_interval = version_check_interval
+        self.enabled = enabled
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._responses: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._version: Optional[int] = None
+        self._updated_at = None
+        self._version_checked_at = 0.0
+        self._version_lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'version_checks': 0}
+
+    def current_version(self) -> Optional[int]:
+        """Versão do catálogo, consultada no banco no máximo uma vez por intervalo"""
+        now = time.monotonic()
+        if self._version is not None and now - self._version_checked_at < self.version_check_interval:
+            return self._version
+
+        # Apenas uma thread consulta; as outras usam o valor anterior
+        if not self._version_lock.acquire(blocking=self._version is None):
+            return self._version
+
+        try:
+            if self._version is None or time.monotonic() - self._version_checked_at >= self.version_check_interval:
+                meta = self.db.get_catalog_meta()
+                self._version = meta['version'] if meta else None
+                self._updated_at = meta['updated_at'] if meta else None
+                self._version_checked_at = time.monotonic()
+                self.stats['version_checks'] += 1
+        finally:
+            self._version_lock.release()
+
+        return self._version
+
+    def last_modified(self):
+        """Data da última alteração do catálogo (da mesma leitura da versão)"""
+        self.current_version()
+        return self._updated_at
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any],
+                    cacheable: Optional[Callable[[Any], bool]] = None, region: str = 'data') -> Any:
+        """Valor em cache para a versão atual ou resultado de ``loader()``
+
+        ``cacheable`` decide se o resultado carregado pode ser guardado
+        (ex.: não guardar respostas de erro). ``region`` escolhe o LRU:
+        ``'data'`` (catálogo) ou ``'responses'`` (corpos HTTP).
+        """
+        if not self.enabled:
+            return loader()
+
+        if region == 'responses':
+            entries, max_entries = self._responses, self.response_max_entries
+        else:
+            entries, max_entries = self._entries, self.max_entries
+
+        version = self.current_version()
+        now = time.monotonic()
+
+        with self._lock:
+            entry = entries.get(key)
+            if entry is not None:
+                entry_version, expires_at, value = entry
+                if entry_version == version and expires_at > now:
+                    entries.move_to_end(key)
+                    self.stats['hits'] += 1
+                    return value
+                del entries[key]
+            self.stats['misses'] += 1
+
+        value = loader()
+
+        # Versão desconhecida (tabela ausente/erro): não arriscar servir dado antigo
+        if version is None or (cacheable is not None and not cacheable(value)):
+            return value
+
+        with self._lock:
+            entries[key] = (version, now + self.ttl, value)
+            entries.move_to_end(key)
+            while len(entries) > max_entries:
+                entries.popitem(last=False)
+                self.stats['evictions'] += 1
+
+        return value
+
+    def invalidate(self):
+        """Descartar tudo e forçar nova leitura da versão (após escrita local)"""
+        with self._lock:
+            self._entries.clear()
+            self._responses.clear()
+        self._version_checked_at = 0.0
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.stats['hits'] + self.stats['misses']
+        return {
+            **self.stats,
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'response_entries': len(self._responses),
+            'response_max_entries': self.response_max_entries,
+            'version': self._version,
+            'hit_ratio': round(self.stats['hits'] / lookups, 4) if lookups else None
+        }
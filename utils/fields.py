@@ -0,0 +1,59 @@
+"""
+Projeção de campos (sparse fieldsets) dos endpoints de produtos
+
+``?fields=id,name,price`` é validado contra uma lista fixa de colunas e levado
+até o SELECT, reduzindo tanto a leitura no banco quanto o JSON da resposta.
+``price`` é o nome público de ``price_cents`` (ver utils/money.py);
+``image_hash``/``image_width`` viram o objeto ``image`` na resposta.
+"""
+
+from typing import Dict, Any, Iterable, List, Optional
+from utils.validators import ValidationError
+
+# Colunas expostas pela API, na ordem canônica usada no SELECT
+PRODUCT_FIELDS = (
+    'id', 'sku', 'name', 'description', 'price_cents', 'category', 'image_url',
+    'image_hash', 'image_width', 'is_featured', 'is_active', 'stock_quantity', 'created_at', 'updated_at',
+)
+
+# Projeção padrão das listagens (sem a descrição longa)
+PRODUCT_LIST_FIELDS = ('id', 'name', 'price_cents', 'category', 'image_url', 'image_hash', 'image_width',
+                       'is_featured', 'stock_quantity')
+
+# Nomes aceitos em ?fields= que correspondem a outra coluna
+FIELD_ALIASES = {'price': 'price_cents', 'image': 'image_hash'}
+
+# Colunas que só fazem sentido juntas (o srcset precisa da largura original)
+FIELD_COMPANIONS = {'image_hash': ('image_width',)}
+
+# Colunas necessárias para montar o cursor da paginação keyset
+KEYSET_FIELDS = ('id', 'created_at')
+
+def parse_fields(value: Optional[str], default: Iterable[str], allowed: Iterable[str] = PRODUCT_FIELDS) -> List[str]:
+    """Validar ``?fields=`` e retornar as colunas na ordem canônica"""
+    allowed = tuple(allowed)
+
+    if value is None or not value.strip():
+        requested = set(default)
+    elif value.strip() == '*':
+        requested = set(allowed)
+    else:
+        requested = {FIELD_ALIASES.get(field.strip(), field.strip()) for field in value.split(',') if field.strip()}
+        unknown = requested - set(allowed)
+        if unknown:
+            raise ValidationError(f"Campos inválidos: {', '.join(sorted(unknown))}")
+
+    for field, companions in FIELD_COMPANIONS.items():
+        if field in requested:
+            requested.update(companions)
+
+    return [field for field in allowed if field in requested]
+
+def with_fields(fields: Iterable[str], extra: Iterable[str], allowed: Iterable[str] = PRODUCT_FIELDS) -> List[str]:
+    """Acrescentar colunas internas (ex.: do cursor) mantendo a ordem canônica"""
+    wanted = set(fields) | set(extra)
+    return [field for field in allowed if field in wanted]
+
+def project(row: Dict[str, Any], fields: Iterable[str]) -> Dict[str, Any]:
+    """Manter apenas os campos pedidos pelo cliente"""
+    return {field: row[field] for field in fields if field in row}
@@ -0,0 +1,135 @@
+"""
+GET condicional (ETag / 304) para endpoints do catálogo
+
+O ETag é forte e derivado da versão do catálogo e da URL completa (rota +
+query string): enquanto a versão não muda, a mesma URL produz o mesmo corpo.
+Se o cliente já tem essa versão (``If-None-Match``) ou nada mudou desde
+``If-Modified-Since``, a resposta 304 sai antes de consultar o banco.
+
+Sem versão conhecida (tabela ``catalog_meta`` ausente), o ETag é o hash do
+corpo gerado e o 304 é decidido depois da view.
+
+``cached_response`` guarda o corpo final já serializado (e comprimido com
+gzip quando o cliente aceita) na região de respostas do cache do catálogo,
+por rota, parâmetros (em ordem canônica) e codificação; requisições repetidas
+não passam por consulta, ``jsonify`` nem compressão.
+"""
+
+import gzip
+import hashlib
+from datetime import datetime, timezone
+from functools import wraps
+from typing import NamedTuple, Optional
+from flask import request, make_response
+from werkzeug.http import is_resource_modified
+from werkzeug.local import LocalProxy
+from utils.database import get_db
+
+db = LocalProxy(get_db)
+
+def _as_http_date(value):
+    """Converter ``catalog_meta.updated_at`` (datetime ou texto do SQLite) para UTC"""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).replace(microsecond=0)
+
+class CachedBody(NamedTuple):
+    body: bytes
+    content_type: str
+    content_encoding: Optional[str]
+
+def negotiated_encoding() -> str:
+    """Codificação da resposta conforme ``Accept-Encoding`` e configuração"""
+    if db.settings.HTTP_GZIP_ENABLED and request.accept_encodings['gzip']:
+        return 'gzip'
+    return 'identity'
+
+def catalog_etag(version) -> str:
+    """ETag da URL atual para a versão informada do catálogo
+
+    Inclui a codificação negociada: corpos gzip e sem compressão são
+    representações diferentes e não podem compartilhar um ETag forte.
+    """
+    key = f'{version}:{negotiated_encoding()}:{request.full_path}'.encode('utf-8')
+    return hashlib.sha256(key).hexdigest()[:32]
+
+def _apply_cache_headers(response, etag, last_modified, max_age, stale_while_revalidate):
+    if etag:
+        response.set_etag(etag)
+    else:
+        response.add_etag()
+    if last_modified:
+        response.last_modified = last_modified
+    response.cache_control.public = True
+    response.cache_control.max_age = max_age
+    response.cache_control.stale_while_revalidate = stale_while_revalidate
+    response.vary.add('Accept-Encoding')
+    return response
+
+def conditional_get(f):
+    """Responder 304 quando o cliente já tem a versão atual do catálogo"""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        settings = db.settings
+        max_age = settings.HTTP_CACHE_MAX_AGE
+        stale_while_revalidate = settings.HTTP_CACHE_STALE_WHILE_REVALIDATE
+
+        version = db.catalog_cache.current_version()
+        last_modified = _as_http_date(db.catalog_cache.last_modified())
+        etag = catalog_etag(version) if version is not None else None
+
+        if etag and not is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+            response = make_response('', 304)
+            return _apply_cache_headers(response, etag, last_modified, max_age, stale_while_revalidate)
+
+        response = make_response(f(*args, **kwargs))
+        if response.status_code != 200:
+            return response
+
+        _apply_cache_headers(response, etag, last_modified, max_age, stale_while_revalidate)
+        return response.make_conditional(request)
+
+    return decorated_function
+
+def cached_response(f):
+    """Servir o corpo já serializado do cache do catálogo (apenas respostas 200)"""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        settings = db.settings
+        encoding = negotiated_encoding()
+
+        def render():
+            response = make_response(f(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+
+            body = response.get_data()
+            content_encoding = None
+            if encoding == 'gzip' and len(body) >= settings.HTTP_GZIP_MIN_SIZE:
+                body = gzip.compress(body, compresslevel=settings.HTTP_GZIP_LEVEL)
+                content_encoding = 'gzip'
+            return CachedBody(body, response.content_type, content_encoding)
+
+        # ?b=1&a=2 e ?a=2&b=1 produzem o mesmo corpo
+        params = tuple(sorted(request.args.items(multi=True)))
+        cached = db.catalog_cache.get_or_load(
+            (request.path, params, encoding),
+            render,
+            cacheable=lambda value: isinstance(value, CachedBody),
+            region='responses'
+        )
+        if not isinstance(cached, CachedBody):
+            return cached
+
+        response = make_response(cached.body)
+        response.content_type = cached.content_type
+        if cached.content_encoding:
+            response.content_encoding = cached.content_encoding
+        response.vary.add('Accept-Encoding')
+        return response
+
+    return decorated_function
@@ -0,0 +1,152 @@
+"""
+Derivados de imagens de produtos
+
+A imagem original enviada pelo admin gera versões redimensionadas
+(``DERIVATIVES``) em WebP e JPEG. Os arquivos são nomeados pelo hash do
+conteúdo original (mais a versão do pipeline), então um nome nunca muda de
+conteúdo: podem ser servidos com ``Cache-Control: immutable`` e reenviar a
+mesma imagem não gera trabalho nem arquivos novos.
+
+Pillow está em requirements.txt; se faltar no ambiente, a API continua
+servindo os derivados já gerados, mas novos uploads retornam erro (503).
+"""
+
+import hashlib
+import io
+import os
+import tempfile
+from typing import Any, Dict, IO, Optional
+from utils.validators import ValidationError
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # pragma: no cover - depende do ambiente
+    Image = None
+    ImageOps = None
+
+# Nome do derivado -> largura máxima em pixels
+DERIVATIVES = {'thumb': 160, 'card': 480, 'detail': 1200}
+
+FORMATS = {'webp': 'WEBP', 'jpg': 'JPEG'}
+
+# Alterar quando o processamento mudar (gera nomes novos, sem servir cache antigo)
+PIPELINE_VERSION = 'v1'
+
+HASH_LENGTH = 32
+
+class ImageProcessingError(Exception):
+    pass
+
+def image_filename(image_hash: str, variant: str, ext: str) -> str:
+    return f'{image_hash}-{variant}.{ext}'
+
+def variant_widths(image_width: Optional[int]) -> Dict[str, int]:
+    """Largura real de cada derivado (sem ampliar imagens pequenas)"""
+    if not image_width:
+        return dict(DERIVATIVES)
+    return {name: min(width, image_width) for name, width in DERIVATIVES.items()}
+
+def image_metadata(image_hash: str, image_width: Optional[int], base_url: str) -> Dict[str, Any]:
+    """Dados de ``<img>``/``<picture>`` do produto: src, srcset por formato e sizes"""
+    widths = variant_widths(image_width)
+
+    def srcset(ext):
+        seen, parts = set(), []
+        for name, width in widths.items():
+            if width in seen:
+                continue
+            seen.add(width)
+            parts.append(f'{base_url}/{image_filename(image_hash, name, ext)} {width}w')
+        return ', '.join(parts)
+
+    return {
+        'src': f"{base_url}/{image_filename(image_hash, 'card', 'jpg')}",
+        'srcset': {'webp': srcset('webp'), 'jpeg': srcset('jpg')},
+        'sizes': '(max-width: 600px) 100vw, 480px',
+        'width': widths['card'],
+    }
+
+def with_image(product: Dict[str, Any], base_url: str) -> Dict[str, Any]:
+    """Trocar ``image_hash``/``image_width`` do produto serializado pelo objeto ``image``"""
+    image_hash = product.pop('image_hash', None)
+    image_width = product.pop('image_width', None)
+    if image_hash:
+        product['image'] = image_metadata(image_hash, image_width, base_url)
+    return product
+
+class ImageStore:
+    """Gera e guarda derivados em disco, endereçados pelo conteúdo"""
+
+    def __init__(self, settings):
+        self.settings = settings
+        self.root = settings.IMAGE_STORAGE_DIR
+
+    def _write_atomic(self, path: str, data: bytes):
+        # Escrever em arquivo temporário e renomear: nunca servir arquivo pela metade
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as tmp:
+                tmp.write(data)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def _read_upload(self, stream: IO[bytes]) -> bytes:
+        limit = self.settings.IMAGE_MAX_UPLOAD_BYTES
+        data = stream.read(limit + 1)
+        if not data:
+            raise ValidationError("Arquivo de imagem vazio")
+        if len(data) > limit:
+            raise ValidationError(f"Imagem deve ter no máximo {limit // (1024 * 1024)} MB")
+        return data
+
+    def save_upload(self, stream: IO[bytes]) -> Dict[str, Any]:
+        """Processar imagem original e retornar ``{'image_hash', 'image_width'}``"""
+        if Image is None:
+            raise ImageProcessingError("Pillow não está instalado")
+
+        data = self._read_upload(stream)
+        digest = hashlib.sha256(PIPELINE_VERSION.encode('ascii') + data).hexdigest()[:HASH_LENGTH]
+
+        Image.MAX_IMAGE_PIXELS = self.settings.IMAGE_MAX_PIXELS
+        try:
+            with Image.open(io.BytesIO(data)) as master:
+                master.load()
+                # Respeitar a orientação EXIF das fotos de celular
+                master = ImageOps.exif_transpose(master)
+        except (Image.DecompressionBombError, OSError, SyntaxError):
+            raise ValidationError("Arquivo não é uma imagem válida")
+
+        # WebP/JPEG aceitam só RGB(A); CMYK, paleta etc. são convertidos uma vez
+        if master.mode not in ('RGB', 'RGBA'):
+            has_alpha = 'A' in master.mode or 'transparency' in master.info
+            master = master.convert('RGBA' if has_alpha else 'RGB')
+
+        os.makedirs(self.root, exist_ok=True)
+        widths = variant_widths(master.width)
+
+        for name, width in widths.items():
+            # Conteúdo endereçado: se já existe, é idêntico
+            if all(os.path.exists(os.path.join(self.root, image_filename(digest, name, ext))) for ext in FORMATS):
+                continue
+
+            # Só a largura é limitada (srcset anuncia larguras), mesmo em imagens muito altas
+            if width < master.width:
+                height = max(1, round(master.height * width / master.width))
+                resized = master.resize((width, height), Image.LANCZOS)
+            else:
+                resized = master.copy()
+
+            for ext, fmt in FORMATS.items():
+                buffer = io.BytesIO()
+                if fmt == 'JPEG':
+                    resized.convert('RGB').save(buffer, fmt, quality=self.settings.IMAGE_JPEG_QUALITY,
+                                                optimize=True, progressive=True)
+                else:
+                    resized.save(buffer, fmt, quality=self.settings.IMAGE_WEBP_QUALITY, method=4)
+                self._write_atomic(os.path.join(self.root, image_filename(digest, name, ext)), buffer.getvalue())
+
+        print(f"🖼️  Imagem processada: {digest} ({master.width}x{master.height})")
+        return {'image_hash': digest, 'image_width': master.width}
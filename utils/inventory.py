@@ -0,0 +1,185 @@
+"""
+Reserva atômica de estoque
+
+A reserva abate ``products.stock_quantity`` com um UPDATE condicional
+(``... WHERE stock_quantity >= n``): o próprio banco decide quem leva a última
+unidade, sem SELECT prévio e sem ``FOR UPDATE``. No PostgreSQL o abate e o
+registro da reserva são um único statement (CTE), então o bloqueio da linha do
+produto dura só esse statement, sem esperas em fila entre compradores.
+
+Reservas expiram (``INVENTORY_RESERVATION_TTL``) e devolvem o estoque. A
+devolução apaga a reserva antes de somar o estoque, na mesma transação, então
+cada reserva volta ao estoque no máximo uma vez, mesmo com liberações
+concorrentes.
+
+Esgotar ou repor um produto (estoque cruzando zero) incrementa a versão do
+catálogo por trigger (migração 0015), então ETags e caches de listagem não
+servem disponibilidade antiga; abates que não zeram o estoque não mudam a versão.
+
+Uso (cron):
+    python -m utils.inventory release-expired
+"""
+
+import argparse
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+class InventoryManager:
+    """Reserva, confirma e devolve estoque de produtos"""
+
+    def __init__(self, db):
+        self.db = db
+        self.settings = db.settings
+        self._sweep_lock = threading.Lock()
+        self._swept_at = 0.0
+
+    def _timestamp(self, value: datetime):
+        # sqlite3 não tem tipo de data: texto ISO compara corretamente
+        if self.db.db_type == 'sqlite':
+            return value.isoformat(sep=' ')
+        return value
+
+    def reserve(self, product_id: int, quantity: int, user_id: int = None,
+                ttl: Optional[int] = None) -> Dict[str, Any]:
+        """Reservar ``quantity`` unidades se houver estoque"""
+        self._maybe_release_expired()
+
+        expires_at = datetime.utcnow() + timedelta(seconds=ttl or self.settings.INVENTORY_RESERVATION_TTL)
+        try:
+            with self.db.get_connection() as conn:
+                cursor = self.db.get_cursor(conn)
+                queries = self.db.queries
+
+                if self.db.db_type == 'postgresql':
+                    queries.execute(cursor, 'inventory.reserve',
+                                    (quantity, product_id, quantity, user_id, quantity, expires_at))
+                    row = cursor.fetchone()
+                else:
+                    queries.execute(cursor, 'inventory.take_stock', (quantity, product_id, quantity))
+                    row = None
+                    if cursor.rowcount:
+                        queries.execute(cursor, 'inventory.insert_reservation',
+                                        (product_id, user_id, quantity, self._timestamp(expires_at)))
+                        row = cursor.fetchone()
+
+                if row is None:
+                    conn.rollback()
+                    return {'success': False, 'error': 'Estoque insuficiente', 'code': 'OUT_OF_STOCK'}
+
+                conn.commit()
+                return {
+                    'success': True,
+                    'reservation_id': row['id'],
+                    'product_id': product_id,
+                    'quantity': quantity,
+                    'expires_at': expires_at.isoformat() + 'Z'
+                }
+
+        except Exception as e:
+            print(f"❌ Erro ao reservar estoque: {e}")
+            return {'success': False, 'error': 'Erro ao reservar estoque'}
+
+    def release(self, reservation_id: int, user_id: int = None) -> Dict[str, Any]:
+        """Cancelar reserva e devolver o estoque"""
+        return self._finish(reservation_id, user_id, restock=True)
+
+    def confirm(self, reservation_id: int, user_id: int = None) -> Dict[str, Any]:
+        """Efetivar reserva (venda concluída): o estoque não volta"""
+        return self._finish(reservation_id, user_id, restock=False)
+
+    def _finish(self, reservation_id: int, user_id: Optional[int], restock: bool) -> Dict[str, Any]:
+        try:
+            with self.db.get_connection() as conn:
+                cursor = self.db.get_cursor(conn)
+                queries = self.db.queries
+
+                if user_id is None:
+                    queries.execute(cursor, 'inventory.delete_reservation', (reservation_id,))
+                else:
+                    queries.execute(cursor, 'inventory.delete_user_reservation', (reservation_id, user_id))
+                row = cursor.fetchone()
+
+                if row is None:
+                    conn.rollback()
+                    return {'success': False, 'error': 'Reserva não encontrada'}
+
+                if restock:
+                    queries.execute(cursor, 'inventory.restock', (row['quantity'], row['product_id']))
+                conn.commit()
+
+                return {'success': True, 'product_id': row['product_id'], 'quantity': row['quantity']}
+
+        except Exception as e:
+            print(f"❌ Erro ao finalizar reserva: {e}")
+            return {'success': False, 'error': 'Erro ao finalizar reserva'}
+
+    def release_expired(self, batch_size: Optional[int] = None) -> int:
+        """Devolver ao estoque um lote de reservas vencidas; retorna quantas"""
+        batch_size = batch_size or self.settings.INVENTORY_SWEEP_BATCH
+        try:
+            with self.db.get_connection() as conn:
+                cursor = self.db.get_cursor(conn)
+
+                self.db.queries.execute(cursor, 'inventory.delete_expired',
+                                        (self._timestamp(datetime.utcnow()), batch_size))
+                expired = cursor.fetchall()
+
+                restock = defaultdict(int)
+                for row in expired:
+                    restock[row['product_id']] += row['quantity']
+
+                # Um UPDATE por produto, sempre na mesma ordem (sem deadlock entre varreduras)
+                if restock:
+                    cursor.executemany(self.db.queries.sql('inventory.restock'),
+                                       [(restock[product_id], product_id) for product_id in sorted(restock)])
+                conn.commit()
+
+                if expired:
+                    print(f"♻️  {len(expired)} reserva(s) expirada(s) devolvida(s) ao estoque")
+                return len(expired)
+
+        except Exception as e:
+            print(f"❌ Erro ao liberar reservas expiradas: {e}")
+            return 0
+
+    def _maybe_release_expired(self):
+        """Varredura oportunista: no máximo uma por intervalo, sem bloquear a requisição"""
+        now = time.monotonic()
+        if now - self._swept_at < self.settings.INVENTORY_SWEEP_INTERVAL:
+            return
+        if not self._sweep_lock.acquire(blocking=False):
+            return
+
+        try:
+            self._swept_at = now
+            self.release_expired()
+        finally:
+            self._sweep_lock.release()
+
+def main(argv=None):
+    from utils.database import DatabaseManager
+
+    parser = argparse.ArgumentParser(description='Manutenção de reservas de estoque 3DBenchy Bros')
+    parser.add_argument('command', choices=['release-expired'], help='devolver ao estoque as reservas vencidas')
+    parser.add_argument('--db-path', help='Arquivo SQLite (quando DATABASE_URL não estiver definida)')
+    args = parser.parse_args(argv)
+
+    db = DatabaseManager(args.db_path)
+    try:
+        total = 0
+        while True:
+            released = db.inventory.release_expired()
+            total += released
+            if released < db.settings.INVENTORY_SWEEP_BATCH:
+                break
+        print(f"Reservas liberadas: {total}")
+    finally:
+        db.close()
+
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,55 @@
+"""
+Paginação keyset com cursor opaco
+
+O cursor codifica (created_at, id) da última linha da página em base64 URL-safe.
+O cliente apenas o devolve em ``?cursor=`` para obter a página seguinte.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+from utils.validators import ValidationError
+
+def encode_cursor(row: Dict[str, Any]) -> str:
+    """Gerar cursor a partir da última linha da página"""
+    created_at = row['created_at']
+    if isinstance(created_at, datetime):
+        created_at = created_at.isoformat()
+    payload = json.dumps([str(created_at), row['id']], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[str, int]]:
+    """Decodificar cursor recebido do cliente"""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created_at, last_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        return str(created_at), int(last_id)
+    except (ValueError, TypeError):
+        raise ValidationError("Cursor de paginação inválido")
+
+def parse_page_size(value: Optional[str], default: int, maximum: int) -> int:
+    """Validar tamanho da página, limitado a ``maximum``"""
+    if value in (None, ''):
+        return default
+    try:
+        size = int(value)
+    except (TypeError, ValueError):
+        raise ValidationError("limit deve ser um número inteiro")
+    if size <= 0:
+        raise ValidationError("limit deve ser maior que zero")
+    return min(size, maximum)
+
+def parse_page_number(value: Optional[str], maximum: int) -> int:
+    """Validar ``?page=`` (1 em diante), limitado a ``maximum``"""
+    if value in (None, ''):
+        return 1
+    try:
+        page = int(value)
+    except (TypeError, ValueError):
+        raise ValidationError("page deve ser um número inteiro")
+    if page <= 0 or page > maximum:
+        raise ValidationError(f"page deve estar entre 1 e {maximum}")
+    return page
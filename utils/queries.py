@@ -0,0 +1,298 @@
+"""
+Registro central de consultas SQL nomeadas
+
+As consultas são escritas uma única vez com placeholders ``%s`` e renderizadas
+para o dialeto do banco na inicialização. No PostgreSQL são executadas como
+prepared statements do servidor (``prepare=True``); no SQLite aproveitam o
+cache de statements da conexão.
+
+Consultas com ``{columns}`` aceitam uma projeção de colunas (já validada pelo
+chamador); sem projeção usam ``*``. Consultas que dependem de recursos
+específicos de um banco (ex.: busca textual) ficam em ``DIALECT_QUERIES``.
+"""
+
+from typing import Any, Dict, Optional, Sequence
+
+QUERIES: Dict[str, str] = {
+    # Usuários
+    'users.id_by_email': 'SELECT id FROM users WHERE email = %s',
+    'users.insert': '''
+        INSERT INTO users (name, email, password_hash, salt, oauth_provider, oauth_id, avatar_url)
+        VALUES (%s, %s, %s, %s, %s, %s, %s) RETURNING id
+    ''',
+    'users.login_lookup': '''
+        SELECT id, name, email, password_hash, salt, avatar_url, is_admin
+        FROM users
+        WHERE email = %s AND password_hash IS NOT NULL
+    ''',
+    'users.by_id': '''
+        SELECT id, name, email, avatar_url, is_admin, created_at
+        FROM users
+        WHERE id = %s
+    ''',
+
+    # Produtos
+    'products.by_id': 'SELECT {columns} FROM products WHERE id = %s AND is_active = TRUE',
+    'products.set_image': '''
+        UPDATE products SET image_hash = %s, image_width = %s, updated_at = CURRENT_TIMESTAMP
+        WHERE id = %s
+    ''',
+
+    'products.categories': '''
+        SELECT category, COUNT(*) AS product_count
+        FROM products
+        WHERE is_active = TRUE AND category IS NOT NULL
+        GROUP BY category
+        ORDER BY category
+    ''',
+
+    # Catálogo
+    'catalog.meta': 'SELECT version, updated_at FROM catalog_meta WHERE id = 1',
+
+    # Estoque
+    'inventory.take_stock': '''
+        UPDATE products SET stock_quantity = stock_quantity - %s
+        WHERE id = %s AND is_active = TRUE AND stock_quantity >= %s
+    ''',
+    'inventory.insert_reservation': '''
+        INSERT INTO inventory_reservations (product_id, user_id, quantity, expires_at)
+        VALUES (%s, %s, %s, %s) RETURNING id
+    ''',
+    'inventory.delete_reservation': '''
+        DELETE FROM inventory_reservations WHERE id = %s
+        RETURNING product_id, quantity
+    ''',
+    'inventory.delete_user_reservation': '''
+        DELETE FROM inventory_reservations WHERE id = %s AND user_id = %s
+        RETURNING product_id, quantity
+    ''',
+    'inventory.restock': 'UPDATE products SET stock_quantity = stock_quantity + %s WHERE id = %s',
+
+    # Carrinho
+    # Itens e totais na mesma leitura: cada linha traz os totais do carrinho
+    'cart.summary': '''
+        SELECT ci.id, ci.product_id, ci.quantity, p.name, p.price_cents, p.image_url, p.image_hash, p.image_width, p.category,
+               SUM(ci.quantity) OVER () AS total_items,
+               SUM(ci.quantity * p.price_cents) OVER () AS total_cents
+        FROM cart_items ci
+        JOIN products p ON p.id = ci.product_id
+        WHERE ci.user_id = %s
+        ORDER BY ci.created_at, ci.id
+    ''',
+    'cart.counter': 'SELECT total_items, total_cents FROM cart_counters WHERE user_id = %s',
+    # Mesmos parâmetros de cart.add, mas define a quantidade em vez de somar
+    'cart.set': '''
+        INSERT INTO cart_items (user_id, product_id, quantity)
+        SELECT %s, id, %s FROM products
+        WHERE id = %s AND is_active = TRUE AND stock_quantity >= %s
+        ON CONFLICT (user_id, product_id)
+        DO UPDATE SET quantity = excluded.quantity, updated_at = CURRENT_TIMESTAMP
+        RETURNING quantity
+    ''',
+    'cart.delete_item': 'DELETE FROM cart_items WHERE id = %s AND user_id = %s',
+    'cart.delete_product': 'DELETE FROM cart_items WHERE user_id = %s AND product_id = %s',
+    'cart.clear': 'DELETE FROM cart_items WHERE user_id = %s',
+}
+
+def _product_listing_queries() -> Dict[str, str]:
+    """Variantes da listagem de produtos com paginação keyset em (created_at, id)
+
+    Nomes: products.{list|featured}[_by_category][_after]. O sufixo ``_after``
+    recebe o cursor (created_at, id) da última linha da página anterior.
+    """
+    queries = {}
+    for base, featured in (('products.list', ''), ('products.featured', ' AND is_featured = TRUE')):
+        for by_category, category in (('', ''), ('_by_category', ' AND category = %s')):
+            for after, keyset in (('', ''), ('_after', ' AND (created_at, id) < (%s, %s)')):
+                queries[f'{base}{by_category}{after}'] = f'''
+                    SELECT {{columns}} FROM products
+                    WHERE is_active = TRUE{featured}{category}{keyset}
+                    ORDER BY created_at DESC, id DESC
+                    LIMIT %s
+                '''
+    return queries
+
+QUERIES.update(_product_listing_queries())
+
+# Consultas sem equivalente portável, com o mesmo nome em cada dialeto
+DIALECT_QUERIES: Dict[str, Dict[str, str]] = {
+    'postgresql': {
+        # Parâmetro: lista de IDs (array)
+        'products.by_ids': 'SELECT {columns} FROM products WHERE id = ANY(%s) AND is_active = TRUE',
+        # Abate do estoque e registro da reserva em um único statement
+        # Parâmetros: quantidade, produto, quantidade, usuário, quantidade, expiração
+        'inventory.reserve': '''
+            WITH taken AS (
+                UPDATE products SET stock_quantity = stock_quantity - %s
+                WHERE id = %s AND is_active = TRUE AND stock_quantity >= %s
+                RETURNING id
+            )
+            INSERT INTO inventory_reservations (product_id, user_id, quantity, expires_at)
+            SELECT id, %s, %s, %s FROM taken
+            RETURNING id
+        ''',
+        # Parâmetros: user_id, quantidade, product_id, quantidade (estoque mínimo).
+        # Se o item já está no carrinho, o UPDATE só acontece quando a soma cabe
+        # no estoque; sem linha gravada não há retorno (OUT_OF_STOCK).
+        # A consulta externa enxerga o carrinho de antes do upsert: soma os
+        # outros itens e acrescenta a linha gravada
+        'cart.add': '''
+            WITH item AS (
+                INSERT INTO cart_items (user_id, product_id, quantity)
+                SELECT %s, id, %s FROM products
+                WHERE id = %s AND is_active = TRUE AND stock_quantity >= %s
+                ON CONFLICT (user_id, product_id)
+                DO UPDATE SET quantity = cart_items.quantity + excluded.quantity, updated_at = CURRENT_TIMESTAMP
+                WHERE cart_items.quantity + excluded.quantity
+                      <= (SELECT stock_quantity FROM products WHERE id = excluded.product_id)
+                RETURNING user_id, product_id, quantity
+            )
+            SELECT item.quantity,
+                   item.quantity + COALESCE(SUM(ci.quantity), 0) AS total_items,
+                   item.quantity * p.price_cents + COALESCE(SUM(ci.quantity * cp.price_cents), 0) AS total_cents
+            FROM item
+            JOIN products p ON p.id = item.product_id
+            LEFT JOIN cart_items ci ON ci.user_id = item.user_id AND ci.product_id <> item.product_id
+            LEFT JOIN products cp ON cp.id = ci.product_id
+            GROUP BY item.quantity, p.price_cents
+        ''',
+        # Carrinho de visitante no login. Parâmetros: user_id, product_ids[], quantidades[]
+        'cart.merge': '''
+            INSERT INTO cart_items (user_id, product_id, quantity)
+            SELECT %s, p.id, LEAST(g.quantity, p.stock_quantity)
+            FROM unnest(%s::int[], %s::int[]) AS g(product_id, quantity)
+            JOIN products p ON p.id = g.product_id
+            WHERE p.is_active = TRUE AND p.stock_quantity > 0
+            ORDER BY p.id
+            ON CONFLICT (user_id, product_id)
+            DO UPDATE SET quantity = LEAST(cart_items.quantity + excluded.quantity,
+                                           (SELECT stock_quantity FROM products WHERE id = excluded.product_id)),
+                          updated_at = CURRENT_TIMESTAMP
+        ''',
+        # Varreduras concorrentes pegam lotes disjuntos (SKIP LOCKED)
+        'inventory.delete_expired': '''
+            DELETE FROM inventory_reservations
+            WHERE id IN (
+                SELECT id FROM inventory_reservations
+                WHERE expires_at < %s
+                ORDER BY expires_at
+                LIMIT %s
+                FOR UPDATE SKIP LOCKED
+            )
+            RETURNING product_id, quantity
+        ''',
+        # Parâmetros: opções do título, opções do trecho, tsquery, limit, offset
+        'products.search': '''
+            SELECT {columns},
+                   ts_headline('portuguese', p.name, q.query, %s) AS name_highlight,
+                   ts_headline('portuguese', coalesce(p.description, ''), q.query, %s) AS description_highlight
+            FROM products p, to_tsquery('portuguese', %s) AS q(query)
+            WHERE p.is_active = TRUE AND p.search_vector @@ q.query
+            ORDER BY ts_rank(p.search_vector, q.query) DESC, p.id DESC
+            LIMIT %s OFFSET %s
+        ''',
+    },
+    'sqlite': {
+        # Mesmos parâmetros da versão PostgreSQL; no SQLite as subconsultas do
+        # RETURNING já enxergam a linha gravada
+        'cart.add': '''
+            INSERT INTO cart_items (user_id, product_id, quantity)
+            SELECT %s, id, %s FROM products
+            WHERE id = %s AND is_active = TRUE AND stock_quantity >= %s
+            ON CONFLICT (user_id, product_id)
+            DO UPDATE SET quantity = cart_items.quantity + excluded.quantity, updated_at = CURRENT_TIMESTAMP
+            WHERE cart_items.quantity + excluded.quantity
+                  <= (SELECT stock_quantity FROM products WHERE id = excluded.product_id)
+            RETURNING quantity,
+                (SELECT SUM(c.quantity) FROM cart_items c
+                 WHERE c.user_id = cart_items.user_id) AS total_items,
+                (SELECT SUM(c.quantity * p.price_cents) FROM cart_items c JOIN products p ON p.id = c.product_id
+                 WHERE c.user_id = cart_items.user_id) AS total_cents
+        ''',
+        # Carrinho de visitante no login. Parâmetros: user_id, [[product_id, quantidade], ...] em JSON
+        'cart.merge': '''
+            INSERT INTO cart_items (user_id, product_id, quantity)
+            SELECT %s, p.id, MIN(json_extract(g.value, '$[1]'), p.stock_quantity)
+            FROM json_each(%s) AS g
+            JOIN products p ON p.id = json_extract(g.value, '$[0]')
+            WHERE p.is_active = TRUE AND p.stock_quantity > 0
+            ORDER BY p.id
+            ON CONFLICT (user_id, product_id)
+            DO UPDATE SET quantity = MIN(cart_items.quantity + excluded.quantity,
+                                         (SELECT stock_quantity FROM products WHERE id = excluded.product_id)),
+                          updated_at = CURRENT_TIMESTAMP
+        ''',
+        # Parâmetro: lista de IDs em JSON (um único statement para qualquer quantidade)
+        'products.by_ids': '''
+            SELECT {columns} FROM products
+            WHERE id IN (SELECT value FROM json_each(%s)) AND is_active = TRUE
+        ''',
+        'inventory.delete_expired': '''
+            DELETE FROM inventory_reservations
+            WHERE id IN (
+                SELECT id FROM inventory_reservations
+                WHERE expires_at < %s
+                ORDER BY expires_at
+                LIMIT %s
+            )
+            RETURNING product_id, quantity
+        ''',
+        # Parâmetros: marcadores do título, marcadores do trecho, MATCH, limit, offset
+        'products.search': '''
+            SELECT {columns},
+                   highlight(products_fts, 0, %s, %s) AS name_highlight,
+                   snippet(products_fts, 2, %s, %s, '…', 24) AS description_highlight
+            FROM products_fts
+            JOIN products p ON p.id = products_fts.rowid
+            WHERE products_fts MATCH %s AND p.is_active = TRUE
+            ORDER BY bm25(products_fts, 10.0, 5.0, 1.0), p.id DESC
+            LIMIT %s OFFSET %s
+        ''',
+    },
+}
+
+def render(sql: str, dialect: str) -> str:
+    """Adaptar placeholders ao dialeto (psycopg usa %s, sqlite3 usa ?)"""
+    sql = ' '.join(sql.split())
+    if dialect == 'sqlite':
+        return sql.replace('%s', '?')
+    return sql
+
+class QueryRegistry:
+    """Consultas renderizadas uma vez para o dialeto do banco"""
+
+    def __init__(self, dialect: str):
+        self.dialect = dialect
+        queries = {**QUERIES, **DIALECT_QUERIES.get(dialect, {})}
+        self._templates = {name: render(sql, dialect) for name, sql in queries.items()}
+        self._rendered = {name: sql.replace('{columns}', '*') for name, sql in self._templates.items()}
+        self._projections: Dict[tuple, str] = {}
+
+    def register(self, name: str, sql: str):
+        """Registrar consulta montada em tempo de execução (ex.: filtros combinados)
+
+        O nome deve identificar o formato do SQL; se já existir, nada muda.
+        """
+        if name not in self._templates:
+            template = render(sql, self.dialect)
+            self._templates[name] = template
+            self._rendered[name] = template.replace('{columns}', '*')
+
+    def sql(self, name: str, columns: Optional[Sequence[str]] = None) -> str:
+        """SQL da consulta, opcionalmente com projeção de colunas"""
+        if not columns:
+            return self._rendered[name]
+
+        key = (name, tuple(columns))
+        sql = self._projections.get(key)
+        if sql is None:
+            sql = self._templates[name].replace('{columns}', ', '.join(columns))
+            self._projections[key] = sql
+        return sql
+
+    def execute(self, cursor, name: str, params: Sequence[Any] = (), columns: Optional[Sequence[str]] = None):
+        """Executar consulta nomeada com o cursor informado"""
+        sql = self.sql(name, columns)
+        if self.dialect == 'postgresql':
+            return cursor.execute(sql, params, prepare=True)
+        return cursor.execute(sql, params)